@@ -0,0 +1,31 @@
+"""add challenge active_slot
+
+Revision ID: 5e2a9c1d7b40
+Revises: c4b58b1c3029
+Create Date: 2026-10-19 09:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2a9c1d7b40'
+down_revision: Union[str, Sequence[str], None] = 'c4b58b1c3029'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep NULL: older data may already contain duplicate active (team, level) pairs
+    op.add_column('challenges', sa.Column('active_slot', sa.String(length=120), nullable=True))
+    op.create_unique_constraint('uq_challenges_active_slot', 'challenges', ['active_slot'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_challenges_active_slot', 'challenges', type_='unique')
+    op.drop_column('challenges', 'active_slot')
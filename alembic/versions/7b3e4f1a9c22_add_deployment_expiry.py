@@ -0,0 +1,33 @@
+"""add deployment expires_at and level duration
+
+Revision ID: 7b3e4f1a9c22
+Revises: 5e2a9c1d7b40
+Create Date: 2026-10-19 11:03:27.514902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e4f1a9c22'
+down_revision: Union[str, Sequence[str], None] = '5e2a9c1d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deployment lama dibiarkan NULL, ExpiryScheduler mengisinya saat startup
+    op.add_column('deployments', sa.Column('expires_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_deployments_expires_at'), 'deployments', ['expires_at'], unique=False)
+    op.add_column('levels', sa.Column('duration', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('levels', 'duration')
+    op.drop_index(op.f('ix_deployments_expires_at'), table_name='deployments')
+    op.drop_column('deployments', 'expires_at')
@@ -0,0 +1,44 @@
+"""add SUSPENDED deployment status
+
+Revision ID: a81d6c02e5f3
+Revises: 7b3e4f1a9c22
+Create Date: 2026-10-19 13:40:12.077351
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81d6c02e5f3'
+down_revision: Union[str, Sequence[str], None] = '7b3e4f1a9c22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_STATUSES = ('PENDING', 'CREATING', 'RUNNING', 'STOPPED', 'ERROR', 'TERMINATING', 'TERMINATED')
+NEW_STATUSES = ('PENDING', 'CREATING', 'RUNNING', 'STOPPED', 'SUSPENDED', 'ERROR', 'TERMINATING', 'TERMINATED')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('deployments') as batch_op:
+        batch_op.alter_column(
+            'status',
+            existing_type=sa.Enum(*OLD_STATUSES, name='deploymentstatus'),
+            type_=sa.Enum(*NEW_STATUSES, name='deploymentstatus'),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE deployments SET status = 'STOPPED' WHERE status = 'SUSPENDED'")
+    with op.batch_alter_table('deployments') as batch_op:
+        batch_op.alter_column(
+            'status',
+            existing_type=sa.Enum(*NEW_STATUSES, name='deploymentstatus'),
+            type_=sa.Enum(*OLD_STATUSES, name='deploymentstatus'),
+            existing_nullable=False,
+        )
@@ -0,0 +1,30 @@
+"""add level backend and deployment vm_type
+
+Revision ID: c2f9e7a4b6d1
+Revises: a81d6c02e5f3
+Create Date: 2026-10-19 15:22:48.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f9e7a4b6d1'
+down_revision: Union[str, Sequence[str], None] = 'a81d6c02e5f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('levels', sa.Column('backend', sa.String(length=10), server_default='qemu', nullable=False))
+    op.add_column('deployments', sa.Column('vm_type', sa.String(length=10), server_default='qemu', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('deployments', 'vm_type')
+    op.drop_column('levels', 'backend')
@@ -0,0 +1,38 @@
+"""add level resource profile
+
+Revision ID: d5a1b8c3e0f7
+Revises: c2f9e7a4b6d1
+Create Date: 2026-10-19 16:48:05.216430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1b8c3e0f7'
+down_revision: Union[str, Sequence[str], None] = 'c2f9e7a4b6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('levels', sa.Column('template_vmid', sa.Integer(), nullable=True))
+    op.add_column('levels', sa.Column('memory', sa.Integer(), nullable=True))
+    op.add_column('levels', sa.Column('cores', sa.Integer(), nullable=True))
+    op.add_column('levels', sa.Column('full_clone', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.add_column('levels', sa.Column('storage', sa.String(length=100), nullable=True))
+    op.add_column('levels', sa.Column('node', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('levels', 'node')
+    op.drop_column('levels', 'storage')
+    op.drop_column('levels', 'full_clone')
+    op.drop_column('levels', 'cores')
+    op.drop_column('levels', 'memory')
+    op.drop_column('levels', 'template_vmid')
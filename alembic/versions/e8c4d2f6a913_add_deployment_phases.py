@@ -0,0 +1,42 @@
+"""add deployment_phases timeline table
+
+Revision ID: e8c4d2f6a913
+Revises: d5a1b8c3e0f7
+Create Date: 2026-10-19 18:05:51.640228
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4d2f6a913'
+down_revision: Union[str, Sequence[str], None] = 'd5a1b8c3e0f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('deployment_phases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deployment_id', sa.Integer(), nullable=False),
+    sa.Column('phase', sa.String(length=20), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('duration_ms', sa.Integer(), nullable=False),
+    sa.Column('level_id', sa.Integer(), nullable=True),
+    sa.Column('node', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['deployment_id'], ['deployments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deployment_phases_deployment_id'), 'deployment_phases', ['deployment_id'], unique=False)
+    op.create_index('ix_deployment_phases_started_at_phase', 'deployment_phases', ['started_at', 'phase'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deployment_phases_started_at_phase', table_name='deployment_phases')
+    op.drop_index(op.f('ix_deployment_phases_deployment_id'), table_name='deployment_phases')
+    op.drop_table('deployment_phases')
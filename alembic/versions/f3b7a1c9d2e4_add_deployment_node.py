@@ -0,0 +1,29 @@
+"""add deployment node
+
+Revision ID: f3b7a1c9d2e4
+Revises: e8c4d2f6a913
+Create Date: 2026-10-19 20:14:05.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7a1c9d2e4'
+down_revision: Union[str, Sequence[str], None] = 'e8c4d2f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL = PROXMOX_NODE (deployment lama sebelum node affinity)
+    op.add_column('deployments', sa.Column('node', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('deployments', 'node')
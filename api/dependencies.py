@@ -1,16 +1,87 @@
 from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from typing import Optional, TYPE_CHECKING
 
 from config.settings import settings
-from core.database import get_db
+from core.database import get_db, get_async_db, SessionLocal, engine
+from core.metrics import DB_POOL, QUEUE_DEPTH
+from core.executors import ExecutorLane, EXECUTOR_THREADS
 from services.proxmox_service import ProxmoxService
 from services.ansible_service import AnsibleService
 from services.challange_service import ChallengeService
+from services.scoreboard_service import Scoreboard
+from services.event_broadcaster import EventBroadcaster, track_deployment_status
+from services.provisioning_registry import ProvisioningRegistry
+from services.reconciler_service import OrphanReconciler
+from services.reclamation_service import ReclamationQueue
+from services.stop_queue import StopQueue
+from services.expiry_scheduler import ExpiryScheduler
+from services.idle_service import IdleDetector
+from services.level_profile_cache import LevelProfileCache
+from services.level_service import LevelService
+from services.timeline_service import TimelineService
+from services.health_service import HealthProber
+from services.admission_controller import AdmissionController
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 # Global Service Instances
 _proxmox_service = ProxmoxService(settings)
 _ansible_service = AnsibleService(settings)
+_scoreboard = Scoreboard()
+_event_broadcaster = EventBroadcaster(settings)
+_provisioning_registry = ProvisioningRegistry(settings)
+_orphan_reconciler = OrphanReconciler(settings, _proxmox_service, SessionLocal)
+_reclamation_queue = ReclamationQueue(settings, _proxmox_service, SessionLocal)
+_stop_queue = StopQueue(settings, _proxmox_service, SessionLocal)
+_expiry_scheduler = ExpiryScheduler(settings, SessionLocal, _proxmox_service, _reclamation_queue)
+_idle_detector = IdleDetector(settings, _proxmox_service, SessionLocal)
+_level_profiles = LevelProfileCache(settings)
+_health_prober = HealthProber(settings, _proxmox_service, SessionLocal, _ansible_service)
+_admission_controller = AdmissionController(settings)
+# Waiter admission (antri slot provisioning) memegang thread lane, jadi default lane = aktif + antrian
+_provisioning_lane = ExecutorLane(
+    "provisioning",
+    settings.PROVISIONING_WORKERS or settings.MAX_CONCURRENT_DEPLOYMENTS + settings.DEPLOYMENT_QUEUE_SIZE,
+    settings.PROVISIONING_QUEUE_SIZE,
+)
+_proxmox_lane = ExecutorLane("proxmox", settings.PROXMOX_WORKERS, settings.PROXMOX_QUEUE_SIZE)
+
+# Push scoreboard delta dan transisi status deployment ke subscriber SSE
+_scoreboard.add_listener(lambda update: _event_broadcaster.publish("scoreboard", update))
+track_deployment_status(SessionLocal, _event_broadcaster)
+
+def _db_pool_stats():
+    pool = engine.pool
+    stats = {}
+    for state, attr in (("checked_out", "checkedout"), ("idle", "checkedin"), ("size", "size"), ("overflow", "overflow")):
+        fn = getattr(pool, attr, None)
+        if callable(fn):
+            stats[(state,)] = fn()
+    return stats
+
+# Gauge dibaca saat scrape /metrics
+DB_POOL.set_function(_db_pool_stats)
+QUEUE_DEPTH.set_function(lambda: {
+    ("reclaim",): _reclamation_queue.pending_count(),
+    ("stop",): _stop_queue.pending_count(),
+    ("provisioning",): _provisioning_registry.inflight_count(),
+    ("admission",): _admission_controller.queued_count(),
+    ("expiry",): len(_expiry_scheduler),
+    ("sse_subscribers",): _event_broadcaster.subscriber_count,
+})
+
+def _executor_stats():
+    stats = {}
+    for lane in (_provisioning_lane, _proxmox_lane):
+        lane_stats = lane.stats()
+        stats[(lane.name, "active")] = lane_stats["active"]
+        stats[(lane.name, "queued")] = lane_stats["queued"]
+    return stats
+
+EXECUTOR_THREADS.set_function(_executor_stats, key="lanes")
 
 def get_proxmox_service() -> ProxmoxService:
     return _proxmox_service
@@ -18,13 +89,93 @@ def get_proxmox_service() -> ProxmoxService:
 def get_ansible_service() -> AnsibleService:
     return _ansible_service
 
+def get_scoreboard() -> Scoreboard:
+    return _scoreboard
+
+def get_event_broadcaster() -> EventBroadcaster:
+    return _event_broadcaster
+
+def get_provisioning_registry() -> ProvisioningRegistry:
+    return _provisioning_registry
+
+def get_orphan_reconciler() -> OrphanReconciler:
+    return _orphan_reconciler
+
+def get_reclamation_queue() -> ReclamationQueue:
+    return _reclamation_queue
+
+def get_stop_queue() -> StopQueue:
+    return _stop_queue
+
+def get_expiry_scheduler() -> ExpiryScheduler:
+    return _expiry_scheduler
+
+def get_idle_detector() -> IdleDetector:
+    return _idle_detector
+
+def get_level_profiles() -> LevelProfileCache:
+    return _level_profiles
+
+def get_health_prober() -> HealthProber:
+    return _health_prober
+
+async def get_health_prober_async() -> HealthProber:
+    """Dependency sync dijalankan FastAPI di threadpool; health check tidak boleh ikut antri di sana"""
+    return _health_prober
+
+def get_admission_controller() -> AdmissionController:
+    return _admission_controller
+
+def get_provisioning_lane() -> ExecutorLane:
+    return _provisioning_lane
+
+def get_proxmox_lane() -> ExecutorLane:
+    return _proxmox_lane
+
 def get_challenge_service(
     db: Session = Depends(get_db),
     proxmox_service: ProxmoxService = Depends(get_proxmox_service),
-    ansible_service: AnsibleService = Depends(get_ansible_service)
+    ansible_service: AnsibleService = Depends(get_ansible_service),
+    scoreboard: Scoreboard = Depends(get_scoreboard),
+    async_db: Optional["AsyncSession"] = Depends(get_async_db),
+    registry: ProvisioningRegistry = Depends(get_provisioning_registry),
+    reclaimer: ReclamationQueue = Depends(get_reclamation_queue),
+    stopper: StopQueue = Depends(get_stop_queue),
+    expiry: ExpiryScheduler = Depends(get_expiry_scheduler),
+    profiles: LevelProfileCache = Depends(get_level_profiles),
+    admission: AdmissionController = Depends(get_admission_controller)
 ) -> ChallengeService:
-    return ChallengeService(db, proxmox_service, ansible_service, settings)
+    return ChallengeService(
+        db, proxmox_service, ansible_service, settings, scoreboard,
+        async_db=async_db,
+        registry=registry,
+        reclaimer=reclaimer,
+        stopper=stopper,
+        expiry=expiry,
+        profiles=profiles,
+        admission=admission,
+    )
+
+def get_level_service(
+    db: Session = Depends(get_db),
+    profiles: LevelProfileCache = Depends(get_level_profiles)
+) -> LevelService:
+    return LevelService(db, profiles)
+
+def get_timeline_service(db: Session = Depends(get_db)) -> TimelineService:
+    return TimelineService(db)
 
 # Type Aliases for easy injection
 ChallengeServiceDep = Annotated[ChallengeService, Depends(get_challenge_service)]
 ProxmoxServiceDep = Annotated[ProxmoxService, Depends(get_proxmox_service)]
+ScoreboardDep = Annotated[Scoreboard, Depends(get_scoreboard)]
+EventBroadcasterDep = Annotated[EventBroadcaster, Depends(get_event_broadcaster)]
+OrphanReconcilerDep = Annotated[OrphanReconciler, Depends(get_orphan_reconciler)]
+ReclamationQueueDep = Annotated[ReclamationQueue, Depends(get_reclamation_queue)]
+StopQueueDep = Annotated[StopQueue, Depends(get_stop_queue)]
+LevelServiceDep = Annotated[LevelService, Depends(get_level_service)]
+HealthProberDep = Annotated[HealthProber, Depends(get_health_prober_async)]
+TimelineServiceDep = Annotated[TimelineService, Depends(get_timeline_service)]
+AdmissionControllerDep = Annotated[AdmissionController, Depends(get_admission_controller)]
+ProvisioningLaneDep = Annotated[ExecutorLane, Depends(get_provisioning_lane)]
+ProxmoxLaneDep = Annotated[ExecutorLane, Depends(get_proxmox_lane)]
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request
+
+from api.dependencies import TimelineServiceDep, AdmissionControllerDep, ProvisioningLaneDep, ProxmoxLaneDep
+from core.executors import limiter_stats
+from core.startup import profiler
+from schemas.responses import LatencyReportResponse
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"]
+)
+
+@router.get("/deployments/latency", response_model=LatencyReportResponse)
+def get_deployment_latency(
+    service: TimelineServiceDep,
+    window: int = Query(3600, ge=60, le=30 * 24 * 3600, description="Window dalam detik"),
+    level_id: Optional[int] = None,
+    node: Optional[str] = None,
+):
+    """p50/p90/p99 durasi tiap fase provisioning (clone, configure, boot, ansible, db, total)"""
+    return LatencyReportResponse(
+        window_seconds=window,
+        since=datetime.utcnow() - timedelta(seconds=window),
+        phases=service.latency_report(window, level_id=level_id, node=node),
+    )
+
+@router.get("/startup")
+def get_startup_profile():
+    """Durasi tiap langkah startup worker ini (import, schema check, start background service)"""
+    return profiler.report()
+
+@router.get("/deployments/admission")
+def get_admission_stats(admission: AdmissionControllerDep):
+    """Provisioning aktif/antri, jumlah penolakan dan estimasi waktu tunggu request baru"""
+    return {**admission.stats(), "estimated_wait_s": admission.estimated_wait()}
+
+@router.get("/executors")
+def get_executor_stats(request: Request, provisioning: ProvisioningLaneDep, proxmox: ProxmoxLaneDep):
+    """Worker aktif/antri per executor lane (api = threadpool AnyIO handler sync)"""
+    lanes = {lane.name: lane.stats() for lane in (provisioning, proxmox)}
+    limiter = getattr(request.app.state, "api_limiter", None)
+    if limiter is not None:
+        lanes["api"] = limiter_stats(limiter)
+    return lanes
@@ -1,38 +1,109 @@
-from fastapi import APIRouter, HTTPException, Depends
+import math
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from config.settings import settings
 from core.logging import logger
-from schemas.requests import CreateChallengeRequest, SubmitFlagRequest
-from schemas.responses import CreateChallengeResponse, ChallengeListResponse, SubmitFlagResponse
-from api.dependencies import ChallengeServiceDep
+from core.exceptions import (
+    IdempotencyKeyConflictError, ProvisioningInProgressError, ResourceNotFoundError,
+    DeploymentQueueFullError, DeploymentQueueTimeoutError, ExecutorSaturatedError, ProxmoxUnavailableError,
+)
+from models import DeploymentStatus
+from schemas.requests import CreateChallengeRequest, SubmitFlagRequest, ExtendChallengeRequest
+from schemas.responses import CreateChallengeResponse, ChallengeListResponse, SubmitFlagResponse, ChallengeStatusResponse, ExtendChallengeResponse
+from api.dependencies import ChallengeServiceDep, ProvisioningLaneDep, ProxmoxLaneDep
 
 router = APIRouter(
     prefix="/challenges",
     tags=["Challenges"]
 )
 
+def _proxmox_unavailable(e: ProxmoxUnavailableError) -> HTTPException:
+    """503 dengan Retry-After sampai circuit breaker Proxmox mengirim probe berikutnya"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+
 @router.post("", response_model=CreateChallengeResponse, status_code=201)
-def create_challenge(request: CreateChallengeRequest, service: ChallengeServiceDep):
+async def create_challenge(
+    request: CreateChallengeRequest,
+    service: ChallengeServiceDep,
+    lane: ProvisioningLaneDep,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200)
+):
     """
-    Create a new challenge (Provision VM + Ansible Config)
+    Create a new challenge (Provision VM + Ansible Config).
+    Retry dengan Idempotency-Key yang sama (atau team/level yang sudah aktif) tidak membuat VM baru.
+    Dijalankan di executor lane provisioning, bukan threadpool handler lain.
     """
     try:
-        result = service.create_challenge(request.level_id, request.team_name)
+        result = await lane.run(
+            service.create_challenge,
+            request.level_id,
+            request.team_name,
+            idempotency_key=idempotency_key,
+            vm_config=request.vm_config,
+        )
+        if result.existing:
+            response.status_code = 200
         return result
+    except IdempotencyKeyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ProvisioningInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": "30"})
+    except DeploymentQueueTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except DeploymentQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    except ProxmoxUnavailableError as e:
+        raise _proxmox_unavailable(e)
     except Exception as e:
         logger.exception("Failed to create challenge")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("", response_model=ChallengeListResponse)
-def list_challenges(service: ChallengeServiceDep):
-    """List all challenges"""
-    challenges = service.get_all()
+async def list_challenges(
+    service: ChallengeServiceDep,
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor dari halaman sebelumnya"),
+    limit: int = Query(settings.CHALLENGE_PAGE_SIZE, ge=1, le=settings.CHALLENGE_PAGE_MAX),
+    team: Optional[str] = Query(None, max_length=100),
+    level_id: Optional[int] = Query(None, gt=0),
+    is_active: Optional[bool] = None,
+    status: Optional[DeploymentStatus] = None,
+    include_total: bool = Query(True, description="Jalankan COUNT terpisah untuk total")
+):
+    """List challenges dengan keyset pagination dan filter"""
+    challenges, next_cursor = await service.get_page_async(
+        after_id=cursor,
+        limit=limit,
+        team=team,
+        level_id=level_id,
+        is_active=is_active,
+        status=status,
+    )
+    total = None
+    if include_total:
+        total = await service.count_async(team=team, level_id=level_id, is_active=is_active, status=status)
     return {
-        "total": len(challenges),
+        "total": total,
+        "next_cursor": next_cursor,
         "challenges": challenges
     }
 
+@router.get("/count")
+async def count_challenges(
+    service: ChallengeServiceDep,
+    team: Optional[str] = Query(None, max_length=100),
+    level_id: Optional[int] = Query(None, gt=0),
+    is_active: Optional[bool] = None,
+    status: Optional[DeploymentStatus] = None
+):
+    """Jumlah challenges sesuai filter"""
+    return {"total": await service.count_async(team=team, level_id=level_id, is_active=is_active, status=status)}
+
 @router.post("/{challenge_id}/submit", response_model=SubmitFlagResponse)
 def submit_flag(challenge_id: int, request: SubmitFlagRequest, service: ChallengeServiceDep):
     """Submit a flag for a challenge"""
@@ -41,5 +112,36 @@ def submit_flag(challenge_id: int, request: SubmitFlagRequest, service: Challeng
     except Exception as e:
         # ResourceNotFoundError is handled generally, but for now we catch all
         # Ideally add specific exception handlers in main app
-        logger.error(f"Submission error: {e}")
+        logger.error("Submission error: {}", e)
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/{challenge_id}", response_model=ChallengeStatusResponse, status_code=202)
+def terminate_challenge(challenge_id: int, service: ChallengeServiceDep):
+    """Terminate challenge: VM di-stop, dihapus dan disk-nya di-purge di background"""
+    try:
+        return service.terminate_challenge(challenge_id)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.post("/{challenge_id}/extend", response_model=ExtendChallengeResponse)
+def extend_challenge(challenge_id: int, request: ExtendChallengeRequest, service: ChallengeServiceDep):
+    """Perpanjang time limit VM challenge"""
+    try:
+        return service.extend_challenge(challenge_id, request.seconds)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/{challenge_id}/resume", response_model=ChallengeStatusResponse)
+async def resume_challenge(challenge_id: int, service: ChallengeServiceDep, lane: ProxmoxLaneDep):
+    """Resume VM challenge yang di-suspend karena idle"""
+    try:
+        return await lane.run(service.resume_challenge, challenge_id)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ProxmoxUnavailableError as e:
+        raise _proxmox_unavailable(e)
+    except Exception as e:
+        logger.error("Resume error: {}", e)
+        raise HTTPException(status_code=503, detail=str(e))
@@ -0,0 +1,42 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import EventBroadcasterDep
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+TOPICS = {"scoreboard", "deployment"}
+
+@router.get("")
+async def stream_events(
+    broadcaster: EventBroadcasterDep,
+    topics: Optional[str] = Query(None, description="Comma separated: scoreboard,deployment"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events stream untuk delta scoreboard dan transisi status deployment
+    """
+    selected = None
+    if topics:
+        selected = frozenset(t.strip() for t in topics.split(",") if t.strip())
+        unknown = selected - TOPICS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown topics: {', '.join(sorted(unknown))}")
+
+    try:
+        sub = broadcaster.subscribe(selected)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return StreamingResponse(
+        broadcaster.stream(sub, last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no", # Matikan buffering di reverse proxy (nginx)
+        }
+    )
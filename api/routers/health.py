@@ -1,28 +1,50 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from config.settings import settings
-from api.dependencies import ProxmoxServiceDep
+from api.dependencies import HealthProberDep
+from schemas.responses import HealthResponse, ReadinessResponse
+from services.health_service import READINESS_COMPONENTS
 
 router = APIRouter(
     prefix="/health",
     tags=["System"]
 )
 
-@router.get("")
-def health_check(proxmox_service: ProxmoxServiceDep):
-    """Detailed health check"""
-    # Check Proxmox Connectivity by verifying version
-    proxmox_status = "connected"
-    try:
-        if proxmox_service.proxmox:
-            proxmox_service.proxmox.version.get()
-        else:
-            proxmox_service._ensure_connected()
-    except Exception:
-        proxmox_status = "disconnected"
-    
-    return {
-        "status": "healthy",
-        "database": "connected", # Assumed if app is running
-        "proxmox": proxmox_status,
-        "version": settings.VERSION
-    }
+# Semua handler async: hanya membaca cache probe, jadi tetap menjawab walau
+# threadpool AnyIO penuh oleh handler sync lain
+
+@router.get("", response_model=HealthResponse)
+async def health_check(prober: HealthProberDep):
+    """Detailed health check (hasil probe background, tidak memanggil Proxmox/DB)"""
+    components = prober.snapshot()
+
+    def describe(name: str) -> str:
+        result = components[name]
+        if result.status == "up" and not result.stale:
+            return "connected"
+        return "unknown" if result.status == "unknown" else "disconnected"
+
+    return HealthResponse(
+        status=prober.status(),
+        database=describe("database"),
+        proxmox=describe("proxmox"),
+        version=settings.VERSION,
+        components=components,
+    )
+
+@router.get("/live")
+async def liveness():
+    """Liveness: process dan event loop masih merespon, tanpa cek dependency"""
+    return {"status": "alive"}
+
+@router.get("/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+async def readiness(prober: HealthProberDep):
+    """Readiness: 503 jika database down atau hasil probe sudah stale (Proxmox down cukup degraded di /health)"""
+    components = prober.snapshot()
+    body = ReadinessResponse(
+        ready=prober.is_ready(),
+        components={name: components[name] for name in READINESS_COMPONENTS},
+    )
+    if not body.ready:
+        return JSONResponse(status_code=503, content=body.model_dump(mode="json"))
+    return body
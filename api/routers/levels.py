@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException
+
+from api.dependencies import LevelServiceDep
+from core.exceptions import ResourceNotFoundError
+from schemas.requests import UpdateLevelProfileRequest
+from schemas.types.level_types import LevelProfile
+
+router = APIRouter(
+    prefix="/levels",
+    tags=["Levels"]
+)
+
+@router.get("/{level_id}/profile", response_model=LevelProfile)
+def get_level_profile(level_id: int, service: LevelServiceDep):
+    """Profil provisioning level (template, resource, backend, durasi)"""
+    try:
+        return service.get_profile(level_id)
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.patch("/{level_id}/profile", response_model=LevelProfile)
+def update_level_profile(level_id: int, request: UpdateLevelProfileRequest, service: LevelServiceDep):
+    """Update profil provisioning level, berlaku untuk challenge yang dibuat setelahnya"""
+    try:
+        return service.update_profile(level_id, request.model_dump(exclude_unset=True))
+    except ResourceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
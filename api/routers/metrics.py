@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import registry
+
+router = APIRouter(tags=["System"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Metrics format teks Prometheus (latency route, Proxmox API, Ansible, pool DB, queue)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,32 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from api.dependencies import ScoreboardDep
+from schemas.responses import ScoreboardResponse
+from schemas.types.scoreboard_types import ScoreboardEntry
+
+router = APIRouter(
+    prefix="/scoreboard",
+    tags=["Scoreboard"]
+)
+
+@router.get("", response_model=ScoreboardResponse)
+def get_scoreboard(
+    scoreboard: ScoreboardDep,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """Scoreboard, dilayani langsung dari memory"""
+    return {
+        "total": scoreboard.total_teams(),
+        "standings": scoreboard.standings(offset=offset, limit=limit),
+        "first_bloods": scoreboard.first_bloods()
+    }
+
+@router.get("/{team}", response_model=ScoreboardEntry)
+def get_team_score(team: str, scoreboard: ScoreboardDep):
+    """Posisi satu team di scoreboard"""
+    entry = scoreboard.get_team(team)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Team '{team}' has no score yet")
+    return entry
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from api.dependencies import ProxmoxServiceDep
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Response
+from api.dependencies import ProxmoxServiceDep, OrphanReconcilerDep, ReclamationQueueDep, StopQueueDep, ProxmoxLaneDep
 from core.logging import logger
-from schemas.responses import VMListResponse
+from schemas.responses import VMListResponse, ReconcileStatusResponse
+from schemas.types.reclaim_types import ReclaimReport
 
 router = APIRouter(
     prefix="/vms",
@@ -9,14 +11,42 @@ router = APIRouter(
 )
 
 @router.get("", response_model=VMListResponse)
-def list_vms(service: ProxmoxServiceDep):
+async def list_vms(service: ProxmoxServiceDep, lane: ProxmoxLaneDep):
     """List all VMs/Containers"""
     try:
-        vms = service.list_vms()
+        vms = await lane.run(service.list_vms)
         return {
             "total": len(vms),
             "vms": vms
         }
     except Exception as e:
-        logger.error(f"Failed to list VMs: {e}")
+        logger.error("Failed to list VMs: {}", e)
         raise HTTPException(status_code=503, detail="Proxmox unavailable")
+
+@router.get("/reconcile", response_model=ReconcileStatusResponse)
+def reconcile_status(reconciler: OrphanReconcilerDep, reclaimer: ReclamationQueueDep, stopper: StopQueueDep):
+    """Hasil pass reconciler terakhir, total resource yang sudah di-reclaim dan status queue destroy/stop"""
+    return {
+        "running": reconciler.running,
+        "last_report": reconciler.last_report,
+        "totals": reconciler.totals,
+        "queue": reclaimer.snapshot(),
+        "stop_queue": stopper.snapshot()
+    }
+
+@router.post("/reconcile", response_model=ReclaimReport, responses={202: {"description": "Pass scheduled"}})
+async def reconcile(reconciler: OrphanReconcilerDep, response: Response, lane: ProxmoxLaneDep, dry_run: bool = True):
+    """
+    Reconcile Proxmox vs deployments.
+    dry_run=true langsung mengembalikan laporan; dry_run=false menjadwalkan pass di background.
+    """
+    if not dry_run:
+        reconciler.trigger()
+        response.status_code = 202
+        return reconciler.last_report or ReclaimReport(started_at=datetime.utcnow())
+    try:
+        return await lane.run(reconciler.reconcile, dry_run=True)
+    except Exception as e:
+        logger.error("Reconcile dry run failed: {}", e)
+        raise HTTPException(status_code=503, detail="Proxmox unavailable")
+
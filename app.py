@@ -1,26 +1,97 @@
-from fastapi import FastAPI
+import time
+from core.startup import profiler
+_imports_started = time.perf_counter()
+
+from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
 
 from config.settings import settings
-from core.database import engine, Base
+from core.database import engine, async_engine, Base, SessionLocal, check_schema
+from core.instance_lock import InstanceLock, check_single_process
 from core.logging import logger
+from core.metrics import HTTP_REQUEST_DURATION
+from core.executors import EXECUTOR_THREADS, configure_default_threadpool, limiter_stats
+from core.tracing import tracer, current_correlation_id
 
 # Import Routers
-from api.routers import challenges, vms, health
+from api.routers import challenges, vms, health, scoreboard, events, levels, admin, metrics
+from api.dependencies import get_scoreboard, get_event_broadcaster, get_orphan_reconciler, get_reclamation_queue, get_stop_queue, get_expiry_scheduler, get_idle_detector, get_health_prober, get_provisioning_lane, get_proxmox_lane
+
+profiler.mark("imports", _imports_started)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager untuk startup dan shutdown"""
     # Startup
     logger.info("Starting CTF Platform...")
-    logger.info(f"Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    logger.success("Database initialized successfully!")
+    # Scoreboard, antrian dan scheduler ada di memory: hanya satu proses yang boleh jalan
+    check_single_process()
+    instance_lock = InstanceLock(settings.INSTANCE_LOCK_FILE) if settings.INSTANCE_LOCK_FILE else None
+    if instance_lock is not None:
+        instance_lock.acquire()
+    # Lane "api": threadpool AnyIO untuk handler/dependency sync (submit, GET, ...)
+    api_limiter = configure_default_threadpool(settings.API_THREADPOOL_SIZE)
+    app.state.api_limiter = api_limiter
+    # Key sendiri supaya tidak mengganti callback lane provisioning/proxmox (api/dependencies.py)
+    EXECUTOR_THREADS.set_function(lambda: {
+        ("api", state): value for state, value in limiter_stats(api_limiter).items() if state != "workers"
+    }, key="api")
+    with profiler.step("schema_check"):
+        if settings.DB_SCHEMA_CHECK == "create_all":
+            logger.info("Creating database tables...")
+            Base.metadata.create_all(bind=engine)
+            logger.success("Database initialized successfully!")
+        elif settings.DB_SCHEMA_CHECK == "alembic":
+            # Migrasi dijalankan saat deploy (alembic upgrade head), worker cukup verifikasi revision
+            revision = check_schema(engine)
+            logger.info("Database schema at revision {}", revision)
+    
+    # Rebuild in-memory scoreboard dari DB
+    with profiler.step("scoreboard_rebuild"):
+        db = SessionLocal()
+        try:
+            get_scoreboard().rebuild_from_db(db)
+        finally:
+            db.close()
+    
+    with profiler.step("start_workers"):
+        tracer.start()
+        get_health_prober().start()
+        get_event_broadcaster().start()
+        get_reclamation_queue().start()
+        get_stop_queue().start()
+    with profiler.step("expiry_rebuild"):
+        get_expiry_scheduler().rebuild_from_db()
+        get_expiry_scheduler().start()
+    with profiler.step("start_monitors"):
+        get_idle_detector().start()
+        get_orphan_reconciler().start()
+    
+    total = profiler.finish()
+    if settings.STARTUP_PROFILE:
+        logger.info(profiler.format())
+    logger.info("Startup complete in {:.0f} ms", total * 1000)
     
     yield
     
     # Shutdown
     logger.info("Shutting down CTF Platform...")
+    get_orphan_reconciler().stop()
+    get_idle_detector().stop()
+    get_expiry_scheduler().stop()
+    get_stop_queue().stop()
+    get_reclamation_queue().stop()
+    get_event_broadcaster().stop()
+    get_health_prober().stop()
+    get_provisioning_lane().shutdown()
+    get_proxmox_lane().shutdown()
+    tracer.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    if instance_lock is not None:
+        instance_lock.release()
+    # Flush log yang masih di queue sink
+    await logger.complete()
 
 
 app = FastAPI(
@@ -30,10 +101,52 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.METRICS_ENABLED:
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Label pakai path template route (/api/challenges/{challenge_id}) supaya cardinality tetap kecil
+            route = request.scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=request.method,
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status),
+            )
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """Correlation id per request (header X-Request-ID) + root span untuk request yang ter-sample"""
+    correlation_id = request.headers.get("x-request-id") or None
+    with tracer.start_trace(f"{request.method} {request.url.path}", correlation_id=correlation_id,
+                            method=request.method) as span:
+        correlation_id = current_correlation_id()
+        with logger.contextualize(request_id=correlation_id):
+            response = await call_next(request)
+        route = request.scope.get("route")
+        if span is not None:
+            # Nama span pakai path template supaya bisa dikelompokkan
+            span.name = f"{request.method} {getattr(route, 'path', request.url.path)}"
+            span.set(status=response.status_code)
+    response.headers["X-Request-ID"] = correlation_id
+    return response
+
 # Register Routers
 app.include_router(challenges.router, prefix="/api")
 app.include_router(vms.router, prefix="/api")
 app.include_router(health.router, prefix="/api")
+app.include_router(scoreboard.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
+app.include_router(levels.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 @app.get("/")
 def root():
@@ -0,0 +1,3 @@
+"""
+Tools benchmark/load test (fake Proxmox server, load generator)
+"""
@@ -0,0 +1,266 @@
+"""
+Benchmark Baseline
+Simpan hasil load test (benchmarks.loadtest --json) sebagai baseline berversi,
+lalu bandingkan run baru terhadapnya dan laporkan metric yang memburuk.
+
+Satu baseline bisa dibangun dari beberapa run supaya variasi antar run (noise)
+ikut diukur. Metric dianggap regresi jika perubahannya melewati SEMUA batas:
+- relatif   : > rel x mean baseline
+- statistik : > k x stddev (baseline dan run baru digabung)
+- absolut   : > floor (mis. 2 ms, supaya latency kecil tidak flapping)
+
+Usage:
+    python -m benchmarks.baseline save run1.json run2.json run3.json --name herd-50x3
+    python -m benchmarks.baseline compare herd-50x3 new1.json new2.json --json report.json
+
+Exit code compare: 0 = aman, 1 = ada regresi.
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+FORMAT_VERSION = 1
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+@dataclass(frozen=True)
+class Threshold:
+    higher_is_better: bool = False
+    rel: float = 0.10
+    k: float = 3.0
+    floor: float = 0.0
+
+
+# Metric per endpoint yang dibandingkan, plus durasi fase
+THRESHOLDS: Dict[str, Threshold] = {
+    "p50_ms": Threshold(rel=0.10, floor=2.0),
+    "p90_ms": Threshold(rel=0.15, floor=2.0),
+    "p99_ms": Threshold(rel=0.25, floor=5.0),
+    "error_rate": Threshold(rel=0.0, k=3.0, floor=0.01),
+    "rps": Threshold(higher_is_better=True, rel=0.10, floor=1.0),
+    "elapsed_s": Threshold(rel=0.10, floor=0.1),
+}
+
+
+@dataclass
+class Comparison:
+    scenario: str
+    endpoint: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    limit: float
+    regression: bool
+
+    @property
+    def change_pct(self) -> Optional[float]:
+        if self.baseline == 0:
+            return None
+        return self.change / self.baseline * 100
+
+
+def flatten(result: Dict[str, Any]) -> Dict[Tuple[str, str, str], float]:
+    """Hasil loadtest -> {(scenario, endpoint, metric): value}. Endpoint '*' untuk metric fase."""
+    values: Dict[Tuple[str, str, str], float] = {}
+    for scenario, phase in result.get("phases", {}).items():
+        if "elapsed_s" in phase:
+            values[(scenario, "*", "elapsed_s")] = float(phase["elapsed_s"])
+        for endpoint, stats in phase.get("endpoints", {}).items():
+            for metric in THRESHOLDS:
+                if metric in stats:
+                    values[(scenario, endpoint, metric)] = float(stats[metric])
+    return values
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def build_baseline(name: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if not results:
+        raise ValueError("Baseline butuh minimal satu hasil run")
+    metrics: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+    for result in results:
+        for (scenario, endpoint, metric), value in flatten(result).items():
+            metrics.setdefault(scenario, {}).setdefault(endpoint, {}).setdefault(metric, []).append(value)
+    return {
+        "format_version": FORMAT_VERSION,
+        "name": name,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "runs": len(results),
+        "options": results[0].get("options", {}),
+        "metrics": metrics,
+    }
+
+
+def save_baseline(baseline: Dict[str, Any], directory: str = DEFAULT_DIR) -> str:
+    """Tulis ke <dir>/<name>-<timestamp>[-<commit>].json; baseline lama tidak ditimpa"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = baseline["created_at"].replace("-", "").replace(":", "").replace("T", "")
+    suffix = f"-{baseline['git_commit']}" if baseline.get("git_commit") else ""
+    path = os.path.join(directory, f"{baseline['name']}-{stamp}{suffix}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    return path
+
+
+def resolve_baseline(name_or_path: str, directory: str = DEFAULT_DIR) -> str:
+    """Path file langsung, atau nama baseline -> file terbaru dengan nama tersebut"""
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    candidates = sorted(glob.glob(os.path.join(directory, f"{glob.escape(name_or_path)}-*.json")))
+    if not candidates:
+        raise FileNotFoundError(f"Baseline '{name_or_path}' tidak ditemukan di {directory}")
+    # Nama file memuat timestamp, jadi urutan leksikal = urutan waktu
+    return candidates[-1]
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    version = baseline.get("format_version")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Format baseline {version} tidak didukung (butuh {FORMAT_VERSION})")
+    return baseline
+
+
+def _stdev(values: List[float]) -> float:
+    return statistics.stdev(values) if len(values) > 1 else 0.0
+
+
+def compare(
+    baseline: Dict[str, Any],
+    results: List[Dict[str, Any]],
+    thresholds: Optional[Dict[str, Threshold]] = None,
+) -> List[Comparison]:
+    thresholds = thresholds or THRESHOLDS
+    current: Dict[Tuple[str, str, str], List[float]] = {}
+    for result in results:
+        for key, value in flatten(result).items():
+            current.setdefault(key, []).append(value)
+
+    comparisons: List[Comparison] = []
+    for scenario, endpoints in sorted(baseline["metrics"].items()):
+        for endpoint, metrics in sorted(endpoints.items()):
+            for metric, base_values in sorted(metrics.items()):
+                threshold = thresholds.get(metric)
+                new_values = current.get((scenario, endpoint, metric))
+                if threshold is None or not new_values:
+                    continue
+                base_mean = statistics.fmean(base_values)
+                new_mean = statistics.fmean(new_values)
+                # Arah "memburuk" selalu positif
+                change = new_mean - base_mean
+                worse = -change if threshold.higher_is_better else change
+                noise = threshold.k * max(_stdev(base_values), _stdev(new_values))
+                limit = max(threshold.rel * abs(base_mean), noise, threshold.floor)
+                comparisons.append(Comparison(
+                    scenario=scenario,
+                    endpoint=endpoint,
+                    metric=metric,
+                    baseline=round(base_mean, 4),
+                    current=round(new_mean, 4),
+                    change=round(change, 4),
+                    limit=round(limit, 4),
+                    regression=worse > limit,
+                ))
+    return comparisons
+
+
+def missing_endpoints(baseline: Dict[str, Any], results: List[Dict[str, Any]]) -> List[str]:
+    """Endpoint yang ada di baseline tapi tidak muncul lagi (mis. semua request gagal sebelum tercatat)"""
+    seen = {(scenario, endpoint) for result in results for scenario, endpoint, _ in flatten(result)}
+    return [
+        f"{scenario} {endpoint}"
+        for scenario, endpoints in sorted(baseline["metrics"].items())
+        for endpoint in sorted(endpoints)
+        if (scenario, endpoint) not in seen
+    ]
+
+
+def format_comparison(baseline: Dict[str, Any], comparisons: List[Comparison], missing: List[str]) -> str:
+    regressions = [c for c in comparisons if c.regression]
+    lines = [
+        f"Baseline {baseline['name']} ({baseline.get('git_commit') or 'unknown'}, "
+        f"{baseline['created_at']}, {baseline['runs']} run)",
+    ]
+    if not regressions and not missing:
+        lines.append(f"OK: {len(comparisons)} metric dibandingkan, tidak ada regresi")
+        return "\n".join(lines)
+
+    lines.append(f"REGRESSION: {len(regressions)} metric memburuk")
+    for c in regressions:
+        pct = f" ({c.change_pct:+.1f}%)" if c.change_pct is not None else ""
+        lines.append(
+            f"  [{c.scenario}] {c.endpoint} {c.metric}: {c.baseline:g} -> {c.current:g}{pct}, limit {c.limit:g}"
+        )
+    for item in missing:
+        lines.append(f"  [missing] {item}: tidak ada di run baru")
+    return "\n".join(lines)
+
+
+def _load_results(paths: List[str]) -> List[Dict[str, Any]]:
+    results = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            results.append(json.load(f))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Baseline dan regression check untuk hasil benchmark")
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="Direktori baseline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    save = sub.add_parser("save", help="Simpan hasil run sebagai baseline baru")
+    save.add_argument("results", nargs="+", help="File JSON dari benchmarks.loadtest --json")
+    save.add_argument("--name", required=True)
+
+    cmp = sub.add_parser("compare", help="Bandingkan run baru dengan baseline")
+    cmp.add_argument("baseline", help="Nama baseline (file terbaru) atau path file")
+    cmp.add_argument("results", nargs="+")
+    cmp.add_argument("--json", help="Tulis laporan lengkap ke file JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "save":
+        path = save_baseline(build_baseline(args.name, _load_results(args.results)), args.dir)
+        print(f"Baseline saved: {path}")
+        return 0
+
+    baseline = load_baseline(resolve_baseline(args.baseline, args.dir))
+    results = _load_results(args.results)
+    if results and results[0].get("options") != baseline.get("options"):
+        print("WARNING: options run berbeda dengan baseline, hasil mungkin tidak sebanding", file=sys.stderr)
+    comparisons = compare(baseline, results)
+    missing = missing_endpoints(baseline, results)
+    print(format_comparison(baseline, comparisons, missing))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "baseline": {k: baseline.get(k) for k in ("name", "created_at", "git_commit", "runs")},
+                "comparisons": [asdict(c) for c in comparisons],
+                "missing": missing,
+            }, f, indent=2)
+    return 1 if missing or any(c.regression for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
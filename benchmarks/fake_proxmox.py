@@ -0,0 +1,456 @@
+"""
+Fake Proxmox API Server
+Server HTTPS lokal yang meniru endpoint Proxmox VE yang dipakai ProxmoxService, untuk
+benchmark/load test tanpa cluster. Latency per call, durasi task, lock contention
+dan failure bisa diatur.
+
+Usage:
+    python -m benchmarks.fake_proxmox --port 18006 --latency 0.02 --clone-seconds 5
+    # lalu jalankan app dengan PROXMOX_HOST=127.0.0.1:18006 PROXMOX_VERIFY_SSL=false
+"""
+
+import argparse
+import json
+import random
+import re
+import ssl
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api2/json"
+
+
+@dataclass
+class FakeProxmoxConfig:
+    node: str = "pve"
+    # Latency tiap HTTP call (detik), ditambah jitter acak 0..latency_jitter
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Durasi task async (UPID) per jenis operasi
+    task_seconds: Dict[str, float] = field(default_factory=lambda: {
+        "clone": 5.0, "start": 1.0, "stop": 0.5, "suspend": 2.0, "delete": 1.0,
+    })
+    # Task menunggu lock guest (template yang sedang di-clone, dsb.) maksimal selama ini,
+    # lebih dari itu task gagal "can't lock file ... got timeout" seperti Proxmox
+    lock_timeout: float = 10.0
+    # Probabilitas HTTP 500 per call; kosong = semua endpoint, atau nama operasi (clone, start, list, ...)
+    failure_rate: float = 0.0
+    failure_operations: FrozenSet[str] = frozenset()
+    # Probabilitas task selesai dengan exitstatus error
+    task_failure_rate: float = 0.0
+    templates: Tuple[int, ...] = (9000,)
+    ct_templates: Tuple[int, ...] = (8000,)
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeGuest:
+    vmid: int
+    vm_type: str
+    name: str
+    status: str = "stopped"
+    template: bool = False
+    memory: int = 512
+    cores: int = 1
+    net0: str = ""
+    locked_until: float = 0.0
+    netin: int = 0
+    netout: int = 0
+
+
+@dataclass
+class FakeTask:
+    upid: str
+    operation: str
+    vmid: int
+    starts_at: float
+    ends_at: float
+    exitstatus: str = "OK"
+    on_finish: Optional[Any] = None
+    finished: bool = False
+
+
+class FakeProxmoxError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FakeCluster:
+    """State guest dan task. Task dievaluasi lazy saat di-query, tanpa thread per task."""
+
+    def __init__(self, config: FakeProxmoxConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.guests: Dict[int, FakeGuest] = {}
+        self.tasks: Dict[str, FakeTask] = {}
+        self.calls: Dict[str, int] = {}
+        self._task_seq = 0
+        for vmid in config.templates:
+            self.guests[vmid] = FakeGuest(vmid, "qemu", f"template-{vmid}", template=True)
+        for vmid in config.ct_templates:
+            self.guests[vmid] = FakeGuest(vmid, "lxc", f"ct-template-{vmid}", template=True)
+
+    # --- Helpers ---
+
+    def _guest(self, vm_type: str, vmid: int) -> FakeGuest:
+        guest = self.guests.get(vmid)
+        if guest is None or guest.vm_type != vm_type:
+            raise FakeProxmoxError(500, f"Configuration file 'nodes/{self.config.node}/{vm_type}/{vmid}.conf' does not exist")
+        return guest
+
+    def _settle(self, now: float) -> None:
+        for task in self.tasks.values():
+            if not task.finished and task.ends_at <= now:
+                task.finished = True
+                if task.exitstatus == "OK" and task.on_finish is not None:
+                    task.on_finish()
+
+    def _task(self, operation: str, guests: List[FakeGuest], on_finish=None) -> str:
+        """
+        Buat task yang memegang lock semua guest terkait. Task mulai setelah lock terakhir
+        dilepas; jika harus menunggu lebih dari lock_timeout, task gagal.
+        """
+        now = time.monotonic()
+        self._task_seq += 1
+        vmid = guests[-1].vmid
+        upid = f"UPID:{self.config.node}:{self._task_seq:08X}:{int(time.time()):08X}:{operation}:{vmid}:root@pam:"
+        wait = max([0.0] + [g.locked_until - now for g in guests])
+        duration = self.config.task_seconds.get(operation, 0.0)
+        if wait > self.config.lock_timeout:
+            task = FakeTask(upid, operation, vmid, now, now + self.config.lock_timeout,
+                            exitstatus=f"can't lock file '/var/lock/qemu-server/lock-{guests[0].vmid}.conf' - got timeout")
+        else:
+            starts_at = now + wait
+            task = FakeTask(upid, operation, vmid, starts_at, starts_at + duration, on_finish=on_finish)
+            if self.random.random() < self.config.task_failure_rate:
+                task.exitstatus = f"{operation} failed (injected)"
+            for g in guests:
+                g.locked_until = task.ends_at
+        self.tasks[upid] = task
+        return upid
+
+    def _next_net(self, guest: FakeGuest) -> None:
+        if guest.status == "running":
+            guest.netin += self.random.randint(0, 50000)
+            guest.netout += self.random.randint(0, 50000)
+
+    # --- Operations ---
+
+    def handle(self, method: str, path: str, params: Dict[str, str]) -> Any:
+        node = self.config.node
+        now = time.monotonic()
+        with self.lock:
+            self._settle(now)
+            if method == "POST" and path == "/access/ticket":
+                return {"ticket": "PVE:root@pam:FAKE", "CSRFPreventionToken": "FAKE", "username": params.get("username")}
+            if method == "GET" and path == "/version":
+                return {"version": "8.1.0", "release": "8.1", "repoid": "fake"}
+            if method == "GET" and path == "/cluster/resources":
+                result = []
+                for g in self.guests.values():
+                    self._next_net(g)
+                    result.append({
+                        "id": f"{g.vm_type}/{g.vmid}", "type": g.vm_type, "vmid": g.vmid, "node": node,
+                        "name": g.name, "status": g.status, "template": int(g.template),
+                        "cpu": self.random.uniform(0, 0.3) if g.status == "running" else 0,
+                        "maxmem": g.memory * 1024 * 1024, "netin": g.netin, "netout": g.netout,
+                    })
+                return result
+
+            m = re.fullmatch(rf"/nodes/{re.escape(node)}/tasks/([^/]+)/status", path)
+            if m:
+                task = self.tasks.get(m.group(1))
+                if task is None:
+                    raise FakeProxmoxError(500, "no such task")
+                if task.finished:
+                    return {"upid": task.upid, "status": "stopped", "exitstatus": task.exitstatus}
+                return {"upid": task.upid, "status": "running"}
+
+            m = re.fullmatch(rf"/nodes/{re.escape(node)}/(qemu|lxc)(?:/(\d+)(/.*)?)?", path)
+            if not m:
+                raise FakeProxmoxError(501, f"Method '{method} {path}' not implemented")
+            vm_type, vmid, rest = m.group(1), m.group(2), m.group(3) or ""
+
+            if vmid is None:
+                if method == "GET":
+                    return [
+                        {"vmid": g.vmid, "name": g.name, "status": g.status, "template": int(g.template),
+                         "maxmem": g.memory * 1024 * 1024, "cpus": g.cores}
+                        for g in self.guests.values() if g.vm_type == vm_type
+                    ]
+                raise FakeProxmoxError(501, f"Method '{method} {path}' not implemented")
+
+            guest = self._guest(vm_type, int(vmid))
+            if rest == "/clone" and method == "POST":
+                newid = int(params["newid"])
+                if newid in self.guests:
+                    raise FakeProxmoxError(500, f"unable to create VM {newid}: config file already exists")
+                name = params.get("name") or params.get("hostname") or f"vm-{newid}"
+                clone = FakeGuest(newid, vm_type, name, memory=guest.memory, cores=guest.cores)
+                self.guests[newid] = clone
+                return self._task("clone", [guest, clone])
+            if rest == "/config":
+                if method == "GET":
+                    return {"name": guest.name, "hostname": guest.name, "memory": guest.memory,
+                            "cores": guest.cores, "net0": guest.net0, "template": int(guest.template)}
+                if method in ("POST", "PUT"):
+                    if guest.locked_until > now:
+                        raise FakeProxmoxError(500, f"VM {guest.vmid} is locked (clone)")
+                    guest.memory = int(params.get("memory", guest.memory))
+                    guest.cores = int(params.get("cores", guest.cores))
+                    guest.net0 = params.get("net0", guest.net0)
+                    return None
+            if rest == "/status/current" and method == "GET":
+                return {"vmid": guest.vmid, "status": guest.status, "name": guest.name,
+                        "qmpstatus": guest.status, "lock": "clone" if guest.locked_until > now else None}
+            if rest.startswith("/status/") and method == "POST":
+                action = rest[len("/status/"):]
+                target = {"start": "running", "stop": "stopped", "suspend": "stopped", "resume": "running"}.get(action)
+                if target is None:
+                    raise FakeProxmoxError(501, f"Method '{method} {path}' not implemented")
+                if guest.template:
+                    raise FakeProxmoxError(500, "you can't start a vm if it's a template")
+
+                def finish(g=guest, status=target):
+                    g.status = status
+                return self._task(action, [guest], on_finish=finish)
+            if rest == "" and method == "DELETE":
+                if guest.status == "running":
+                    raise FakeProxmoxError(500, f"VM {guest.vmid} is running - destroy failed")
+
+                def remove(vmid=guest.vmid):
+                    self.guests.pop(vmid, None)
+                return self._task("delete", [guest], on_finish=remove)
+            raise FakeProxmoxError(501, f"Method '{method} {path}' not implemented")
+
+    def operation_name(self, method: str, path: str) -> str:
+        """Nama operasi untuk failure_operations / statistik call"""
+        if path == "/access/ticket":
+            return "auth"
+        if path.endswith("/tasks") or "/tasks/" in path:
+            return "task_status"
+        if path == "/cluster/resources":
+            return "resources"
+        if path == "/version":
+            return "version"
+        tail = path.rstrip("/").split("/")[-1]
+        if tail in ("qemu", "lxc"):
+            return "list"
+        if tail.isdigit():
+            return "delete" if method == "DELETE" else "get"
+        return tail
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeProxmoxHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - signature dari BaseHTTPRequestHandler
+        pass
+
+    def _params(self) -> Dict[str, str]:
+        query = {k: v[-1] for k, v in parse_qs(urlparse(self.path).query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length).decode("utf-8")
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                query.update({k: str(v) for k, v in json.loads(body).items()})
+            else:
+                query.update({k: v[-1] for k, v in parse_qs(body).items()})
+        return query
+
+    def _handle(self, method: str) -> None:
+        fake = self.server.fake
+        config = fake.config
+        path = urlparse(self.path).path
+        params = self._params()
+        if config.latency or config.latency_jitter:
+            time.sleep(config.latency + fake.random.uniform(0, config.latency_jitter))
+
+        status, payload = 200, None
+        if not path.startswith(API_PREFIX):
+            status, payload = 404, {"data": None, "message": "not found"}
+        else:
+            path = path[len(API_PREFIX):]
+            operation = fake.operation_name(method, path)
+            with fake.lock:
+                fake.calls[operation] = fake.calls.get(operation, 0) + 1
+                inject = (config.failure_rate > 0
+                          and (not config.failure_operations or operation in config.failure_operations)
+                          and fake.random.random() < config.failure_rate)
+            try:
+                if inject:
+                    raise FakeProxmoxError(500, f"{operation} failed (injected)")
+                payload = {"data": fake.handle(method, path, params)}
+            except FakeProxmoxError as e:
+                status, payload = e.status, {"data": None, "message": e.message}
+            except (KeyError, ValueError) as e:
+                status, payload = 400, {"data": None, "message": f"invalid parameter: {e}"}
+
+        body = json.dumps(payload).encode("utf-8")
+        # Proxmox mengirim pesan error di status line, proxmoxer menampilkannya ke caller
+        reason = payload.get("message") if status != 200 else None
+        self.send_response(status, reason)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class FakeProxmoxHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fake: FakeCluster):
+        super().__init__(address, _Handler)
+        self.fake = fake
+
+
+def _self_signed_cert(directory: Path) -> Tuple[Path, Path]:
+    """Sertifikat self-signed untuk localhost (proxmoxer selalu pakai HTTPS)"""
+    import datetime as dt
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    return cert_path, key_path
+
+
+class FakeProxmox:
+    """
+    Jalankan fake server di background thread.
+
+        with FakeProxmox(FakeProxmoxConfig(latency=0.01)) as fake:
+            settings.PROXMOX_HOST = fake.host
+    """
+
+    def __init__(self, config: Optional[FakeProxmoxConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeProxmoxConfig()
+        self.cluster = FakeCluster(self.config)
+        self._address = (host, port)
+        self._server: Optional[FakeProxmoxHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def host(self) -> str:
+        """Nilai untuk PROXMOX_HOST (host:port)"""
+        assert self._server is not None
+        address, port = self._server.server_address[:2]
+        return f"{address}:{port}"
+
+    def start(self) -> "FakeProxmox":
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="fake-proxmox-")
+        cert, key = _self_signed_cert(Path(self._tmpdir.name))
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        self._server = FakeProxmoxHTTPServer(self._address, self.cluster)
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-proxmox", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self) -> "FakeProxmox":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fake Proxmox VE API server untuk benchmark")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18006)
+    parser.add_argument("--node", default="pve")
+    parser.add_argument("--latency", type=float, default=0.02, help="detik per HTTP call")
+    parser.add_argument("--latency-jitter", type=float, default=0.01)
+    parser.add_argument("--clone-seconds", type=float, default=5.0)
+    parser.add_argument("--start-seconds", type=float, default=1.0)
+    parser.add_argument("--stop-seconds", type=float, default=0.5)
+    parser.add_argument("--delete-seconds", type=float, default=1.0)
+    parser.add_argument("--lock-timeout", type=float, default=10.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-operations", default="", help="comma separated, mis. clone,start")
+    parser.add_argument("--task-failure-rate", type=float, default=0.0)
+    parser.add_argument("--template", type=int, action="append", help="VMID template qemu (default 9000)")
+    parser.add_argument("--ct-template", type=int, action="append", help="CTID template lxc (default 8000)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    config = FakeProxmoxConfig(
+        node=args.node,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        task_seconds={"clone": args.clone_seconds, "start": args.start_seconds, "stop": args.stop_seconds,
+                      "suspend": args.stop_seconds, "delete": args.delete_seconds},
+        lock_timeout=args.lock_timeout,
+        failure_rate=args.failure_rate,
+        failure_operations=frozenset(op for op in args.failure_operations.split(",") if op),
+        task_failure_rate=args.task_failure_rate,
+        templates=tuple(args.template or (9000,)),
+        ct_templates=tuple(args.ct_template or (8000,)),
+        seed=args.seed,
+    )
+    fake = FakeProxmox(config, args.host, args.port).start()
+    print(f"Fake Proxmox listening on https://{fake.host} (node {config.node}), Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""
+Load Test
+Jalankan FastAPI app (uvicorn, in-process) terhadap fake Proxmox dan Ansible stub,
+lalu replay skenario awal kompetisi:
+
+1. herd      : N team x M level deploy bersamaan (thundering herd)
+2. sustained : flag spam + polling dashboard (scoreboard, list challenge) selama --duration
+
+Hasil: throughput, latency percentile dan error rate per endpoint.
+
+Usage:
+    python -m benchmarks.loadtest --teams 50 --levels 3 --duration 30 --json report.json
+
+Exit code: 0 = aman, 1 = ada endpoint dengan error rate di atas --max-error-rate.
+
+Settings app diambil dari environment saat import, jadi harness ini harus jalan
+di process sendiri (bukan di-import setelah app).
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.fake_proxmox import FakeProxmox, FakeProxmoxConfig
+
+
+# --- Statistik ---
+
+@dataclass
+class EndpointStats:
+    count: int
+    errors: int
+    error_rate: float
+    rps: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile dari list yang sudah terurut"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Kumpulan sample (endpoint, latency, ok) satu fase"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[Tuple[float, bool, int]]] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, endpoint: str, seconds: float, ok: bool, status: int = 0) -> None:
+        with self._lock:
+            self._samples.setdefault(endpoint, []).append((seconds, ok, status))
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self) -> Dict[str, EndpointStats]:
+        elapsed = max(self.elapsed, 1e-9)
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self._samples.items()}
+        report = {}
+        for endpoint, values in sorted(samples.items()):
+            latencies = sorted(seconds * 1000 for seconds, _, _ in values)
+            errors = sum(1 for _, ok, _ in values if not ok)
+            statuses: Dict[str, int] = {}
+            for _, _, status in values:
+                # 0 = koneksi gagal / timeout
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+            report[endpoint] = EndpointStats(
+                count=len(values),
+                errors=errors,
+                error_rate=round(errors / len(values), 4),
+                rps=round(len(values) / elapsed, 2),
+                p50_ms=round(percentile(latencies, 50), 2),
+                p90_ms=round(percentile(latencies, 90), 2),
+                p99_ms=round(percentile(latencies, 99), 2),
+                max_ms=round(latencies[-1], 2),
+                statuses=dict(sorted(statuses.items())),
+            )
+        return report
+
+
+# --- HTTP client ---
+
+class Client:
+    """Koneksi keep-alive per thread (http.client), mencatat setiap request ke Recorder"""
+
+    def __init__(self, host: str, port: int, timeout: float = 300):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def request(
+        self,
+        recorder: Recorder,
+        endpoint: str,
+        method: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        ok_statuses: Tuple[int, ...] = (200, 201, 202),
+    ) -> Tuple[int, Any]:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        start = time.perf_counter()
+        status, data = 0, None
+        try:
+            conn = self._conn()
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            raw = response.read()
+            status = response.status
+            data = json.loads(raw) if raw else None
+        except Exception as e:
+            # Koneksi rusak, buat baru di request berikutnya
+            self._local.conn = None
+            data = {"error": str(e)}
+        recorder.record(endpoint, time.perf_counter() - start, status in ok_statuses, status)
+        return status, data
+
+
+# --- Skenario ---
+
+@dataclass
+class LoadTestOptions:
+    teams: int = 20
+    levels: int = 3
+    concurrency: int = 64
+    duration: float = 10.0
+    spam_workers: int = 16
+    pollers: int = 8
+    poll_interval: float = 0.5
+    correct_flag_ratio: float = 0.05
+    proxmox_latency: float = 0.01
+    clone_seconds: float = 0.5
+    start_seconds: float = 0.2
+    ansible_seconds: float = 0.1
+    # Batas tunggu lock guest di fake Proxmox; default sama dengan lock config Proxmox (10 detik)
+    # supaya contention clone terlihat sebagai error, bukan tersembunyi di latency
+    lock_timeout: float = 10.0
+    seed: int = 1
+
+
+@dataclass
+class Deployed:
+    challenge_id: int
+    team: str
+    flag: Optional[str]
+
+
+def run_herd(client: Client, options: LoadTestOptions) -> Tuple[Recorder, List[Deployed]]:
+    """Semua team deploy semua level sekaligus"""
+    recorder = Recorder()
+    jobs = [(f"team-{t:03d}", level) for t in range(options.teams) for level in range(1, options.levels + 1)]
+    deployed: List[Deployed] = []
+    lock = threading.Lock()
+
+    def deploy(job):
+        team, level = job
+        status, data = client.request(
+            recorder, "POST /api/challenges", "POST", "/api/challenges",
+            {"level_id": level, "team_name": team},
+        )
+        if status in (200, 201) and data:
+            with lock:
+                deployed.append(Deployed(data["challenge_id"], team, data.get("flag")))
+
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        list(pool.map(deploy, jobs))
+    recorder.stop()
+    return recorder, deployed
+
+
+def run_sustained(client: Client, options: LoadTestOptions, deployed: List[Deployed]) -> Recorder:
+    """Flag spam + polling dashboard paralel selama options.duration"""
+    recorder = Recorder()
+    deadline = time.monotonic() + options.duration
+    teams = sorted({d.team for d in deployed}) or ["team-000"]
+
+    def spammer(worker: int):
+        local = random.Random(options.seed + worker)
+        while time.monotonic() < deadline and deployed:
+            target = local.choice(deployed)
+            correct = target.flag and local.random() < options.correct_flag_ratio
+            flag = target.flag if correct else f"CTF{{wrong-{local.getrandbits(32):08x}}}"
+            # Flag salah dijawab 200 (correct=false), 400 hanya untuk error
+            client.request(recorder, "POST /api/challenges/{id}/submit", "POST",
+                           f"/api/challenges/{target.challenge_id}/submit", {"flag": flag})
+
+    def poller(worker: int):
+        local = random.Random(options.seed * 1000 + worker)
+        while time.monotonic() < deadline:
+            client.request(recorder, "GET /api/scoreboard", "GET", "/api/scoreboard?limit=100")
+            team = local.choice(teams)
+            client.request(recorder, "GET /api/challenges", "GET", f"/api/challenges?team={team}&include_total=false")
+            time.sleep(options.poll_interval)
+
+    threads = [threading.Thread(target=spammer, args=(i,)) for i in range(options.spam_workers)]
+    threads += [threading.Thread(target=poller, args=(i,)) for i in range(options.pollers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    recorder.stop()
+    return recorder
+
+
+# --- Bootstrap app ---
+
+class StubAnsibleService:
+    """Pengganti AnsibleService: sukses setelah delay, tanpa SSH"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def run_playbook(self, request):
+        from schemas.types.ansible_types import AnsiblePlaybookReturn
+        time.sleep(self.seconds)
+        return AnsiblePlaybookReturn(success=True, status="successful", rc=0, stats={})
+
+
+def configure_environment(fake: FakeProxmox, workdir: str) -> None:
+    """Environment app harus di-set sebelum config.settings di-import"""
+    os.environ.update({
+        "PROXMOX_HOST": fake.host,
+        "PROXMOX_NODE": fake.config.node,
+        "PROXMOX_VERIFY_SSL": "false",
+        "TEMPLATE_VMID": str(fake.config.templates[0]),
+        "TEMPLATE_CTID": str(fake.config.ct_templates[0]),
+        "DB_PLATFORM": "sqlite",
+        "DB_DATABASE": os.path.join(workdir, "loadtest"),
+        "DB_SCHEMA_CHECK": "create_all",
+        "DB_ASYNC_ENABLED": "false",
+        "IDLE_SUSPEND_ENABLED": "false",
+        "ORPHAN_RECONCILE_ENABLED": "false",
+        # Error provisioning sudah terlihat di error rate; backtrace per request hanya noise
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "CRITICAL"),
+        "LOG_FILE": os.path.join(workdir, "loadtest.log"),
+        # Jangan bentrok dengan instance platform yang sedang jalan di direktori yang sama
+        "INSTANCE_LOCK_FILE": os.path.join(workdir, "loadtest.lock"),
+    })
+
+
+def start_app(options: LoadTestOptions):
+    """Start uvicorn di background thread, return (server, thread, port)"""
+    import socket
+    import uvicorn
+    from app import app
+    from api.dependencies import get_ansible_service
+
+    stub = StubAnsibleService(options.ansible_seconds)
+    app.dependency_overrides[get_ansible_service] = lambda: stub
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        time.sleep(0.05)
+    return server, thread, port
+
+
+def seed_levels(count: int) -> None:
+    from core.database import SessionLocal
+    from models import Level, CategoryEnum, DifficultyEnum
+
+    with SessionLocal() as db:
+        existing = db.query(Level).count()
+        for i in range(existing, count):
+            db.add(Level(name=f"level-{i + 1}", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY))
+        db.commit()
+
+
+def run_loadtest(options: LoadTestOptions) -> Dict[str, Any]:
+    fake_config = FakeProxmoxConfig(
+        latency=options.proxmox_latency,
+        task_seconds={"clone": options.clone_seconds, "start": options.start_seconds,
+                      "stop": options.start_seconds, "suspend": options.start_seconds, "delete": options.start_seconds},
+        lock_timeout=options.lock_timeout,
+        seed=options.seed,
+    )
+    with tempfile.TemporaryDirectory(prefix="ctf-loadtest-") as workdir, FakeProxmox(fake_config) as fake:
+        configure_environment(fake, workdir)
+        server, thread, port = start_app(options)
+        try:
+            seed_levels(options.levels)
+            client = Client("127.0.0.1", port)
+            herd, deployed = run_herd(client, options)
+            sustained = run_sustained(client, options, deployed)
+        finally:
+            server.should_exit = True
+            thread.join(timeout=30)
+
+    return {
+        "options": asdict(options),
+        "phases": {
+            "herd": {
+                "elapsed_s": round(herd.elapsed, 3),
+                "deployed": len(deployed),
+                "endpoints": {k: asdict(v) for k, v in herd.report().items()},
+            },
+            "sustained": {
+                "elapsed_s": round(sustained.elapsed, 3),
+                "endpoints": {k: asdict(v) for k, v in sustained.report().items()},
+            },
+        },
+        "proxmox_calls": dict(fake.cluster.calls),
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    lines = []
+    header = f"{'endpoint':<36} {'count':>7} {'rps':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'err%':>7}  status"
+    for phase, data in result["phases"].items():
+        extra = f", {data['deployed']} deployed" if "deployed" in data else ""
+        lines.append(f"== {phase} ({data['elapsed_s']:.2f}s{extra})")
+        lines.append(header)
+        for endpoint, s in data["endpoints"].items():
+            lines.append(
+                f"{endpoint:<36} {s['count']:>7} {s['rps']:>8.1f} {s['p50_ms']:>7.1f}ms {s['p90_ms']:>7.1f}ms "
+                f"{s['p99_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms {s['error_rate'] * 100:>6.2f}%  "
+                + " ".join(f"{code}x{n}" for code, n in s["statuses"].items())
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def error_rate_violations(result: Dict[str, Any], max_error_rate: float) -> List[str]:
+    """Endpoint yang error rate-nya melewati batas, format '<fase> <endpoint>: x% (statuses)'"""
+    violations = []
+    for phase, data in result["phases"].items():
+        for endpoint, s in data["endpoints"].items():
+            if s["error_rate"] > max_error_rate:
+                statuses = " ".join(f"{code}x{n}" for code, n in s["statuses"].items())
+                violations.append(f"{phase} {endpoint}: {s['error_rate'] * 100:.2f}% errors ({statuses})")
+    return violations
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Tuple[LoadTestOptions, argparse.Namespace]:
+    defaults = LoadTestOptions()
+    parser = argparse.ArgumentParser(description="Load test skenario awal kompetisi")
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--json", help="Tulis hasil lengkap ke file JSON")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Error rate maksimal per endpoint (0.01 = 1%%), di atas ini exit code 1")
+    args = parser.parse_args(argv)
+    options = LoadTestOptions(**{name: getattr(args, name) for name in asdict(defaults)})
+    return options, args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options, args = parse_args(argv)
+    result = run_loadtest(options)
+    print(format_report(result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    violations = error_rate_violations(result, args.max_error_rate)
+    if violations:
+        print(f"FAILED: error rate above {args.max_error_rate * 100:.2f}%", file=sys.stderr)
+        for line in violations:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from dotenv import load_dotenv
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     DB_HOST: str = "localhost"
     DB_PORT: int = 3006
     DB_DATABASE: str = "ctf_db"
+    # Cek schema saat startup: alembic = revision DB harus head (production),
+    # create_all = buat tabel langsung dari model (dev/sqlite), off = skip
+    DB_SCHEMA_CHECK: Literal["alembic", "create_all", "off"] = "alembic"
     
     @property
     def DB_URL(self) -> str:
@@ -35,12 +38,35 @@ class Settings(BaseSettings):
         else:
             raise ValueError(f"Unsupported DB_PLATFORM: {self.DB_PLATFORM}")
     
+    # Async engine (opsional), butuh driver aiosqlite / aiomysql / asyncpg
+    DB_ASYNC_ENABLED: bool = False
+    DB_ASYNC_DRIVER: str = "aiomysql"  # aiomysql atau asyncmy untuk MySQL
+    
+    @property
+    def DB_ASYNC_URL(self) -> str:
+        if self.DB_PLATFORM == "sqlite":
+            return f"sqlite+aiosqlite:///{self.DB_DATABASE}.db"
+        elif self.DB_PLATFORM == "mysql":
+            return f"mysql+{self.DB_ASYNC_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_DATABASE}"
+        elif self.DB_PLATFORM == "postgresql":
+            return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_DATABASE}"
+        else:
+            raise ValueError(f"Unsupported DB_PLATFORM: {self.DB_PLATFORM}")
+    
     # Proxmox
     PROXMOX_HOST: str = Field(default="192.168.1.100")
     PROXMOX_USER: str = Field(default="root@pam")
     PROXMOX_PASSWORD: str = Field(default="")
     PROXMOX_NODE: str = "pve"
     PROXMOX_VERIFY_SSL: bool = False
+    PROXMOX_TIMEOUT: int = 10  # detik per HTTP request ke Proxmox
+    PROXMOX_CALL_DEADLINE: float = 30.0  # total waktu satu call GET termasuk retry
+    PROXMOX_RETRY_ATTEMPTS: int = 3  # hanya untuk call idempotent (GET)
+    PROXMOX_RETRY_BASE_DELAY: float = 0.2  # detik, backoff eksponensial + jitter
+    PROXMOX_RETRY_MAX_DELAY: float = 5.0
+    PROXMOX_BREAKER_FAILURES: int = 5  # kegagalan transient berturut-turut sebelum circuit open
+    PROXMOX_BREAKER_RESET: float = 30.0  # detik circuit open sebelum probe half-open
+    PROXMOX_BREAKER_HALF_OPEN_CALLS: int = 1
     
     # SSH
     SSH_USERNAME: str = "root"
@@ -52,8 +78,26 @@ class Settings(BaseSettings):
     DEFAULT_VM_MEMORY: int = 512
     DEFAULT_VM_CORES: int = 1
     DEFAULT_VM_STORAGE: str = "10G"
-    DEFAULT_CHALLENGE_DURATION: int = 3600
-    MAX_CONCURRENT_DEPLOYMENTS: int = 10
+    DEFAULT_STORAGE: str = "local-lvm"  # Storage target clone jika Level.storage kosong
+    TEMPLATE_VMID: int = 0  # Template VM (qemu) jika Level.template_vmid kosong
+    TEMPLATE_CTID: int = 0  # Template container (lxc) jika Level.template_vmid kosong
+    MAX_VM_MEMORY: int = 4096  # MB, batas override vm_config dari request
+    MAX_VM_CORES: int = 4
+    LEVEL_PROFILE_TTL: int = 300  # detik cache profil Level
+    DEFAULT_CHALLENGE_DURATION: int = 3600  # detik, dipakai kalau Level.duration kosong
+    CHALLENGE_EXTEND_MAX: int = 3600  # detik maksimal per request extend
+    CHALLENGE_MAX_LIFETIME: int = 14400  # detik, batas total umur VM sejak start (termasuk extend)
+    MAX_CONCURRENT_DEPLOYMENTS: int = 10  # untuk seluruh platform (platform wajib satu proses)
+    MAX_CONCURRENT_DEPLOYMENTS_PER_NODE: int = 5  # 0 = hanya batas global
+    DEPLOYMENT_QUEUE_SIZE: int = 200  # request yang boleh menunggu slot, sisanya 429
+    DEPLOYMENT_QUEUE_TIMEOUT: int = 300  # detik menunggu slot sebelum 503
+    DEPLOYMENT_QUEUE_PER_TEAM: int = 20  # jatah antrian per team (0 = tanpa batas)
+    DEPLOYMENT_PRIORITY_BURST: int = 3  # admit lane retry/reset berturut-turut sebelum giliran lane normal
+    DEPLOYMENT_RETRY_WINDOW: int = 900  # detik slot gagal tetap masuk lane retry
+    DEPLOYMENT_ESTIMATE_SECONDS: int = 120  # estimasi awal durasi provisioning (Retry-After)
+    PROVISION_WAIT_TIMEOUT: int = 600  # detik, retry menunggu provisioning yang sedang jalan
+    IDEMPOTENCY_TTL: int = 86400  # detik
+    IDEMPOTENCY_MAX_KEYS: int = 100000
     
     # Flag
     FLAG_PREFIX: str = "CTF"
@@ -66,9 +110,84 @@ class Settings(BaseSettings):
     PUBLIC_BRIDGE: str = "vmbr0"
     MANAGEMENT_BRIDGE: str = "vmbr1"
     
+    # Orphan VM reconciler
+    ORPHAN_RECONCILE_ENABLED: bool = True
+    ORPHAN_RECONCILE_INTERVAL: int = 300  # detik antar pass
+    ORPHAN_GRACE_SECONDS: int = 900  # VM tanpa Deployment baru dihapus setelah selama ini (provisioning in-flight)
+    RECLAIM_BATCH_SIZE: int = 5
+    RECLAIM_BATCH_INTERVAL: float = 10.0  # detik jeda antar batch destroy
+    
+    # Expiry scheduler
+    EXPIRY_ENABLED: bool = True
+    EXPIRY_ACTION: Literal["destroy", "stop"] = "destroy"
+    EXPIRY_RETRY_DELAY: float = 30.0  # detik, dikali 2 tiap stop yang gagal
+    EXPIRY_RETRY_MAX_DELAY: float = 600.0  # batas atas backoff, deadline tidak pernah dibuang
+    
+    # Idle detector (suspend to disk)
+    IDLE_SUSPEND_ENABLED: bool = True
+    IDLE_CHECK_INTERVAL: int = 60  # detik antar pass metrics
+    IDLE_SUSPEND_AFTER: int = 1800  # detik idle sebelum VM di-hibernate
+    IDLE_CPU_THRESHOLD: float = 0.02  # fraksi CPU (0.02 = 2%)
+    IDLE_NET_BYTES: int = 20480  # bytes in+out per pass, di bawah ini dianggap idle
+    IDLE_SUSPEND_BATCH: int = 5  # maksimal VM di-suspend per pass
+    
+    # Reclamation queue (destroy VM di background)
+    RECLAIM_CONCURRENCY: int = 2  # Maksimal destroy paralel ke node
+    RECLAIM_MAX_ATTEMPTS: int = 3
+    RECLAIM_RETRY_DELAY: float = 30.0  # detik, dikali 2 tiap retry
+    
+    # Stop queue (stop VM setelah flag benar, di background)
+    STOP_BATCH_SIZE: int = 50
+    STOP_BATCH_WINDOW: float = 0.5  # detik menunggu stop lain supaya ikut satu batch
+    STOP_MAX_ATTEMPTS: int = 3
+    STOP_RETRY_DELAY: float = 5.0  # detik, dikali 2 tiap retry
+    
+    # Pagination
+    CHALLENGE_PAGE_SIZE: int = 50
+    CHALLENGE_PAGE_MAX: int = 500
+    
+    # Event stream (SSE)
+    SSE_KEEPALIVE_SECONDS: int = 15
+    SSE_SUBSCRIBER_QUEUE_SIZE: int = 256
+    SSE_REPLAY_BUFFER: int = 1024
+    SSE_MAX_SUBSCRIBERS: int = 5000
+    
+    # Executor lanes: provisioning/Proxmox tidak memakai threadpool handler sync lain
+    API_THREADPOOL_SIZE: int = 40  # threadpool AnyIO (default 40)
+    PROVISIONING_WORKERS: int = 0  # 0 = MAX_CONCURRENT_DEPLOYMENTS + DEPLOYMENT_QUEUE_SIZE (waiter admission ikut memegang thread)
+    PROVISIONING_QUEUE_SIZE: int = 100
+    PROXMOX_WORKERS: int = 16
+    PROXMOX_QUEUE_SIZE: int = 100
+    
+    # Health prober
+    HEALTH_CHECK_INTERVAL: int = 10  # detik antar probe dependency
+    HEALTH_STALE_AFTER: int = 30  # hasil probe lebih tua dari ini dianggap tidak valid (not ready)
+    HEALTH_PROBE_TIMEOUT: int = 10  # detik; probe yang belum selesai selama ini dilaporkan down
+    
+    # Metrics (Prometheus)
+    METRICS_ENABLED: bool = True
+    
+    # Tracing (span DB/Proxmox/Ansible per request/job)
+    TRACE_EXPORTER: Literal["none", "file", "otlp"] = "none"
+    TRACE_FILE: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318"  # collector OTLP/HTTP
+    TRACE_SAMPLE_RATE: float = 0.1  # fraksi request/job yang di-trace
+    TRACE_QUEUE_SIZE: int = 1000  # trace pending export, lebih dari ini di-drop
+    TRACE_BATCH_SIZE: int = 512  # span per export
+    
+    # Log durasi tiap langkah startup worker
+    STARTUP_PROFILE: bool = False
+    # Lock file single-process (opsional): state platform ada di memory, proses kedua di host yang
+    # sama ditolak saat startup. Default off; isi path absolut per deployment, mis. /run/ctf-platform/app.lock
+    INSTANCE_LOCK_FILE: str = ""
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "ctf_platform.log"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_ENQUEUE: bool = True  # tulis log (termasuk rotation/kompresi) di thread terpisah
+    # Sampling DEBUG/INFO per logger untuk hot path, format "logger=rate,..." (rate 0..1)
+    LOG_SAMPLING: str = "core.database=0.01"
     
     class Config:
         env_file = ".env"
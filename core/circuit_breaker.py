@@ -0,0 +1,126 @@
+"""
+Circuit Breaker
+Berhenti memanggil dependency yang sedang down (fail fast) dan hanya mengirim
+probe terbatas untuk mengecek apakah sudah pulih.
+
+closed    : semua call lewat; N kegagalan transient berturut-turut -> open
+open      : call langsung ditolak (CircuitOpenError) selama reset_timeout
+half_open : maksimal half_open_calls probe; sukses -> closed, gagal -> open lagi
+"""
+
+import random
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+from core.exceptions import CircuitOpenError
+from core.metrics import registry
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = registry.gauge("circuit_breaker_state", "State circuit breaker (0 closed, 1 half-open, 2 open)", ("name",))
+CIRCUIT_REJECTED = registry.counter("circuit_breaker_rejected_total", "Call yang ditolak karena circuit open", ("name",))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = max(1, half_open_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        # Satu callback per nama breaker, lewat weakref supaya gauge tidak menahan breaker lama
+        ref = weakref.ref(self)
+        CIRCUIT_STATE.set_function(lambda: _state_value(ref), key=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: Circuit open, atau slot probe half-open sudah terpakai
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_calls:
+                if self._state == OPEN:
+                    self._state = HALF_OPEN
+                self._probes += 1
+                return
+            retry_after = self._retry_after()
+        CIRCUIT_REJECTED.inc(name=self.name)
+        raise CircuitOpenError(f"Circuit '{self.name}' is open, retry in {retry_after:.0f}s", retry_after=retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == OPEN:
+                # Call lama yang dimulai sebelum circuit open baru selesai: bukan bukti pulih,
+                # circuit hanya boleh closed lewat probe half-open
+                return
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                # Probe gagal: kembali open dan tunggu reset_timeout lagi
+                self._probes = max(0, self._probes - 1)
+                self._open()
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return self._retry_after() if self._current_state() == OPEN else 0.0
+
+    # --- Internal (dipanggil dengan _lock) ---
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._failures = 0
+
+    def _retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+
+def _state_value(ref: "weakref.ref[CircuitBreaker]") -> dict:
+    breaker = ref()
+    if breaker is None:
+        return {}
+    return {(breaker.name,): _STATE_VALUES[breaker.state]}
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Optional[random.Random] = None) -> float:
+    """Full jitter: acak di [0, min(cap, base * 2^attempt)] supaya retry tidak serempak"""
+    return (rng or random).uniform(0, min(cap, base * (2 ** attempt)))
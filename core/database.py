@@ -1,24 +1,49 @@
-from sqlalchemy import create_engine
+import re
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional, Set, TYPE_CHECKING
 from config.settings import settings
+from core.exceptions import SchemaOutOfDateError
+from core.tracing import instrument_engine, tracer
 from loguru import logger
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 # Create SQLAlchemy engine
-if settings.DATABASE_URL.startswith("sqlite"):
+if settings.DB_URL.startswith("sqlite"):
     engine = create_engine(
-        settings.DATABASE_URL,
+        settings.DB_URL,
         connect_args={"check_same_thread": False}
     )
 else:
-    engine = create_engine(settings.DATABASE_URL,
+    engine = create_engine(settings.DB_URL,
                            pool_pre_ping=True,
                            echo=settings.DEBUG)
 
+instrument_engine(engine, tracer)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional async engine, query bisa jalan langsung di event loop
+# (import di dalam if karena sqlalchemy.ext.asyncio butuh greenlet)
+async_engine: Optional["AsyncEngine"] = None
+AsyncSessionLocal: Optional["async_sessionmaker[AsyncSession]"] = None
+
+if settings.DB_ASYNC_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    if settings.DB_PLATFORM == "sqlite":
+        async_engine = create_async_engine(settings.DB_ASYNC_URL)
+    else:
+        async_engine = create_async_engine(settings.DB_ASYNC_URL,
+                                           pool_pre_ping=True,
+                                           echo=settings.DEBUG)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -36,6 +61,18 @@ def get_db() -> Generator[Session, None, None]:
         logger.debug("Database session closed")
 
 
+async def get_async_db() -> AsyncGenerator[Optional["AsyncSession"], None]:
+    """
+    Dependency to get async database session.
+    Yields None when DB_ASYNC_ENABLED is off so callers can fall back to the sync session.
+    """
+    if AsyncSessionLocal is None:
+        yield None
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables"""
     logger.info("Initializing database tables...")
@@ -43,6 +80,53 @@ def init_db():
     logger.info("Database tables created successfully")
 
 
+ALEMBIC_VERSIONS_DIR = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+_REVISION_RE = re.compile(r"^revision\s*(?::[^=]*)?=\s*['\"]([0-9a-zA-Z_]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*(?::[^=]*)?=\s*(.+)$", re.MULTILINE)
+
+
+def alembic_heads(versions_dir: Path = ALEMBIC_VERSIONS_DIR) -> Set[str]:
+    """
+    Head revision Alembic dari header file migrasi.
+    Hanya membaca teks file (tanpa import alembic/script), cukup cepat untuk tiap worker start.
+    """
+    revisions: Set[str] = set()
+    parents: Set[str] = set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION_RE.search(source)
+        if down is not None:
+            # down_revision bisa None, string, atau tuple (merge)
+            parents.update(re.findall(r"['\"]([0-9a-zA-Z_]+)['\"]", down.group(1)))
+    return revisions - parents
+
+
+def check_schema(bind=None, versions_dir: Path = ALEMBIC_VERSIONS_DIR) -> str:
+    """
+    Pastikan database sudah di-migrate ke head Alembic (satu query ke alembic_version).
+    
+    Raises:
+        SchemaOutOfDateError: If the database revision is missing or not a head
+    """
+    bind = bind if bind is not None else engine
+    heads = alembic_heads(versions_dir)
+    with bind.connect() as conn:
+        if not inspect(conn).has_table("alembic_version"):
+            raise SchemaOutOfDateError(
+                "Database belum di-migrate (tabel alembic_version tidak ada). Jalankan 'alembic upgrade head'."
+            )
+        current = {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    if current != heads:
+        raise SchemaOutOfDateError(
+            f"Database revision {sorted(current)} != Alembic head {sorted(heads)}. Jalankan 'alembic upgrade head'."
+        )
+    return next(iter(current))
+
+
 def drop_db():
     """Drop all database tables (use with caution!)"""
     logger.warning("Dropping all database tables...")
@@ -17,3 +17,45 @@ class ResourceNotFoundError(Exception):
 class VMCreationError(ProxmoxError):
     """Raised when VM creation fails"""
     pass
+
+class IdempotencyKeyConflictError(Exception):
+    """Raised when an Idempotency-Key is reused for a different request"""
+    pass
+
+class ProvisioningInProgressError(Exception):
+    """Raised when a matching provisioning is still running after the wait timeout"""
+    pass
+
+class SchemaOutOfDateError(Exception):
+    """Raised on startup when the database is not at the Alembic head revision"""
+    pass
+
+class InstanceLockError(Exception):
+    """Raised on startup when another platform process already holds the instance lock"""
+    pass
+
+class DeploymentQueueFullError(Exception):
+    """Raised when the provisioning admission queue is full"""
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class DeploymentQueueTimeoutError(DeploymentQueueFullError):
+    """Raised when a queued provisioning gets no slot within DEPLOYMENT_QUEUE_TIMEOUT"""
+    pass
+
+class ExecutorSaturatedError(Exception):
+    """Raised when an executor lane has no free worker and its queue is full"""
+    pass
+
+class CircuitOpenError(Exception):
+    """Raised when a circuit breaker rejects a call while its dependency recovers"""
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ProxmoxUnavailableError(ProxmoxConnectionError):
+    """Raised when Proxmox fails with a transient error (network, timeout, 5xx) or its circuit is open"""
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,116 @@
+"""
+Executor Lanes
+Thread pool terpisah untuk pekerjaan lambat (provisioning, call Proxmox) supaya
+tidak menghabiskan threadpool AnyIO yang dipakai handler sync lain (submit, GET).
+
+Setiap lane punya worker dan antrian terbatas; waktu tunggu di antrian dicatat
+ke histogram executor_queue_wait_seconds{lane}.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from core.exceptions import ExecutorSaturatedError
+from core.metrics import registry
+
+T = TypeVar("T")
+
+EXECUTOR_QUEUE_WAIT = registry.histogram(
+    "executor_queue_wait_seconds", "Waktu tunggu task di antrian executor lane", ("lane",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+EXECUTOR_THREADS = registry.gauge("executor_tasks", "Task aktif/antri per executor lane", ("lane", "state"))
+
+
+class ExecutorLane:
+    """
+    ThreadPoolExecutor berantrian terbatas.
+
+    Task membawa contextvars pemanggil (trace, correlation id, logger.contextualize)
+    seperti anyio.to_thread.run_sync.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"lane-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Raises:
+            ExecutorSaturatedError: Semua worker sibuk dan antrian penuh
+        """
+        with self._lock:
+            if self._active >= self.max_workers and self._queued >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(f"Executor lane '{self.name}' is saturated ({self._queued} queued)")
+            self._queued += 1
+        context = contextvars.copy_context()
+        enqueued = time.perf_counter()
+
+        def task() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            EXECUTOR_QUEUE_WAIT.observe(time.perf_counter() - enqueued, lane=self.name)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        try:
+            return self._executor.submit(task)
+        except RuntimeError:
+            # Executor sudah shutdown
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Jalankan fn di lane ini dan tunggu hasilnya tanpa memblok event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def configure_default_threadpool(total_tokens: int) -> Optional[Any]:
+    """
+    Set kapasitas threadpool AnyIO (handler/dependency sync FastAPI).
+    Harus dipanggil dari event loop (lifespan). Return limiter-nya untuk statistik.
+    """
+    import anyio.to_thread
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    if total_tokens > 0:
+        limiter.total_tokens = total_tokens
+    return limiter
+
+
+def limiter_stats(limiter: Any) -> Dict[str, int]:
+    stats = limiter.statistics()
+    return {
+        "workers": int(limiter.total_tokens),
+        "active": stats.borrowed_tokens,
+        "queued": stats.tasks_waiting,
+    }
@@ -0,0 +1,87 @@
+"""
+Instance Lock
+Scoreboard, event stream (SSE), antrian (admission, stop, reclaim) dan scheduler
+(expiry, idle detector, reconciler, health prober) hidup di memory proses, jadi
+platform harus berjalan sebagai SATU proses. Lock file exclusive diambil saat
+startup; proses kedua (uvicorn --workers N, instance kedua di host yang sama)
+gagal start alih-alih diam-diam memegang state sendiri.
+"""
+
+import os
+from typing import IO, Optional
+
+from core.exceptions import InstanceLockError
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def check_single_process() -> None:
+    """
+    Tolak konfigurasi multi-worker uvicorn/gunicorn (WEB_CONCURRENCY) sebelum ada worker
+    yang sempat memegang slot provisioning: tiap worker punya AdmissionController sendiri,
+    sehingga Proxmox akan menerima N x MAX_CONCURRENT_DEPLOYMENTS clone bersamaan.
+
+    Raises:
+        InstanceLockError: WEB_CONCURRENCY lebih dari 1
+    """
+    workers = os.environ.get("WEB_CONCURRENCY", "").strip()
+    if workers.isdigit() and int(workers) > 1:
+        raise InstanceLockError(
+            f"WEB_CONCURRENCY={workers}: the platform must run as a single process, "
+            "admission limits and schedulers are per process"
+        )
+
+
+class InstanceLock:
+    """Lock file non-blocking; dilepas otomatis oleh OS kalau proses mati"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle: Optional[IO[str]] = None
+
+    def acquire(self) -> None:
+        """
+        Raises:
+            InstanceLockError: Proses lain sudah memegang lock
+        """
+        if self._handle is not None:
+            return
+        handle = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.seek(0)
+            owner = handle.read().strip() or "?"
+            handle.close()
+            raise InstanceLockError(
+                f"Another CTF Platform process (pid {owner}) holds {self.path}. "
+                "The platform keeps its state in memory and must run as a single process (no --workers)."
+            )
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._handle = handle
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        else:
+            self._handle.seek(0)
+            msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        self._handle.close()
+        self._handle = None
+
+    @property
+    def held(self) -> bool:
+        return self._handle is not None
@@ -0,0 +1,45 @@
+"""
+Lazy import untuk dependency berat (ansible_runner, proxmoxer).
+
+Module baru di-import saat pertama kali dipakai, bukan saat worker uvicorn start.
+Object proxy tetap bisa di-patch di test seperti module/class biasa.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """Proxy module: attribute access pertama meng-import module aslinya"""
+
+    def __init__(self, name: str):
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_lazy_name"])
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self.__dict__['_lazy_name']}'>"
+
+
+class LazyCallable:
+    """Proxy class/function dari module lain, di-import saat pertama kali dipanggil"""
+
+    def __init__(self, module: str, attr: str):
+        self._module = LazyModule(module)
+        self._attr = attr
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return getattr(self._module, self._attr)(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module.__dict__['_lazy_name']}.{self._attr}>"
@@ -1,32 +1,135 @@
 import sys
+import itertools
+import json
+import threading
+import traceback
+from typing import Callable, Dict
 from loguru import logger
 from config.settings import settings
 
+# Format teks (default)
+CONSOLE_FORMAT = ("<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+                  "<level>{level: <8}</level> | "
+                  "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+                  "<level>{message}</level>")
+FILE_FORMAT = ("{time:YYYY-MM-DD HH:mm:ss} | "
+               "{level: <8} | "
+               "{name}:{function}:{line} - {message}")
+
+
+def json_format(record) -> str:
+    """Satu object JSON per baris (field ringkas, bukan serialize=True loguru yang menyertakan seluruh record)"""
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    extra = {key: value for key, value in record["extra"].items() if not key.startswith("_")}
+    if extra:
+        payload["extra"] = extra
+    if record["exception"] is not None:
+        payload["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["_json"] = json.dumps(payload, default=str)
+    # Braces di hasil JSON tidak boleh diinterpretasi loguru sebagai format field
+    return "{extra[_json]}\n"
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """'core.database=0.01,services.proxmox_service=0.1' -> {name: rate}"""
+    rates: Dict[str, float] = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, rate = item.split("=", 1)
+        rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def sampling_filter(rates: Dict[str, float]) -> Callable[[dict], bool]:
+    """
+    Filter sink: untuk logger di `rates`, hanya 1 dari tiap 1/rate record DEBUG/INFO yang ditulis.
+    WARNING ke atas selalu lolos. Prefix module juga cocok (services.proxmox_service.* ).
+    """
+    counters: Dict[str, "itertools.count[int]"] = {}
+    lock = threading.Lock()
+    warning_no = logger.level("WARNING").no
+
+    def _rate(name: str) -> float:
+        while name:
+            if name in rates:
+                return rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def _filter(record) -> bool:
+        if record["level"].no >= warning_no or not rates:
+            return True
+        name = record["name"] or ""
+        rate = _rate(name)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        counter = counters.get(name)
+        if counter is None:
+            with lock:
+                counter = counters.setdefault(name, itertools.count())
+        # next() pada itertools.count atomic di CPython
+        return next(counter) % round(1 / rate) == 0
+
+    return _filter
+
+
+def sampling_patcher(decide: Callable[[dict], bool]) -> Callable[[dict], None]:
+    """
+    Ambil keputusan sampling sekali per record (extra._sampled), bukan per sink:
+    filter yang dipakai bersama beberapa sink akan memajukan counter sekali per sink.
+    """
+    def _patch(record) -> None:
+        record["extra"]["_sampled"] = decide(record)
+
+    return _patch
+
+
+def is_sampled(record) -> bool:
+    """Filter sink: baca keputusan dari sampling_patcher"""
+    return record["extra"].get("_sampled", True)
+
+
 # Configure logger
 logger.remove()
+logger.configure(patcher=sampling_patcher(sampling_filter(parse_sampling(settings.LOG_SAMPLING))))
+
+_json = settings.LOG_FORMAT == "json"
 
 # Console output
+# enqueue=True: record dikirim ke queue dan ditulis thread terpisah, request tidak menunggu I/O
 logger.add(
     sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-           "<level>{level: <8}</level> | "
-           "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-           "<level>{message}</level>",
+    format=json_format if _json else CONSOLE_FORMAT,
     level=settings.LOG_LEVEL,
-    colorize=True,
+    colorize=not _json,
+    filter=is_sampled,
+    enqueue=settings.LOG_ENQUEUE,
 )
 
 # File output
+# Dengan enqueue, rotation dan kompresi zip juga berjalan di thread writer
 logger.add(
     settings.LOG_FILE,
-    format="{time:YYYY-MM-DD HH:mm:ss} | "
-           "{level: <8} | "
-           "{name}:{function}:{line} - {message}",
+    format=json_format if _json else FILE_FORMAT,
     level=settings.LOG_LEVEL,
     rotation="10 MB",
     retention="30 days",
     compression="zip",
+    filter=is_sampled,
+    enqueue=settings.LOG_ENQUEUE,
+    # File baru dibuka saat log pertama ditulis, bukan saat import
+    delay=True,
 )
 
 # Export logger
-__all__ = ["logger"]
\ No newline at end of file
+__all__ = ["logger"]
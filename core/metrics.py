@@ -0,0 +1,313 @@
+"""
+Metrics
+Counter, gauge dan histogram in-process dengan output format teks Prometheus (GET /metrics).
+
+Counter dan histogram menyimpan nilai di shard per thread: thread yang mengupdate
+hanya menulis ke dict miliknya sendiri sehingga hot path tidak perlu lock.
+Shard baru dijumlahkan saat scrape. Shard milik thread yang sudah mati dilebur ke
+nilai base supaya jumlah shard tidak tumbuh terus (worker thread datang dan pergi).
+"""
+
+import bisect
+import math
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+GaugeValue = Union[float, Dict[LabelValues, float]]
+
+# Bucket default (detik), cukup lebar untuk request HTTP sampai clone VM
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class _ShardOwner:
+    """Disimpan di thread-local; ikut di-GC saat thread mati sehingga finalizer shard jalan"""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard: dict):
+        self.shard = shard
+
+
+class _Sharded(_Metric):
+    """Base untuk metric yang nilainya disimpan per thread"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._local = threading.local()
+        # Lock hanya dipakai saat thread mendaftarkan/melepas shard dan saat scrape.
+        # RLock karena finalizer bisa terpicu GC di thread yang sedang memegang lock.
+        self._shards_lock = threading.RLock()
+        self._shards: List[dict] = []
+        # Akumulasi shard dari thread yang sudah selesai
+        self._base: dict = {}
+
+    def _shard(self) -> dict:
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = _ShardOwner({})
+            self._local.owner = owner
+            with self._shards_lock:
+                self._shards.append(owner.shard)
+            weakref.finalize(owner, self._retire, owner.shard)
+        return owner.shard
+
+    def _retire(self, shard: dict) -> None:
+        with self._shards_lock:
+            for index, candidate in enumerate(self._shards):
+                if candidate is shard:
+                    del self._shards[index]
+                    break
+            for key, value in shard.items():
+                self._base[key] = self._merge(self._base.get(key), value)
+
+    def _merge(self, total, value):
+        raise NotImplementedError
+
+    def _snapshots(self) -> List[dict]:
+        with self._shards_lock:
+            shards = [self._base] + self._shards
+            # dict.copy() atomic di CPython, aman walau thread pemilik sedang menulis
+            return [shard.copy() for shard in shards]
+
+
+class Counter(_Sharded):
+    type_name = "counter"
+
+    def _merge(self, total: Optional[float], value: float) -> float:
+        return (total or 0.0) + value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        return sum(shard.get(key, 0.0) for shard in self._snapshots())
+
+    def collect(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Sharded):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _merge(self, total: Optional[list], value: list) -> list:
+        counts, value_sum = value
+        if total is None:
+            return [list(counts), value_sum]
+        return [[a + b for a, b in zip(total[0], counts)], total[1] + value_sum]
+
+    def observe(self, value: float, **labels: str) -> None:
+        shard = self._shard()
+        key = self._key(labels)
+        entry = shard.get(key)
+        if entry is None:
+            # [count per bucket (non-kumulatif) + overflow, sum]
+            entry = [[0] * (len(self.buckets) + 1), 0.0]
+            shard[key] = entry
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        totals: Dict[LabelValues, Tuple[List[int], float]] = {}
+        for shard in self._snapshots():
+            for key, (counts, total) in shard.items():
+                counts = list(counts)
+                if key in totals:
+                    merged, merged_sum = totals[key]
+                    totals[key] = ([a + b for a, b in zip(merged, counts)], merged_sum + total)
+                else:
+                    totals[key] = (counts, total)
+        return totals
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total) in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Gauge yang dibaca saat scrape lewat callback, mis. panjang queue atau pool DB.
+    Callback mengembalikan float atau dict label values -> float.
+    Satu callback per key: mendaftarkan ulang key yang sama mengganti callback lama,
+    jadi object yang dibuat berkali-kali (mis. di test) tidak menumpuk callback.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._callbacks: Dict[str, Callable[[], GaugeValue]] = {}
+
+    def set_function(self, fn: Callable[[], GaugeValue], key: str = "") -> None:
+        self._callbacks[key] = fn
+
+    def remove_function(self, key: str = "") -> None:
+        self._callbacks.pop(key, None)
+
+    def collect(self) -> Dict[LabelValues, float]:
+        values: Dict[LabelValues, float] = {}
+        for fn in list(self._callbacks.values()):
+            try:
+                result = fn()
+            except Exception:
+                # Scrape tidak boleh gagal karena satu sumber error
+                continue
+            if isinstance(result, dict):
+                values.update({tuple(map(str, key)): float(value) for key, value in result.items()})
+            elif result is not None:
+                values[()] = float(result)
+        return values
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Kumpulan metric, dirender berurutan sesuai urutan registrasi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered as {existing.type_name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = MetricsRegistry()
+
+# Metric hot path, didefinisikan di sini supaya service cukup import object-nya
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Latency request HTTP per route", ("method", "route", "status")
+)
+PROXMOX_API_DURATION = registry.histogram(
+    "proxmox_api_duration_seconds", "Latency call Proxmox API per endpoint", ("endpoint",)
+)
+PROXMOX_API_ERRORS = registry.counter(
+    "proxmox_api_errors_total", "Jumlah call Proxmox API yang gagal per endpoint", ("endpoint",)
+)
+PROXMOX_API_RETRIES = registry.counter(
+    "proxmox_api_retries_total", "Jumlah retry call Proxmox API idempotent per endpoint", ("endpoint",)
+)
+ANSIBLE_RUN_DURATION = registry.histogram(
+    "ansible_run_duration_seconds", "Durasi ansible playbook run", ("playbook", "status"),
+    buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+DB_POOL = registry.gauge("db_pool_connections", "Koneksi pool SQLAlchemy per state", ("state",))
+QUEUE_DEPTH = registry.gauge("queue_depth", "Jumlah item pending per queue background", ("queue",))
@@ -0,0 +1,48 @@
+"""
+Startup Profiler
+Catat durasi tiap langkah startup worker (import, schema check, start background service)
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class StartupProfiler:
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.steps: List[Tuple[str, float]] = []
+        self.ready_at: Optional[float] = None
+
+    def mark(self, name: str, since: float) -> None:
+        self.steps.append((name, time.perf_counter() - since))
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, start)
+
+    def finish(self) -> float:
+        self.ready_at = time.perf_counter()
+        return self.ready_at - self.started
+
+    def report(self) -> Dict[str, object]:
+        total = (self.ready_at or time.perf_counter()) - self.started
+        return {
+            "total_ms": round(total * 1000, 1),
+            "steps": [{"name": name, "ms": round(seconds * 1000, 1)} for name, seconds in self.steps],
+        }
+
+    def format(self) -> str:
+        report = self.report()
+        width = max((len(step["name"]) for step in report["steps"]), default=0)
+        lines = [f"  {step['name']:<{width}}  {step['ms']:>9.1f} ms" for step in report["steps"]]
+        lines.append(f"  {'total':<{width}}  {report['total_ms']:>9.1f} ms")
+        return "Startup profile:\n" + "\n".join(lines)
+
+
+# Dimulai saat module pertama kali di-import (awal import app)
+profiler = StartupProfiler()
@@ -0,0 +1,309 @@
+"""
+Tracing
+Correlation id per request/job dan span ringan (DB, Proxmox, Ansible, lock wait)
+yang diekspor ke file JSON lines atau collector OTLP/HTTP.
+
+State trace disimpan di contextvars sehingga ikut ke threadpool FastAPI.
+Request yang tidak ter-sample tetap mendapat correlation id, tapi span-nya no-op.
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import settings as app_settings
+from config.settings import Settings
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    name: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+@dataclass
+class _Trace:
+    trace_id: str
+    sampled: bool
+    spans: List[Span] = field(default_factory=list)
+
+
+_trace: ContextVar[Optional[_Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def current_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
+# --- Exporters ---
+
+class SpanExporter:
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class FileSpanExporter(SpanExporter):
+    """Satu span per baris (JSON), mudah di-grep per trace_id"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OtlpSpanExporter(SpanExporter):
+    """OTLP/HTTP JSON (POST {endpoint}/v1/traces), tanpa dependency opentelemetry"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "core.tracing"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                    "attributes": [{"key": k, "value": self._value(v)} for k, v in span.attributes.items()],
+                    # 1 = OK, 2 = ERROR
+                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                } for span in spans],
+            }],
+        }]}
+
+    def export(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(self.payload(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+# --- Tracer ---
+
+class Tracer:
+    """
+    Root trace dibuat per request (middleware) atau per job background (start_trace),
+    span anak lewat span()/start_span(). Trace selesai diantrikan lalu diekspor
+    batch oleh thread terpisah supaya request tidak menunggu I/O exporter.
+    """
+
+    def __init__(self, settings: Settings, exporter: Optional[SpanExporter] = None):
+        self.settings = settings
+        self.exporter = exporter if exporter is not None else self._build_exporter()
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=settings.TRACE_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+
+    def _build_exporter(self) -> Optional[SpanExporter]:
+        if self.settings.TRACE_EXPORTER == "file":
+            return FileSpanExporter(self.settings.TRACE_FILE)
+        if self.settings.TRACE_EXPORTER == "otlp":
+            return OtlpSpanExporter(self.settings.TRACE_OTLP_ENDPOINT, self.settings.APP_NAME)
+        return None
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    # --- Trace / span API ---
+
+    @contextmanager
+    def start_trace(self, name: str, correlation_id: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Root span request/job. Correlation id selalu di-set walau trace tidak di-sample."""
+        correlation_id = correlation_id or uuid.uuid4().hex
+        sampled = self.enabled and random.random() < self.settings.TRACE_SAMPLE_RATE
+        trace = _Trace(trace_id=_new_id(16), sampled=sampled)
+        tokens = (_trace.set(trace), _correlation_id.set(correlation_id))
+        try:
+            if not sampled:
+                yield None
+                return
+            with self.span(name, correlation_id=correlation_id, **attributes) as root:
+                yield root
+        finally:
+            _trace.reset(tokens[0])
+            _correlation_id.reset(tokens[1])
+            if trace.sampled and trace.spans:
+                self._submit(trace.spans)
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """Span tanpa menjadikannya parent (untuk event hook, mis. query SQLAlchemy)"""
+        trace = _trace.get()
+        if trace is None or not trace.sampled:
+            return None
+        parent = _current_span.get()
+        return Span(
+            trace_id=trace.trace_id,
+            span_id=_new_id(8),
+            name=name,
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        trace = _trace.get()
+        if trace is not None and trace.trace_id == span.trace_id:
+            trace.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        error: Optional[BaseException] = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, error)
+
+    # --- Export ---
+
+    def _submit(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            # Gabungkan trace yang sudah mengantri jadi satu export
+            stop = False
+            while len(batch) < self.settings.TRACE_BATCH_SIZE:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                batch.extend(more)
+            self._export(batch)
+            if stop:
+                break
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(spans)  # type: ignore[union-attr]
+        except Exception as e:
+            self.dropped += 1
+            # Import di sini supaya core.logging tidak jadi dependency saat import modul ini
+            from core.logging import logger
+            logger.warning("Trace export failed ({} spans): {}", len(spans), e)
+
+
+def instrument_engine(engine, tracer: "Tracer") -> None:
+    """Span 'db.query' untuk setiap statement yang dieksekusi engine (sync)"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span("db.query", statement=statement[:200])
+        if context is not None:
+            context._trace_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        tracer.end_span(getattr(context, "_trace_span", None))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        if context is not None:
+            tracer.end_span(getattr(context, "_trace_span", None), exception_context.original_exception)
+
+
+# Global tracer
+tracer = Tracer(app_settings)
@@ -35,6 +35,9 @@ class Challenge(Base):
     
     # Status
     is_active: Mapped[bool] = mapped_column(default=True, index=True)
+    # "team:level_id" selama challenge aktif, NULL kalau tidak aktif.
+    # Unique index menjamin hanya ada satu challenge aktif per (team, level)
+    active_slot: Mapped[Optional[str]] = mapped_column(String(120), unique=True, nullable=True)
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
@@ -48,5 +51,15 @@ class Challenge(Base):
     deployment: Mapped[Optional["Deployment"]] = relationship(back_populates="challenge", uselist=False, cascade="all, delete-orphan")
     
     
+    @staticmethod
+    def slot_for(team: str, level_id: int) -> str:
+        """Key unik untuk challenge aktif milik team di level tertentu"""
+        return f"{team}:{level_id}"
+    
+    def deactivate(self) -> None:
+        """Tandai challenge tidak aktif dan lepaskan slot (team, level)"""
+        self.is_active = False
+        self.active_slot = None
+    
     def __repr__(self) -> str:
         return f"<Challenge(id={self.id}, level_id={self.level_id}, team='{self.team}', flag_submitted={self.flag_submitted})>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from enum import Enum
 from datetime import datetime
 from sqlalchemy import String, Text, ForeignKey
@@ -7,6 +7,7 @@ from core.database import Base
 
 if TYPE_CHECKING:
     from models.Challenge import Challenge
+    from models.DeploymentPhase import DeploymentPhase
 
 
 class DeploymentStatus(str, Enum):
@@ -15,6 +16,7 @@ class DeploymentStatus(str, Enum):
     CREATING = "creating"  # Sedang membuat VM
     RUNNING = "running"  # VM aktif dan berjalan
     STOPPED = "stopped"  # VM di-stop
+    SUSPENDED = "suspended"  # VM idle, di-hibernate ke disk (resume saat dipakai lagi)
     ERROR = "error"  # Error saat deploy/run
     TERMINATING = "terminating"  # Sedang dihapus
     TERMINATED = "terminated"  # Sudah dihapus
@@ -36,6 +38,8 @@ class Deployment(Base):
     vm_id: Mapped[Optional[int]] = mapped_column(unique=True, index=True)  # Proxmox VMID
     vm_name: Mapped[Optional[str]] = mapped_column(String(100), unique=True, nullable=True)  # Unique VM name
     vm_ip: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)  # IPv4 atau IPv6
+    vm_type: Mapped[str] = mapped_column(String(10), default="qemu", server_default="qemu")  # 'qemu' atau 'lxc'
+    node: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Node Proxmox tempat VM berada (NULL = PROXMOX_NODE)
         
     # Status & Lifecycle
     status: Mapped[DeploymentStatus] = mapped_column(default=DeploymentStatus.PENDING, index=True)
@@ -46,17 +50,28 @@ class Deployment(Base):
     started_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)  # Kapan VM mulai running
     stopped_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)  # Kapan VM di-stop
     terminated_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)  # Kapan VM dihapus
+    expires_at: Mapped[Optional[datetime]] = mapped_column(nullable=True, index=True)  # Deadline, setelah ini VM di-expire
     
     # Relationship: One-to-One dengan Challenge
     challenge: Mapped["Challenge"] = relationship(back_populates="deployment")
     
+    # Timeline fase provisioning (clone, boot, ansible, ...)
+    phases: Mapped[List["DeploymentPhase"]] = relationship(
+        back_populates="deployment", cascade="all, delete-orphan", passive_deletes=True
+    )
+    
     
     def __repr__(self):
         return f"<Deployment(id={self.id}, challenge_id={self.challenge_id}, status={self.status}, vm_id={self.vm_id})>"
     
     def is_active(self):
         """Check if deployment is currently active"""
-        return self.status in [DeploymentStatus.RUNNING, DeploymentStatus.CREATING, DeploymentStatus.PENDING]
+        return self.status in [
+            DeploymentStatus.RUNNING,
+            DeploymentStatus.CREATING,
+            DeploymentStatus.PENDING,
+            DeploymentStatus.SUSPENDED,
+        ]
     
     def to_dict(self):
         """Convert to dictionary"""
@@ -66,8 +81,11 @@ class Deployment(Base):
             "vm_id": self.vm_id,
             "vm_name": self.vm_name,
             "vm_ip": self.vm_ip,
+            "vm_type": self.vm_type,
+            "node": self.node,
             "status": self.status.value,
             "error_message": self.error_message,
             "is_active": self.is_active(),
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
         }        
         return data
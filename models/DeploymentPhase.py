@@ -0,0 +1,35 @@
+from typing import Optional, TYPE_CHECKING
+from datetime import datetime
+from sqlalchemy import String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from core.database import Base
+
+if TYPE_CHECKING:
+    from models.Deployment import Deployment
+
+
+class DeploymentPhase(Base):
+    """
+    Timeline provisioning per deployment, satu row per fase
+    (clone, configure, boot, ansible, db, total)
+    """
+    __tablename__ = "deployment_phases"
+    __table_args__ = (
+        # Query percentile: filter window waktu lalu group per fase
+        Index("ix_deployment_phases_started_at_phase", "started_at", "phase"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    deployment_id: Mapped[int] = mapped_column(ForeignKey("deployments.id", ondelete="CASCADE"), index=True)
+    phase: Mapped[str] = mapped_column(String(20))
+    started_at: Mapped[datetime] = mapped_column()
+    duration_ms: Mapped[int] = mapped_column()
+    
+    # Denormalisasi supaya laporan latency tidak perlu join ke challenges
+    level_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    node: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+
+    deployment: Mapped["Deployment"] = relationship(back_populates="phases")
+
+    def __repr__(self):
+        return f"<DeploymentPhase(deployment_id={self.deployment_id}, phase={self.phase}, duration_ms={self.duration_ms})>"
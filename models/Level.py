@@ -1,7 +1,7 @@
 from typing import Optional, List, TYPE_CHECKING
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import String, Text
+from sqlalchemy import String, Text, true as sa_true
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from core.database import Base
 
@@ -43,9 +43,19 @@ class Level(Base):
     difficulty: Mapped[DifficultyEnum] = mapped_column(index=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     points: Mapped[int] = mapped_column(default=100)
+    duration: Mapped[Optional[int]] = mapped_column(nullable=True)  # Detik; NULL = DEFAULT_CHALLENGE_DURATION
     
     # Template VM/Container Config
     template_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # template url (dummy)
+    backend: Mapped[str] = mapped_column(String(10), default="qemu", server_default="qemu")  # 'qemu' (VM) atau 'lxc' (container)
+    
+    # Resource profile, NULL = pakai default dari settings
+    template_vmid: Mapped[Optional[int]] = mapped_column(nullable=True)  # VMID template di Proxmox
+    memory: Mapped[Optional[int]] = mapped_column(nullable=True)  # MB
+    cores: Mapped[Optional[int]] = mapped_column(nullable=True)
+    full_clone: Mapped[bool] = mapped_column(default=True, server_default=sa_true())  # False = linked clone
+    storage: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    node: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Node affinity
     
     # Status
     is_active: Mapped[bool] = mapped_column(default=True, index=True)
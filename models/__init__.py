@@ -1,6 +1,7 @@
 from .Level import Level, CategoryEnum, DifficultyEnum
 from .Challenge import Challenge
 from .Deployment import Deployment, DeploymentStatus
+from .DeploymentPhase import DeploymentPhase
 
 __all__ = [
     "Level",
@@ -9,4 +10,5 @@ __all__ = [
     "Challenge",
     "Deployment",
     "DeploymentStatus",
+    "DeploymentPhase",
 ]
@@ -1 +1,2 @@
-from challenges_requests import CreateChallengeRequest, SubmitFlagRequest
+from .challenges_requests import CreateChallengeRequest, SubmitFlagRequest, ExtendChallengeRequest
+from .levels_requests import UpdateLevelProfileRequest
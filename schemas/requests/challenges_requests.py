@@ -5,7 +5,7 @@ class CreateChallengeRequest(BaseModel):
     """Request body untuk membuat challenge baru"""
     level_id: int = Field(..., gt=0, description="ID level yang akan di-deploy")
     team_name: str = Field(..., min_length=1, max_length=100, description="Nama tim")
-    vm_config: Optional[Dict[str, Any]] = Field(default=None, description="Konfigurasi VM custom (optional)")
+    vm_config: Optional[Dict[str, Any]] = Field(default=None, description="Override memory/cores (optional), dibatasi MAX_VM_MEMORY/MAX_VM_CORES")
     
     model_config = ConfigDict(json_schema_extra={
         "example": {
@@ -13,12 +13,21 @@ class CreateChallengeRequest(BaseModel):
             "team_name": "TeamAlpha",
             "vm_config": {
                 "memory": 2048,
-                "cores": 2,
-                "template_vmid": 9000
+                "cores": 2
             }
         }
     })
 
+class ExtendChallengeRequest(BaseModel):
+    """Request body untuk memperpanjang time limit challenge"""
+    seconds: int = Field(..., gt=0, description="Tambahan waktu dalam detik (dibatasi CHALLENGE_EXTEND_MAX)")
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "seconds": 1800
+        }
+    })
+
 class SubmitFlagRequest(BaseModel):
     """Request body untuk submit flag"""
     flag: str = Field(..., min_length=1, description="Flag yang akan di-submit")
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Literal, Optional
+
+class UpdateLevelProfileRequest(BaseModel):
+    """Request body untuk update profil provisioning level (semua field optional)"""
+    backend: Optional[Literal["qemu", "lxc"]] = None
+    duration: Optional[int] = Field(default=None, gt=0, description="Time limit dalam detik")
+    template_vmid: Optional[int] = Field(default=None, gt=0)
+    memory: Optional[int] = Field(default=None, ge=64, description="MB")
+    cores: Optional[int] = Field(default=None, ge=1)
+    full_clone: Optional[bool] = None
+    storage: Optional[str] = Field(default=None, max_length=100)
+    node: Optional[str] = Field(default=None, max_length=100)
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "backend": "lxc",
+            "template_vmid": 8000,
+            "memory": 256,
+            "cores": 1,
+            "full_clone": False
+        }
+    })
@@ -1,2 +1,5 @@
-from challenges_responses import ChallengeResponse, CreateChallengeResponse, ChallengeListResponse, SubmitFlagResponse
-from vms_responses import VMListResponse, VMInfoResponse
\ No newline at end of file
+from .challenges_responses import ChallengeResponse, CreateChallengeResponse, ChallengeListResponse, SubmitFlagResponse, ChallengeStatusResponse, ExtendChallengeResponse
+from .vms_responses import VMListResponse, VMInfoResponse, ReconcileStatusResponse
+from .scoreboard_responses import ScoreboardResponse
+from .admin_responses import LatencyReportResponse
+from .health_responses import HealthResponse, ReadinessResponse
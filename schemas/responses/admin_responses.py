@@ -0,0 +1,23 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List
+from schemas.types.timeline_types import PhaseLatency
+
+class LatencyReportResponse(BaseModel):
+    """Response untuk percentile latency provisioning per fase"""
+    window_seconds: int
+    since: datetime
+    phases: List[PhaseLatency]
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "window_seconds": 3600,
+            "since": "2025-12-16T09:00:00",
+            "phases": [
+                {"phase": "clone", "level_id": 1, "node": "pve", "count": 12,
+                 "p50_ms": 8200, "p90_ms": 14100, "p99_ms": 21500, "max_ms": 21500},
+                {"phase": "total", "level_id": 1, "node": "pve", "count": 12,
+                 "p50_ms": 52000, "p90_ms": 71000, "p99_ms": 90300, "max_ms": 90300}
+            ]
+        }
+    })
@@ -30,6 +30,8 @@ class CreateChallengeResponse(BaseModel):
     challenge_id: int
     vm_info: Optional[VMResult] = None
     flag: Optional[str] = None
+    existing: bool = False
+    expires_at: Optional[datetime] = None
     
     model_config = ConfigDict(json_schema_extra={
         "example": {
@@ -37,6 +39,7 @@ class CreateChallengeResponse(BaseModel):
             "message": "Challenge created successfully",
             "challenge_id": 42,
             "flag": "CTF{generated_flag}",
+            "existing": False,
             "vm_info": {
                 "status": "success",
                 "vmid": 1001,
@@ -46,10 +49,25 @@ class CreateChallengeResponse(BaseModel):
     })
 
 class ChallengeListResponse(BaseModel):
-    """Response untuk list challenges"""
-    total: int
+    """Response untuk list challenges (keyset pagination)"""
+    total: Optional[int] = None
+    next_cursor: Optional[int] = None
     challenges: List[ChallengeResponse]
     
+class ChallengeStatusResponse(BaseModel):
+    """Response untuk operasi lifecycle challenge (terminate/resume)"""
+    success: bool
+    message: str
+    challenge_id: int
+    status: Optional[str] = None  # Status deployment setelah operasi
+    
+class ExtendChallengeResponse(BaseModel):
+    """Response untuk perpanjangan time limit challenge"""
+    success: bool
+    message: str
+    challenge_id: int
+    expires_at: datetime
+    
 class SubmitFlagResponse(BaseModel):
     """Response untuk flag submission"""
     success: bool
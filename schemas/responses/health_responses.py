@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Literal
+from schemas.types.health_types import ComponentHealth
+
+class HealthResponse(BaseModel):
+    """Response health detail, dibaca dari cache health prober"""
+    status: Literal["starting", "healthy", "degraded", "unhealthy"]
+    database: str
+    proxmox: str
+    version: str
+    components: Dict[str, ComponentHealth]
+
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "status": "healthy",
+            "database": "connected",
+            "proxmox": "connected",
+            "version": "1.0.0",
+            "components": {
+                "proxmox": {"status": "up", "checked_at": "2025-12-16T10:00:00", "latency_ms": 12.5, "error": None, "stale": False},
+                "database": {"status": "up", "checked_at": "2025-12-16T10:00:00", "latency_ms": 0.8, "error": None, "stale": False},
+                "ansible": {"status": "up", "checked_at": "2025-12-16T10:00:00", "latency_ms": 0.1, "error": None, "stale": False}
+            }
+        }
+    })
+
+class ReadinessResponse(BaseModel):
+    """Response readiness probe"""
+    ready: bool
+    components: Dict[str, ComponentHealth]
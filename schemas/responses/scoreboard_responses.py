@@ -0,0 +1,22 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List
+from schemas.types.scoreboard_types import ScoreboardEntry, FirstBlood
+
+class ScoreboardResponse(BaseModel):
+    """Response untuk scoreboard"""
+    total: int
+    standings: List[ScoreboardEntry]
+    first_bloods: List[FirstBlood]
+    
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "total": 2,
+            "standings": [
+                {"rank": 1, "team": "TeamAlpha", "score": 300, "solves": 2, "last_solve_at": "2025-12-16T10:30:00"},
+                {"rank": 2, "team": "TeamBeta", "score": 100, "solves": 1, "last_solve_at": "2025-12-16T10:05:00"}
+            ],
+            "first_bloods": [
+                {"level_id": 1, "team": "TeamBeta", "solved_at": "2025-12-16T10:05:00"}
+            ]
+        }
+    })
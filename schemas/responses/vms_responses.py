@@ -1,5 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import List, Dict, Any, Optional
+from schemas.types.reclaim_types import ReclaimReport, ReclaimTotals, ReclaimQueueStats, StopQueueStats
 
 class VMInfoResponse(BaseModel):
     """Response model untuk VM info"""
@@ -28,3 +29,11 @@ class VMListResponse(BaseModel):
             ]
         }
     })
+
+class ReconcileStatusResponse(BaseModel):
+    """Response untuk status reconciler orphan VM"""
+    running: bool
+    last_report: Optional[ReclaimReport] = None
+    totals: ReclaimTotals
+    queue: Optional[ReclaimQueueStats] = None
+    stop_queue: Optional[StopQueueStats] = None
@@ -1,3 +1,10 @@
 from .vm_types import VMResult, VMInfo
 from .challenge_types import ChallengeResult
-from .ansible_types import AnsiblePlaybookParams, AnsiblePlaybookReturn
\ No newline at end of file
+from .ansible_types import AnsiblePlaybookParams, AnsiblePlaybookReturn
+from .scoreboard_types import ScoreboardEntry, FirstBlood, ScoreUpdate
+
+from .event_types import DeploymentEvent
+from .reclaim_types import ReclaimReport, ReclaimTotals, ReclaimQueueStats, StopQueueStats
+from .level_types import LevelProfile
+from .timeline_types import PhaseLatency
+from .health_types import ComponentHealth
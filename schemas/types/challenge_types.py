@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 from .vm_types import VMResult
 
 class ChallengeResult(BaseModel):
@@ -9,3 +10,5 @@ class ChallengeResult(BaseModel):
     challenge_id: int
     vm_info: Optional[VMResult] = None # Bisa None jika challenge gagal dibuat (meski biasanya raise Error)
     flag: Optional[str] = None
+    existing: bool = False # True jika tidak ada provisioning baru (retry / challenge sudah ada)
+    expires_at: Optional[datetime] = None # Kapan VM di-expire (UTC)
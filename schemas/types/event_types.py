@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class DeploymentEvent(BaseModel):
+    """Perubahan status sebuah Deployment"""
+    deployment_id: int
+    challenge_id: int
+    vm_id: Optional[int] = None
+    status: str
+    previous_status: Optional[str] = None
+    at: datetime
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Literal, Optional
+
+class ComponentHealth(BaseModel):
+    """Hasil probe terakhir satu dependency (proxmox, database, ansible)"""
+    status: Literal["up", "down", "unknown"] = "unknown"
+    checked_at: Optional[datetime] = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    stale: bool = Field(default=False, description="Probe terakhir lebih lama dari HEALTH_STALE_AFTER")
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.Level import Level
+
+class LevelProfile(BaseModel):
+    """Profil provisioning per level (backend, durasi dan resource VM)"""
+    level_id: int
+    backend: str = "qemu"
+    duration: Optional[int] = None
+    template_vmid: Optional[int] = None
+    memory: Optional[int] = None
+    cores: Optional[int] = None
+    full_clone: bool = True
+    storage: Optional[str] = None
+    node: Optional[str] = None
+    
+    @classmethod
+    def from_level(cls, level: "Level") -> "LevelProfile":
+        return cls(
+            level_id=level.id,
+            backend=level.backend or "qemu",
+            duration=level.duration,
+            template_vmid=level.template_vmid,
+            memory=level.memory,
+            cores=level.cores,
+            full_clone=level.full_clone if level.full_clone is not None else True,
+            storage=level.storage,
+            node=level.node,
+        )
+    
+    def to_vm_config(self) -> Dict[str, Any]:
+        """Config untuk ProxmoxService.create_vm, field kosong tidak dikirim supaya fallback ke settings"""
+        config: Dict[str, Any] = {"full": int(self.full_clone)}
+        for key, value in (
+            ("template_vmid", self.template_vmid),
+            ("memory", self.memory),
+            ("cores", self.cores),
+            ("storage", self.storage),
+            ("target_node", self.node),
+        ):
+            if value is not None:
+                config[key] = value
+        return config
@@ -0,0 +1,43 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class ReclaimReport(BaseModel):
+    """Hasil satu pass reconciler (Proxmox vs tabel deployments)"""
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    dry_run: bool = False
+    scanned: int = Field(0, description="Jumlah VM di range VMID platform")
+    orphans: List[int] = Field(default_factory=list, description="VMID tanpa Deployment (lewat grace period)")
+    pending_grace: List[int] = Field(default_factory=list, description="VMID tanpa Deployment yang masih dalam grace period")
+    destroyed: List[int] = Field(default_factory=list)
+    failed: List[int] = Field(default_factory=list)
+    released_deployments: int = Field(0, description="Deployment yang VM-nya sudah tidak ada, VMID/IP dilepas")
+    released_ips: int = 0
+    reclaimed_bytes: int = Field(0, description="Total maxdisk VM yang dihapus")
+
+class ReclaimTotals(BaseModel):
+    """Akumulasi sejak aplikasi start"""
+    passes: int = 0
+    destroyed: int = 0
+    released_deployments: int = 0
+    released_ips: int = 0
+    reclaimed_bytes: int = 0
+
+class ReclaimQueueStats(BaseModel):
+    """Status queue destroy VM (ReclamationQueue)"""
+    pending: int = Field(0, description="VM yang sedang antre/diproses")
+    queued: int = 0
+    destroyed: int = 0
+    retried: int = 0
+    failed: int = Field(0, description="Menyerah setelah RECLAIM_MAX_ATTEMPTS, Deployment ditandai ERROR")
+
+class StopQueueStats(BaseModel):
+    """Status queue stop VM setelah flag benar (StopQueue)"""
+    pending: int = Field(0, description="VM yang sedang antre/diproses")
+    queued: int = 0
+    deduplicated: int = Field(0, description="Enqueue untuk VM yang sudah ada di queue")
+    stopped: int = 0
+    batches: int = 0
+    retried: int = 0
+    failed: int = Field(0, description="Menyerah setelah STOP_MAX_ATTEMPTS, Deployment tetap RUNNING")
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class ScoreboardEntry(BaseModel):
+    """Posisi satu team di scoreboard"""
+    rank: int
+    team: str
+    score: int
+    solves: int
+    last_solve_at: Optional[datetime] = None
+
+class FirstBlood(BaseModel):
+    """Team pertama yang menyelesaikan sebuah level"""
+    level_id: int
+    team: str
+    solved_at: datetime
+
+class ScoreUpdate(BaseModel):
+    """Perubahan scoreboard akibat satu solve"""
+    team: str
+    level_id: int
+    points: int
+    score: int
+    rank: int
+    previous_rank: Optional[int] = None
+    first_blood: bool = False
+    solved_at: datetime
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class PhaseLatency(BaseModel):
+    """Percentile durasi satu fase provisioning untuk kombinasi (level, node)"""
+    phase: str
+    level_id: Optional[int] = None
+    node: Optional[str] = None
+    count: int
+    p50_ms: int
+    p90_ms: int
+    p99_ms: int
+    max_ms: int = Field(description="Durasi terlama dalam window")
@@ -18,4 +18,7 @@ class VMResult(BaseModel):
     """Hasil operasi pembuatan/manipulasi VM"""
     status: str
     vmid: int # Wajib ada jika sukses
-    info: VMInfo # Wajib ada structur infonya
\ No newline at end of file
+    info: VMInfo # Wajib ada structur infonya
+    vm_type: str = "qemu" # 'qemu' (VM) atau 'lxc' (container)
+    node: Optional[str] = None # Node tempat VM berjalan
+    phases: Dict[str, float] = Field(default_factory=dict) # Durasi fase create (detik): clone, configure, boot
\ No newline at end of file
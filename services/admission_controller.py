@@ -0,0 +1,291 @@
+"""
+Admission Controller
+Membatasi provisioning yang berjalan bersamaan (global dan per node Proxmox).
+Kelebihan request diantrikan dengan kedalaman terbatas; jika antrian penuh atau
+menunggu terlalu lama, request ditolak dengan estimasi waktu tunggu (Retry-After).
+
+Clone paralel tanpa batas membuat storage Proxmox jenuh sehingga SEMUA deployment
+melambat; dengan batas, throughput bertahan di titik optimal dan sisanya menunggu.
+
+Antrian dijadwalkan adil antar team (deficit round-robin), dengan lane prioritas:
+- retry  : slot (team, level) yang provisioning-nya baru saja gagal
+- reset  : team men-deploy ulang level yang pernah dia deploy
+- normal : deploy pertama
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+
+from config.settings import Settings
+from core.exceptions import DeploymentQueueFullError, DeploymentQueueTimeoutError
+
+# Urutan prioritas lane
+LANES = ("retry", "reset", "normal")
+
+
+@dataclass
+class AdmissionTicket:
+    node: str
+    team: str = ""
+    slot: Optional[str] = None
+    lane: str = "normal"
+    cost: float = 1.0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    admitted_at: Optional[float] = None
+    admitted: threading.Event = field(default_factory=threading.Event)
+
+
+class AdmissionController:
+    """
+    Semaphore global + per node dengan antrian fair-share per team.
+
+    Tiap lane berisi antrian FIFO per team yang dilayani deficit round-robin:
+    setiap giliran team mendapat kuantum 1, dan satu deploy memakan `cost` (default 1).
+    Team yang mengirim deploy untuk semua level sekaligus tetap hanya mendapat satu
+    slot per putaran, sehingga deploy pertama team lain menunggu paling lama
+    ~(jumlah team antri / kapasitas) gelombang provisioning.
+
+    Lane prioritas dilayani lebih dulu, tapi setelah DEPLOYMENT_PRIORITY_BURST admit
+    prioritas berturut-turut, lane normal mendapat satu giliran supaya tidak kelaparan.
+
+    Waiter dibangunkan satu per satu (Event masing-masing, bukan notify_all), dan
+    waiter yang node-nya penuh tidak menghalangi waiter berikutnya untuk node lain.
+    Estimasi waktu tunggu memakai rata-rata bergerak (EWMA) durasi provisioning.
+
+    State-nya ada di memory proses, jadi batas ini berlaku untuk seluruh platform hanya
+    karena platform berjalan sebagai satu proses (check_single_process + InstanceLock
+    saat startup). Dengan N worker, Proxmox akan menerima N x batas yang dikonfigurasi.
+    """
+
+    # Bobot sample baru di EWMA durasi
+    EWMA_ALPHA = 0.2
+    QUANTUM = 1.0
+    # Batas jumlah slot gagal yang diingat untuk lane retry
+    MAX_FAILED_SLOTS = 10000
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.max_active = max(1, settings.MAX_CONCURRENT_DEPLOYMENTS)
+        self.max_per_node = settings.MAX_CONCURRENT_DEPLOYMENTS_PER_NODE
+        self.queue_size = settings.DEPLOYMENT_QUEUE_SIZE
+        self.queue_per_team = settings.DEPLOYMENT_QUEUE_PER_TEAM
+        self.queue_timeout = settings.DEPLOYMENT_QUEUE_TIMEOUT
+        self.priority_burst = max(1, settings.DEPLOYMENT_PRIORITY_BURST)
+        self.retry_window = settings.DEPLOYMENT_RETRY_WINDOW
+        self._avg_duration = float(settings.DEPLOYMENT_ESTIMATE_SECONDS)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._active_per_node: Dict[str, int] = defaultdict(int)
+        # lane -> team -> antrian; urutan OrderedDict = urutan round-robin
+        self._queues: Dict[str, "OrderedDict[str, Deque[AdmissionTicket]]"] = {lane: OrderedDict() for lane in LANES}
+        self._deficit: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._queued = 0
+        self._queued_per_team: Dict[str, int] = defaultdict(int)
+        self._priority_streak = 0
+        self._failed_slots: "OrderedDict[str, float]" = OrderedDict()
+        self.rejected = 0
+        self.timed_out = 0
+
+    def acquire(
+        self,
+        node: str,
+        team: str = "",
+        slot: Optional[str] = None,
+        redeploy: bool = False,
+        cost: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> AdmissionTicket:
+        """
+        Tunggu slot provisioning untuk node.
+
+        Args:
+            team: Unit fair-share antrian
+            slot: Slot (team, level); slot yang baru gagal masuk lane retry
+            redeploy: Team pernah men-deploy level ini (lane reset)
+
+        Raises:
+            DeploymentQueueFullError: Antrian (global atau jatah team) sudah penuh (429)
+            DeploymentQueueTimeoutError: Tidak mendapat slot dalam timeout (503)
+        """
+        now = time.monotonic()
+        with self._lock:
+            lane = self._lane_for(slot, redeploy, now)
+            ticket = AdmissionTicket(node=node, team=team, slot=slot, lane=lane, cost=cost, enqueued_at=now)
+            # Waiter yang tersisa hanya tertahan batas node-nya sendiri (dispatch selalu mengisi
+            # kapasitas global), jadi cukup pastikan tidak ada yang antri untuk node yang sama
+            if self._has_capacity(node) and not self._node_waiting(node):
+                self._admit(ticket)
+                return ticket
+            team_full = self.queue_per_team > 0 and self._queued_per_team[team] >= self.queue_per_team
+            if self._queued >= self.queue_size or team_full:
+                self.rejected += 1
+                retry_after = self._estimate_locked(self._position_for(team))
+                scope = f"team '{team}'" if team_full else "global"
+                raise DeploymentQueueFullError(
+                    f"Deployment queue is full ({scope}, {self._queued} waiting), estimated wait {retry_after}s",
+                    retry_after=retry_after,
+                )
+            self._queues[lane].setdefault(team, deque()).append(ticket)
+            self._queued += 1
+            self._queued_per_team[team] += 1
+
+        timeout = self.queue_timeout if timeout is None else timeout
+        if ticket.admitted.wait(timeout):
+            return ticket
+
+        with self._lock:
+            # Bisa saja di-admit tepat setelah wait() timeout
+            if ticket.admitted.is_set():
+                return ticket
+            self._remove_locked(ticket)
+            self.timed_out += 1
+            retry_after = self._estimate_locked(self._position_for(team))
+            # Waiter di belakang mungkin bisa jalan (node berbeda)
+            self._dispatch_locked()
+        raise DeploymentQueueTimeoutError(
+            f"No deployment slot for node '{node}' after {timeout:g}s, estimated wait {retry_after}s",
+            retry_after=retry_after,
+        )
+
+    def release(self, ticket: AdmissionTicket, failed: bool = False) -> None:
+        """Kembalikan slot; provisioning gagal membuat retry slot yang sama masuk lane retry"""
+        with self._lock:
+            self._active -= 1
+            self._active_per_node[ticket.node] -= 1
+            if not self._active_per_node[ticket.node]:
+                del self._active_per_node[ticket.node]
+            if ticket.slot is not None:
+                if failed:
+                    self._failed_slots[ticket.slot] = time.monotonic()
+                    self._failed_slots.move_to_end(ticket.slot)
+                    while len(self._failed_slots) > self.MAX_FAILED_SLOTS:
+                        self._failed_slots.popitem(last=False)
+                else:
+                    self._failed_slots.pop(ticket.slot, None)
+            if ticket.admitted_at is not None and not failed:
+                duration = time.monotonic() - ticket.admitted_at
+                self._avg_duration += self.EWMA_ALPHA * (duration - self._avg_duration)
+            self._dispatch_locked()
+
+    def estimated_wait(self, team: Optional[str] = None) -> int:
+        """Estimasi detik sampai request baru (dari team tertentu) mendapat slot"""
+        with self._lock:
+            if not self._queued and self._active < self.max_active:
+                return 0
+            position = self._position_for(team) if team is not None else self._queued
+            return self._estimate_locked(position)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats: Dict[str, float] = {
+                "active": self._active,
+                "queued": self._queued,
+                "queued_teams": len(self._queued_per_team),
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_duration_s": round(self._avg_duration, 2),
+            }
+            for lane in LANES:
+                stats[f"queued_{lane}"] = sum(len(q) for q in self._queues[lane].values())
+            return stats
+
+    def queued_count(self) -> int:
+        with self._lock:
+            return self._queued
+
+    # --- Internal (dipanggil dengan _lock) ---
+
+    def _lane_for(self, slot: Optional[str], redeploy: bool, now: float) -> str:
+        failed_at = self._failed_slots.get(slot) if slot is not None else None
+        if failed_at is not None and now - failed_at <= self.retry_window:
+            return "retry"
+        return "reset" if redeploy else "normal"
+
+    def _has_capacity(self, node: str) -> bool:
+        if self._active >= self.max_active:
+            return False
+        return self.max_per_node <= 0 or self._active_per_node[node] < self.max_per_node
+
+    def _node_waiting(self, node: str) -> bool:
+        return any(
+            ticket.node == node
+            for teams in self._queues.values()
+            for queue in teams.values()
+            for ticket in queue
+        )
+
+    def _position_for(self, team: Optional[str]) -> int:
+        """Perkiraan jumlah admit sebelum request baru dari team ini (round-robin per team)"""
+        teams = len(self._queued_per_team)
+        own = self._queued_per_team.get(team, 0) if team is not None else 0
+        return min(self._queued, own * max(1, teams) + teams)
+
+    def _admit(self, ticket: AdmissionTicket) -> None:
+        self._active += 1
+        self._active_per_node[ticket.node] += 1
+        ticket.admitted_at = time.monotonic()
+        ticket.admitted.set()
+
+    def _remove_locked(self, ticket: AdmissionTicket) -> None:
+        teams = self._queues[ticket.lane]
+        queue = teams.get(ticket.team)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del teams[ticket.team]
+            self._deficit.pop((ticket.lane, ticket.team), None)
+        self._queued -= 1
+        self._queued_per_team[ticket.team] -= 1
+        if not self._queued_per_team[ticket.team]:
+            del self._queued_per_team[ticket.team]
+
+    def _dispatch_locked(self) -> None:
+        while self._active < self.max_active:
+            ticket = self._next_locked()
+            if ticket is None:
+                break
+            self._remove_locked(ticket)
+            self._admit(ticket)
+
+    def _next_locked(self) -> Optional[AdmissionTicket]:
+        lanes = LANES
+        if self._priority_streak >= self.priority_burst:
+            # Giliran lane normal setelah burst prioritas
+            lanes = ("normal",) + tuple(lane for lane in LANES if lane != "normal")
+        for lane in lanes:
+            ticket = self._next_in_lane(lane)
+            if ticket is not None:
+                self._priority_streak = 0 if lane == "normal" else self._priority_streak + 1
+                return ticket
+        return None
+
+    def _next_in_lane(self, lane: str) -> Optional[AdmissionTicket]:
+        teams = self._queues[lane]
+        while teams:
+            eligible = False
+            for _ in range(len(teams)):
+                team, queue = next(iter(teams.items()))
+                teams.move_to_end(team)
+                ticket = next((t for t in queue if self._has_capacity(t.node)), None)
+                if ticket is None:
+                    # Node penuh: tidak dapat kuantum supaya deficit tidak menumpuk
+                    continue
+                eligible = True
+                key = (lane, team)
+                self._deficit[key] += self.QUANTUM
+                if ticket.cost <= self._deficit[key]:
+                    self._deficit[key] -= ticket.cost
+                    return ticket
+            if not eligible:
+                return None
+        return None
+
+    def _estimate_locked(self, position: int) -> int:
+        # Posisi ke-p selesai menunggu setelah (p // kapasitas + 1) "gelombang" provisioning
+        rounds = position // self.max_active + 1
+        return max(1, math.ceil(rounds * self._avg_duration))
@@ -1,9 +1,15 @@
+import time
 from pathlib import Path
-import ansible_runner
 from typing import Dict, Any
+from core.lazy import LazyModule
 from schemas.types.ansible_types import AnsiblePlaybookParams, AnsiblePlaybookReturn
 from config.settings import Settings
 from core.logging import logger
+from core.metrics import ANSIBLE_RUN_DURATION
+from core.tracing import tracer
+
+# ansible_runner (~80ms import) baru di-load saat playbook pertama dijalankan
+ansible_runner = LazyModule("ansible_runner")
 
 class AnsibleService:
     def __init__(self, settings: Settings):
@@ -13,12 +19,19 @@ class AnsibleService:
         self.playbook_dir = self.ansible_dir / "playbooks"
 
     def run_playbook(self, request: AnsiblePlaybookParams) -> AnsiblePlaybookReturn:
-        logger.info(f"Preparing to run playbook '{request.playbook_name}' on {request.host}")
+        with tracer.span("ansible.run_playbook", playbook=request.playbook_name, host=request.host) as span:
+            result = self._run_playbook(request)
+            if span is not None:
+                span.set(status=result.status, rc=result.rc)
+            return result
+
+    def _run_playbook(self, request: AnsiblePlaybookParams) -> AnsiblePlaybookReturn:
+        logger.info("Preparing to run playbook '{}' on {}", request.playbook_name, request.host)
         
         # Validasi path playbook
         playbook_path = self.playbook_dir / request.playbook_name
         if not playbook_path.exists():
-            logger.error(f"Playbook not found: {playbook_path}")
+            logger.error("Playbook not found: {}", playbook_path)
             return AnsiblePlaybookReturn(
                 success=False,
                 status="error",
@@ -46,6 +59,7 @@ class AnsibleService:
             ssh_key = request.private_key
         
         # Run Ansible Runner
+        start = time.perf_counter()
         try:
             r = ansible_runner.run(
                 private_data_dir=str(self.ansible_dir),
@@ -62,7 +76,7 @@ class AnsibleService:
             stats: Dict[str, Any] = getattr(r, 'stats', {})
             
             # DEBUG LOGGING
-            logger.debug(f"Ansible Runner Result - Status: {status}, RC: {r.rc} -> {rc_value}")
+            logger.debug("Ansible Runner Result - Status: {}, RC: {} -> {}", status, r.rc, rc_value)
             
             # Ambil stdout untuk debugging jika gagal
             stdout_obj = getattr(r, 'stdout', None)
@@ -71,9 +85,10 @@ class AnsibleService:
             success = (status == "successful" and rc_value == 0)
             
             if success:
-                logger.info(f"Ansible playbook '{request.playbook_name}' finished successfully.")
+                logger.info("Ansible playbook '{}' finished successfully.", request.playbook_name)
             else:
-                logger.error(f"Ansible playbook failed. Status: {status}, RC: {rc_value}")
+                logger.error("Ansible playbook failed. Status: {}, RC: {}", status, rc_value)
+            ANSIBLE_RUN_DURATION.observe(time.perf_counter() - start, playbook=request.playbook_name, status=str(status))
 
             return AnsiblePlaybookReturn(
                 success=success,
@@ -86,6 +101,7 @@ class AnsibleService:
 
         except Exception as e:
             logger.exception("Exception while running Ansible")
+            ANSIBLE_RUN_DURATION.observe(time.perf_counter() - start, playbook=request.playbook_name, status="exception")
             return AnsiblePlaybookReturn(
                 success=False,
                 status="exception",
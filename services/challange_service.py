@@ -1,46 +1,193 @@
-from typing import Dict, Any, List, Optional, Sequence
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from datetime import datetime, timedelta
+from functools import partial
 import random
+import time
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+import anyio
 
-from models import Challenge, Deployment, Level
+from sqlalchemy import select, func, Select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, contains_eager
+
+from models import Challenge, Deployment, DeploymentStatus, Level
 from services.proxmox_service import ProxmoxService
 from services.ansible_service import AnsibleService # NEW
+from services.scoreboard_service import Scoreboard
+from services.provisioning_registry import ProvisioningRegistry
+from services.reclamation_service import ReclamationQueue
+from services.stop_queue import StopQueue
+from services.expiry_scheduler import ExpiryScheduler
+from services.level_profile_cache import LevelProfileCache
+from services.timeline_service import PhaseTimer
+from services.admission_controller import AdmissionController
 from config.settings import Settings
 from core.logging import logger
+from core.tracing import tracer
 from core.exceptions import VMCreationError, ResourceNotFoundError
-from schemas.types.vm_types import VMResult
+from schemas.types.vm_types import VMResult, VMInfo
 from schemas.types.challenge_types import ChallengeResult
+from schemas.types.level_types import LevelProfile
 from schemas.types.ansible_types import AnsiblePlaybookParams, AnsiblePlaybookReturn # NEW
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 class ChallengeService:
     """
     Service untuk manajemen Challenge dan memanggil ProxmoxService sesuai kebutuhan.
     Business logic utama aplikasi.
     """
     
-    def __init__(self, db: Session, proxmox_service: ProxmoxService, ansible_service: AnsibleService, settings: Settings):
+    def __init__(
+        self,
+        db: Session,
+        proxmox_service: ProxmoxService,
+        ansible_service: AnsibleService,
+        settings: Settings,
+        scoreboard: Optional[Scoreboard] = None,
+        async_db: Optional["AsyncSession"] = None,
+        registry: Optional[ProvisioningRegistry] = None,
+        reclaimer: Optional[ReclamationQueue] = None,
+        stopper: Optional[StopQueue] = None,
+        expiry: Optional[ExpiryScheduler] = None,
+        profiles: Optional[LevelProfileCache] = None,
+        admission: Optional[AdmissionController] = None,
+    ):
         self.db = db
+        self.async_db = async_db
         self.proxmox_service = proxmox_service
         self.ansible_service = ansible_service # NEW
         self.settings = settings
+        self.scoreboard = scoreboard
+        self.registry = registry
+        self.reclaimer = reclaimer
+        self.stopper = stopper
+        self.expiry = expiry
+        self.profiles = profiles
+        self.admission = admission
     
-    def create_challenge(self, level_id: int, team_name: str) -> ChallengeResult:
+    def create_challenge(
+        self,
+        level_id: int,
+        team_name: str,
+        idempotency_key: Optional[str] = None,
+        vm_config: Optional[Dict[str, Any]] = None,
+    ) -> ChallengeResult:
         """
-        Create challenge implementation.
+        Create challenge, idempotent per (team, level).
+
+        Retries (same Idempotency-Key or same team/level) never start a second
+        provisioning: they wait for the in-flight one or get the existing active challenge.
+        vm_config hanya boleh override memory/cores, dibatasi MAX_VM_MEMORY/MAX_VM_CORES.
+        """
+        slot = Challenge.slot_for(team_name, level_id)
+        if self.registry is None:
+            return self._get_or_provision(level_id, team_name, vm_config)
+
+        ticket, is_owner = self.registry.begin(slot, idempotency_key)
+        if not is_owner:
+            logger.info("Provisioning for '{}' already requested, waiting for its result", slot)
+            with tracer.span("provisioning.wait", slot=slot):
+                return self.registry.wait(ticket, self.settings.PROVISION_WAIT_TIMEOUT)
+
+        try:
+            result = self._get_or_provision(level_id, team_name, vm_config)
+        except Exception as e:
+            self.registry.finish(ticket, error=e)
+            raise
+        self.registry.finish(ticket, result=result)
+        return result
+
+    def _get_or_provision(
+        self, level_id: int, team_name: str, vm_config: Optional[Dict[str, Any]] = None
+    ) -> ChallengeResult:
+        existing = self._find_active(level_id, team_name)
+        if existing is not None:
+            logger.info("Active challenge {} already exists for '{}' level {}", existing.challenge_id, team_name, level_id)
+            return existing
+        try:
+            return self._provision(level_id, team_name, vm_config)
+        except IntegrityError:
+            # Worker lain sudah commit challenge aktif untuk slot yang sama (unique active_slot)
+            existing = self._find_active(level_id, team_name)
+            if existing is None:
+                raise
+            return existing
+
+    def _find_active(self, level_id: int, team_name: str) -> Optional[ChallengeResult]:
+        stmt = (
+            select(Challenge)
+            .options(joinedload(Challenge.deployment))
+            .where(
+                Challenge.team == team_name,
+                Challenge.level_id == level_id,
+                Challenge.is_active.is_(True),
+            )
+            .order_by(Challenge.id.desc())
+        )
+        challenge = self.db.execute(stmt).scalars().first()
+        if challenge is None:
+            return None
+
+        vm_info = None
+        deployment = challenge.deployment
+        if deployment is not None:
+            # Team kembali ke challenge: bangunkan VM yang di-hibernate karena idle
+            self._resume_if_suspended(deployment)
+        if deployment is not None and deployment.vm_id is not None:
+            vm_info = VMResult(
+                status=deployment.status.value,
+                vmid=deployment.vm_id,
+                info=VMInfo(name=deployment.vm_name, status=deployment.status.value),
+            )
+        return ChallengeResult(
+            success=True,
+            message="Challenge already exists",
+            challenge_id=challenge.id,
+            vm_info=vm_info,
+            flag=challenge.flag,
+            existing=True,
+            expires_at=deployment.expires_at if deployment is not None else None,
+        )
+
+    def _provision(self, level_id: int, team_name: str, vm_config: Optional[Dict[str, Any]] = None) -> ChallengeResult:
+        """
+        Provision VM + Ansible config lalu simpan Challenge dan Deployment.
         """
         vm: Optional[VMResult] = None
         ansible_result: Optional[AnsiblePlaybookReturn] = None # NEW
+        profile = self._get_profile(level_id)
+        duration = (profile.duration if profile else None) or self.settings.DEFAULT_CHALLENGE_DURATION
+        vm_type = profile.backend if profile else "qemu"
+        config = profile.to_vm_config() if profile else {}
+        config.update(self._vm_overrides(vm_config))
+        # Durasi tiap fase disimpan ke deployment_phases untuk laporan latency
+        timer = PhaseTimer()
+        # Tunggu slot provisioning (global + per node, fair-share per team);
+        # antrian penuh -> DeploymentQueueFullError
+        admission = None
+        failed = False
+        if self.admission is not None:
+            with timer.phase("admission"):
+                admission = self.admission.acquire(
+                    config.get("target_node", self.settings.PROXMOX_NODE),
+                    team=team_name,
+                    slot=Challenge.slot_for(team_name, level_id),
+                    redeploy=self._deployed_before(level_id, team_name),
+                )
+        provision_started_at = datetime.utcnow()
+        provision_start = time.perf_counter()
         try:
-            # Create VM via ProxmoxService
+            # Create VM/container via ProxmoxService, backend sesuai Level
             vm = self.proxmox_service.create_vm(
                 level_id=level_id,
                 team=team_name,
-                time_limit=60, # TODO: Move to settings or level config
-                config={}
+                time_limit=duration,
+                config=config,
+                vm_type=vm_type
             )
+            timer.add_sequence(provision_started_at, vm.phases)
 
             # --- Ansible Configuration (NEW) ---
             # TODO: Implement a robust way to get the VM's IP address.
@@ -66,15 +213,16 @@ class ChallengeService:
                            }
             )
             
-            logger.info(f"Running Ansible playbook '{ansible_request.playbook_name}' on '{vm_ssh_target}'")
-            ansible_result = self.ansible_service.run_playbook(ansible_request)
+            logger.info("Running Ansible playbook '{}' on '{}'", ansible_request.playbook_name, vm_ssh_target)
+            with timer.phase("ansible"):
+                ansible_result = self.ansible_service.run_playbook(ansible_request)
 
             if not ansible_result.success:
-                logger.error(f"Ansible playbook failed for VM {vm.vmid}. Output: {ansible_result.stdout}")
+                logger.error("Ansible playbook failed for VM {}. Output: {}", vm.vmid, ansible_result.stdout)
                 # Raise an error, or handle gracefully (e.g., mark challenge as failed config)
                 raise VMCreationError(f"Ansible configuration failed for VM {vm.vmid}")
             
-            logger.info(f"Ansible configuration complete for VM {vm.vmid}.")
+            logger.info("Ansible configuration complete for VM {}.", vm.vmid)
             # --- End Ansible Configuration ---
 
             # 1. Create Challenge FIRST (Parent)
@@ -83,49 +231,242 @@ class ChallengeService:
                 team=team_name,
                 flag=flagstring,
                 flag_submitted=False,
-                is_active=True
+                is_active=True,
+                active_slot=Challenge.slot_for(team_name, level_id)
             )
-            self.db.add(new_challenge)
-            self.db.flush() # Get ID for new_challenge
+            with timer.phase("db"):
+                self.db.add(new_challenge)
+                self.db.flush() # Get ID for new_challenge
             
             # 2. Create Deployment (Child) linked to Challenge
+            started_at = datetime.utcnow()
             new_deployment = Deployment(
                 challenge_id=new_challenge.id,
                 vm_id=vm.vmid,
                 vm_name=vm.info.name if vm.info and vm.info.name else f"vm-{vm.vmid}",
-                # status defaults to PENDING
+                vm_type=vm.vm_type,
+                node=vm.node,
+                # VM sudah di-start dan dikonfigurasi Ansible
+                status=DeploymentStatus.RUNNING,
+                started_at=started_at,
+                expires_at=started_at + timedelta(seconds=duration),
             )
-            
+            timer.record("total", provision_started_at, time.perf_counter() - provision_start)
+            # Lewat relationship supaya ikut ter-insert di commit yang sama
+            new_deployment.phases = timer.to_rows(level_id, vm.node)
+
             self.db.add(new_deployment)
             self.db.commit()
             self.db.refresh(new_challenge) # Refresh to load relationship if needed
             
-            logger.info(f"Challenge created: {new_challenge.id}, Flag: {new_challenge.flag}")
+            if self.expiry is not None:
+                self.expiry.schedule(new_deployment.id, new_deployment.expires_at)
+            
+            logger.info("Challenge created: {}, Flag: {}", new_challenge.id, new_challenge.flag)
 
             return ChallengeResult(
                 success=True,
                 message="Challenge created successfully",
                 challenge_id=new_challenge.id,
                 vm_info=vm,
-                flag=flagstring # Hanya untuk debug/admin, jangan expose ke user biasa nanti
+                flag=flagstring, # Hanya untuk debug/admin, jangan expose ke user biasa nanti
+                expires_at=new_deployment.expires_at,
             )
             
         except Exception as e:
+            failed = True
             self.db.rollback()
-            logger.error(f"Error during challenge creation: {e}")
+            logger.error("Error during challenge creation: {}", e)
             
             # Cleanup: If VM was created but DB failed or Ansible failed, we must clean up the VM
             if vm:
-                try:
-                    logger.warning(f"Rolling back VM {vm.vmid} due to error: {e}")
-                    self.proxmox_service.stop_vm(vm.vmid)
-                    # TODO: Implement destroy_vm in ProxmoxService for full cleanup
-                except Exception as cleanup_error:
-                    logger.error(f"Failed to cleanup VM {vm.vmid}: {cleanup_error}")
+                logger.warning("Rolling back VM {} due to error: {}", vm.vmid, e)
+                self._reclaim_vm(vm.vmid, node=vm.node)
             
             # Re-raise the original error
             raise e
+        finally:
+            if admission is not None:
+                self.admission.release(admission, failed=failed)
+
+    def _deployed_before(self, level_id: int, team_name: str) -> bool:
+        """Team pernah punya challenge (sudah selesai) untuk level ini -> deploy ulang/reset"""
+        stmt = (
+            select(Challenge.id)
+            .where(Challenge.team == team_name, Challenge.level_id == level_id)
+            .limit(1)
+        )
+        return self.db.execute(stmt).first() is not None
     
+    def _resume_if_suspended(self, deployment: Deployment) -> bool:
+        """
+        Resume VM yang di-suspend oleh IdleDetector.
+
+        Returns:
+            True jika VM di-resume
+        """
+        if deployment.status != DeploymentStatus.SUSPENDED or deployment.vm_id is None:
+            return False
+        self.proxmox_service.resume_vm(deployment.vm_id, node=deployment.node)
+        deployment.status = DeploymentStatus.RUNNING
+        self.db.commit()
+        logger.info("VM {} of deployment {} resumed", deployment.vm_id, deployment.id)
+        return True
+
+    def resume_challenge(self, challenge_id: int) -> Dict[str, Any]:
+        """
+        Pastikan VM challenge aktif sedang running (resume jika di-suspend karena idle).
+
+        Raises:
+            ResourceNotFoundError: If there is no active challenge/deployment
+        """
+        stmt = (
+            select(Challenge)
+            .options(joinedload(Challenge.deployment))
+            .where(Challenge.id == challenge_id)
+        )
+        challenge = self.db.execute(stmt).scalars().first()
+        deployment = challenge.deployment if challenge else None
+        if not challenge or not challenge.is_active or deployment is None or not deployment.is_active():
+            raise ResourceNotFoundError(f"No active deployment for challenge {challenge_id}")
+
+        resumed = self._resume_if_suspended(deployment)
+        return {
+            "success": True,
+            "message": "Challenge resumed" if resumed else "Challenge already running",
+            "challenge_id": challenge.id,
+            "status": deployment.status.value,
+        }
+
+    def _get_profile(self, level_id: int) -> Optional[LevelProfile]:
+        if self.profiles is not None:
+            return self.profiles.get(self.db, level_id)
+        level = self.db.execute(select(Level).where(Level.id == level_id)).scalars().first()
+        return LevelProfile.from_level(level) if level is not None else None
+
+    def _vm_overrides(self, vm_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ambil override memory/cores dari request, key lain (template, storage, node) diatur per Level"""
+        if not vm_config:
+            return {}
+        ignored = set(vm_config) - {"memory", "cores"}
+        if ignored:
+            logger.warning("Ignoring vm_config keys {}, use the level profile instead", sorted(ignored))
+        overrides: Dict[str, Any] = {}
+        if vm_config.get("memory"):
+            overrides["memory"] = min(int(vm_config["memory"]), self.settings.MAX_VM_MEMORY)
+        if vm_config.get("cores"):
+            overrides["cores"] = min(int(vm_config["cores"]), self.settings.MAX_VM_CORES)
+        return overrides
+
+    def _reclaim_vm(self, vmid: int, deployment_id: Optional[int] = None, node: Optional[str] = None) -> bool:
+        """
+        Destroy VM lewat reclamation queue (non-blocking), atau langsung kalau queue tidak tersedia.
+
+        Returns:
+            True jika VM sudah terhapus saat fungsi ini kembali (jalur tanpa queue)
+        """
+        if self.reclaimer is not None:
+            self.reclaimer.enqueue(vmid, deployment_id, node)
+            return False
+        try:
+            self.proxmox_service.destroy_vm(vmid, node=node)
+        except ResourceNotFoundError:
+            pass
+        except Exception as cleanup_error:
+            logger.error("Failed to cleanup VM {}: {}", vmid, cleanup_error)
+            return False
+        return True
+
+    def terminate_challenge(self, challenge_id: int) -> Dict[str, Any]:
+        """
+        Nonaktifkan challenge dan jadwalkan destroy VM-nya.
+
+        Deployment langsung ditandai TERMINATING; reclamation queue yang
+        menyelesaikan ke TERMINATED setelah VM dan disk-nya terhapus.
+        """
+        stmt = (
+            select(Challenge)
+            .options(joinedload(Challenge.deployment))
+            .where(Challenge.id == challenge_id)
+        )
+        challenge = self.db.execute(stmt).scalars().first()
+        if not challenge:
+            raise ResourceNotFoundError(f"Challenge {challenge_id} not found")
+
+        challenge.deactivate()
+        deployment = challenge.deployment
+        vmid = deployment.vm_id if deployment is not None else None
+        if deployment is not None and self.expiry is not None:
+            self.expiry.cancel(deployment.id)
+        if deployment is not None:
+            if vmid is None:
+                deployment.status = DeploymentStatus.TERMINATED
+                deployment.terminated_at = deployment.terminated_at or datetime.utcnow()
+            elif deployment.status != DeploymentStatus.TERMINATING:
+                deployment.status = DeploymentStatus.TERMINATING
+        self.db.commit()
+
+        # Enqueue setelah commit supaya worker melihat status TERMINATING
+        if vmid is not None:
+            if self._reclaim_vm(vmid, deployment.id, deployment.node):
+                deployment.status = DeploymentStatus.TERMINATED
+                deployment.terminated_at = datetime.utcnow()
+                deployment.vm_id = None
+                deployment.vm_ip = None
+                self.db.commit()
+                vmid = None
+            else:
+                logger.info("Challenge {} terminating, VM {} queued for destroy", challenge_id, vmid)
+
+        return {
+            "success": True,
+            "message": "Challenge terminating" if vmid is not None else "Challenge terminated",
+            "challenge_id": challenge.id,
+            "status": deployment.status.value if deployment is not None else None,
+        }
+
+    def extend_challenge(self, challenge_id: int, seconds: int) -> Dict[str, Any]:
+        """
+        Perpanjang time limit challenge aktif.
+
+        Tambahan dibatasi CHALLENGE_EXTEND_MAX per request dan total umur VM
+        dibatasi CHALLENGE_MAX_LIFETIME sejak start.
+
+        Raises:
+            ResourceNotFoundError: If there is no active challenge/deployment
+            ValueError: If the lifetime cap is already reached
+        """
+        stmt = (
+            select(Challenge)
+            .options(joinedload(Challenge.deployment))
+            .where(Challenge.id == challenge_id)
+        )
+        challenge = self.db.execute(stmt).scalars().first()
+        deployment = challenge.deployment if challenge else None
+        if not challenge or not challenge.is_active or deployment is None or not deployment.is_active():
+            raise ResourceNotFoundError(f"No active deployment for challenge {challenge_id}")
+
+        now = datetime.utcnow()
+        seconds = min(seconds, self.settings.CHALLENGE_EXTEND_MAX)
+        current = max(deployment.expires_at or now, now)
+        limit = (deployment.started_at or deployment.created_at) + timedelta(seconds=self.settings.CHALLENGE_MAX_LIFETIME)
+        expires_at = min(current + timedelta(seconds=seconds), limit)
+        if expires_at <= current:
+            raise ValueError(f"Challenge {challenge_id} already reached the maximum lifetime")
+
+        deployment.expires_at = expires_at
+        self.db.commit()
+        if self.expiry is not None:
+            self.expiry.schedule(deployment.id, expires_at)
+        logger.info("Challenge {} extended until {}", challenge_id, expires_at.isoformat())
+
+        return {
+            "success": True,
+            "message": "Challenge extended",
+            "challenge_id": challenge.id,
+            "expires_at": expires_at,
+        }
+
     def submit_challenge(self, challenge_id: int, flag: str) -> Dict[str, Any]:
         stmt = select(Challenge).where(Challenge.id == challenge_id)
         challenge = self.db.execute(stmt).scalars().first()
@@ -134,6 +475,15 @@ class ChallengeService:
             raise ResourceNotFoundError(f"Challenge {challenge_id} not found")
         
         if challenge.flag == flag:
+            if challenge.flag_submitted:
+                # Jangan overwrite waktu solve pertama, scoreboard juga tidak dihitung ulang
+                return {
+                    "success": True,
+                    "message": "Flag already submitted",
+                    "correct": True,
+                    "submitted_at": challenge.flag_submitted_at,
+                }
+
             challenge.flag_submitted = True
             challenge.flag_submitted_at = datetime.now()
             
@@ -141,17 +491,161 @@ class ChallengeService:
             stmt_dep = select(Deployment).where(Deployment.challenge_id == challenge_id)
             deployment = self.db.execute(stmt_dep).scalars().first()
             
-            if deployment and deployment.vm_id:
+            if deployment and deployment.vm_id and self.stopper is None:
                 try:
-                    self.proxmox_service.stop_vm(deployment.vm_id)
+                    self.proxmox_service.stop_vm(deployment.vm_id, node=deployment.node)
+                    deployment.status = DeploymentStatus.STOPPED
+                    deployment.stopped_at = datetime.utcnow()
                 except Exception as e:
-                    logger.error(f"Failed to stop VM after submission: {e}")
+                    logger.error("Failed to stop VM after submission: {}", e)
             
             self.db.commit()
-            return {"success": True, "message": "Flag correct!"}
+
+            # Stop di background setelah commit; StopQueue yang set STOPPED/stopped_at
+            if deployment and deployment.vm_id and self.stopper is not None:
+                self.stopper.enqueue(deployment.vm_id, deployment.id, deployment.vm_type, deployment.node)
+
+            if self.scoreboard is not None:
+                update = self.scoreboard.record_solve(
+                    team=challenge.team,
+                    level_id=challenge.level_id,
+                    points=challenge.level.points,
+                    solved_at=challenge.flag_submitted_at,
+                )
+                if update and update.first_blood:
+                    logger.info("First blood on level {} by '{}'", update.level_id, update.team)
+
+            return {
+                "success": True,
+                "message": "Flag correct!",
+                "correct": True,
+                "submitted_at": challenge.flag_submitted_at,
+            }
         else:
-            return {"success": False, "message": "Flag incorrect"}
+            return {"success": False, "message": "Flag incorrect", "correct": False}
     
     def get_all(self) -> Sequence[Challenge]:
         stmt = select(Challenge).options(joinedload(Challenge.deployment))
-        return self.db.execute(stmt).scalars().all()
\ No newline at end of file
+        return self.db.execute(stmt).scalars().all()
+
+    def get_page(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 50,
+        team: Optional[str] = None,
+        level_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        status: Optional[DeploymentStatus] = None,
+    ) -> Tuple[Sequence[Challenge], Optional[int]]:
+        """
+        Keyset pagination on Challenge.id.
+
+        Returns:
+            Tuple of (challenges, next_cursor). next_cursor is None on the last page.
+        """
+        stmt = self._page_stmt(after_id, limit, team, level_id, is_active, status)
+        rows = self.db.execute(stmt).scalars().all()
+        return self._split_page(rows, limit)
+
+    def count(
+        self,
+        team: Optional[str] = None,
+        level_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        status: Optional[DeploymentStatus] = None,
+    ) -> int:
+        """COUNT dengan filter yang sama seperti get_page, tanpa load row"""
+        stmt = self._count_stmt(team, level_id, is_active, status)
+        return self.db.execute(stmt).scalar_one()
+
+    async def get_page_async(
+        self,
+        after_id: Optional[int] = None,
+        limit: int = 50,
+        team: Optional[str] = None,
+        level_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        status: Optional[DeploymentStatus] = None,
+    ) -> Tuple[Sequence[Challenge], Optional[int]]:
+        """
+        Async version of get_page. Runs natively on the event loop when an
+        AsyncSession is available, otherwise falls back to the sync session in a worker thread.
+        """
+        if self.async_db is None:
+            return await anyio.to_thread.run_sync(
+                partial(self.get_page, after_id, limit, team, level_id, is_active, status)
+            )
+        stmt = self._page_stmt(after_id, limit, team, level_id, is_active, status)
+        rows = (await self.async_db.execute(stmt)).scalars().all()
+        return self._split_page(rows, limit)
+
+    async def count_async(
+        self,
+        team: Optional[str] = None,
+        level_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        status: Optional[DeploymentStatus] = None,
+    ) -> int:
+        """Async version of count"""
+        if self.async_db is None:
+            return await anyio.to_thread.run_sync(partial(self.count, team, level_id, is_active, status))
+        stmt = self._count_stmt(team, level_id, is_active, status)
+        return (await self.async_db.execute(stmt)).scalar_one()
+
+    def _page_stmt(
+        self,
+        after_id: Optional[int],
+        limit: int,
+        team: Optional[str],
+        level_id: Optional[int],
+        is_active: Optional[bool],
+        status: Optional[DeploymentStatus],
+    ) -> Select:
+        stmt = (
+            select(Challenge)
+            .outerjoin(Challenge.deployment)
+            .options(contains_eager(Challenge.deployment))
+        )
+        stmt = self._apply_filters(stmt, team, level_id, is_active, status)
+        if after_id is not None:
+            stmt = stmt.where(Challenge.id > after_id)
+        # Ambil satu row ekstra untuk tahu apakah masih ada halaman berikutnya
+        return stmt.order_by(Challenge.id).limit(limit + 1)
+
+    def _count_stmt(
+        self,
+        team: Optional[str],
+        level_id: Optional[int],
+        is_active: Optional[bool],
+        status: Optional[DeploymentStatus],
+    ) -> Select:
+        stmt = select(func.count(Challenge.id))
+        if status is not None:
+            stmt = stmt.join(Challenge.deployment)
+        return self._apply_filters(stmt, team, level_id, is_active, status)
+
+    @staticmethod
+    def _split_page(rows: Sequence[Challenge], limit: int) -> Tuple[Sequence[Challenge], Optional[int]]:
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1].id
+        return rows, None
+
+    @staticmethod
+    def _apply_filters(
+        stmt: Select,
+        team: Optional[str],
+        level_id: Optional[int],
+        is_active: Optional[bool],
+        status: Optional[DeploymentStatus],
+    ) -> Select:
+        # Setiap filter punya index sendiri (ix_challenges_team, ix_challenges_level_id, ...)
+        if team is not None:
+            stmt = stmt.where(Challenge.team == team)
+        if level_id is not None:
+            stmt = stmt.where(Challenge.level_id == level_id)
+        if is_active is not None:
+            stmt = stmt.where(Challenge.is_active.is_(is_active))
+        if status is not None:
+            stmt = stmt.where(Deployment.status == status)
+        return stmt
\ No newline at end of file
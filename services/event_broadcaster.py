@@ -0,0 +1,217 @@
+"""
+Event Broadcaster
+Satu broadcaster untuk push event (scoreboard, status deployment) ke semua subscriber SSE
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, FrozenSet, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, sessionmaker
+
+from config.settings import Settings
+from core.logging import logger
+from models import Deployment, DeploymentStatus
+from schemas.types.event_types import DeploymentEvent
+
+# (sequence id, topic, encoded SSE frame)
+_Frame = Tuple[int, str, bytes]
+
+_PENDING_EVENTS_KEY = "pending_deployment_events"
+
+
+class Subscription:
+    """Satu koneksi SSE. Frame dikirim lewat queue yang terikat ke event loop."""
+
+    def __init__(self, topics: Optional[FrozenSet[str]], maxsize: int):
+        self.topics = topics
+        self.queue: "asyncio.Queue[Optional[_Frame]]" = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+
+class EventBroadcaster:
+    """
+    Fan-out event ke subscriber SSE.
+
+    Payload di-serialize sekali per event lalu frame yang sama dimasukkan ke queue
+    setiap subscriber, jadi biaya per subscriber hanya satu put_nowait. Publish aman
+    dipanggil dari thread mana pun (handler sync jalan di threadpool). Subscriber
+    yang terlalu lambat diputus dan bisa reconnect dengan Last-Event-ID.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[_Frame] = deque(maxlen=settings.SSE_REPLAY_BUFFER)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Bind broadcaster ke event loop aplikasi (dipanggil saat startup)"""
+        self._loop = loop or asyncio.get_running_loop()
+
+    def stop(self) -> None:
+        """Tutup semua stream yang masih terbuka"""
+        loop = self._loop
+        self._loop = None
+        if loop is None or loop.is_closed():
+            return
+        if self._in_loop(loop):
+            self._close_all()
+        else:
+            loop.call_soon_threadsafe(self._close_all)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, topic: str, payload: Any) -> None:
+        """
+        Publish event ke semua subscriber topic tersebut.
+        """
+        if isinstance(payload, BaseModel):
+            data = payload.model_dump_json()
+        else:
+            data = json.dumps(payload, default=str)
+
+        with self._lock:
+            seq = next(self._seq)
+            frame: _Frame = (seq, topic, f"id: {seq}\nevent: {topic}\ndata: {data}\n\n".encode())
+            self._history.append(frame)
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        # Selalu lewat call_soon_threadsafe supaya urutan frame sama dengan urutan sequence id
+        loop.call_soon_threadsafe(self._fan_out, frame)
+
+    def subscribe(self, topics: Optional[FrozenSet[str]] = None) -> Subscription:
+        """Register subscriber baru. Harus dipanggil dari event loop."""
+        if len(self._subscribers) >= self.settings.SSE_MAX_SUBSCRIBERS:
+            raise OverflowError("Too many event stream subscribers")
+        sub = Subscription(topics, self.settings.SSE_SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    async def stream(self, sub: Subscription, last_event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Generator frame SSE untuk satu subscriber, termasuk replay dan keepalive.
+        """
+        last_sent = 0
+        try:
+            yield b"retry: 3000\n\n"
+
+            if last_event_id is not None:
+                with self._lock:
+                    backlog = [f for f in self._history if f[0] > last_event_id]
+                for seq, topic, frame in backlog:
+                    if sub.wants(topic):
+                        yield frame
+                    last_sent = seq
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(sub.queue.get(), timeout=self.settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+
+                if item is None:
+                    break
+                seq, _, frame = item
+                if seq <= last_sent:
+                    continue # Sudah terkirim lewat replay
+                last_sent = seq
+                yield frame
+        finally:
+            self.unsubscribe(sub)
+
+    @staticmethod
+    def _in_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def _fan_out(self, frame: _Frame) -> None:
+        topic = frame[1]
+        for sub in list(self._subscribers):
+            if not sub.wants(topic):
+                continue
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(sub)
+
+    def _drop(self, sub: Subscription) -> None:
+        logger.warning("Dropping lagging event stream subscriber")
+        sub.lagged = True
+        self._subscribers.discard(sub)
+        self._close(sub)
+
+    def _close_all(self) -> None:
+        for sub in list(self._subscribers):
+            self._close(sub)
+        self._subscribers.clear()
+
+    @staticmethod
+    def _close(sub: Subscription) -> None:
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+
+def track_deployment_status(session_factory: sessionmaker, broadcaster: EventBroadcaster) -> None:
+    """
+    Publish event 'deployment' setiap kali Deployment.status berubah.
+
+    Perubahan dikumpulkan saat flush dan baru di-publish setelah commit,
+    jadi rollback tidak pernah menghasilkan event.
+    """
+
+    @event.listens_for(session_factory, "after_flush")
+    def _collect(session: Session, flush_context) -> None:
+        pending = session.info.setdefault(_PENDING_EVENTS_KEY, [])
+        now = datetime.utcnow()
+        for obj in list(session.new) + list(session.dirty):
+            if not isinstance(obj, Deployment):
+                continue
+            history = inspect(obj).attrs.status.history
+            if obj in session.new:
+                status = history.added[0] if history.added else DeploymentStatus.PENDING
+                previous = None
+            elif history.added:
+                status = history.added[0]
+                previous = history.deleted[0] if history.deleted else None
+            else:
+                continue
+            pending.append(DeploymentEvent(
+                deployment_id=obj.id,
+                challenge_id=obj.challenge_id,
+                vm_id=obj.vm_id,
+                status=DeploymentStatus(status).value,
+                previous_status=DeploymentStatus(previous).value if previous else None,
+                at=now,
+            ))
+
+    @event.listens_for(session_factory, "after_commit")
+    def _publish(session: Session) -> None:
+        for deployment_event in session.info.pop(_PENDING_EVENTS_KEY, []):
+            broadcaster.publish("deployment", deployment_event)
+
+    @event.listens_for(session_factory, "after_soft_rollback")
+    def _discard(session: Session, previous_transaction) -> None:
+        session.info.pop(_PENDING_EVENTS_KEY, None)
@@ -0,0 +1,249 @@
+"""
+Expiry Scheduler
+Menghentikan/menghapus VM challenge saat time limit-nya habis
+"""
+
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from config.settings import Settings
+from core.exceptions import ResourceNotFoundError
+from core.logging import logger
+from core.tracing import tracer
+from models import Deployment, DeploymentStatus
+from services.proxmox_service import ProxmoxService
+from services.reclamation_service import ReclamationQueue
+
+# Status yang masih memegang VM dan perlu deadline
+_TRACKED_STATUSES = (
+    DeploymentStatus.PENDING,
+    DeploymentStatus.CREATING,
+    DeploymentStatus.RUNNING,
+    DeploymentStatus.STOPPED,
+    DeploymentStatus.SUSPENDED,
+)
+# Mode "stop": VM yang sudah STOPPED tidak punya aksi lagi, jadi tidak perlu deadline
+_STOP_MODE_STATUSES = tuple(s for s in _TRACKED_STATUSES if s != DeploymentStatus.STOPPED)
+
+
+class ExpiryScheduler:
+    """
+    Min-heap (expires_at, deployment_id) untuk semua Deployment aktif.
+
+    schedule/extend/cancel O(log n) (entry lama di heap di-invalidate secara lazy
+    lewat dict deadline), thread scheduler tidur sampai deadline terdekat, tidak ada
+    scan tabel periodik. Heap dibangun ulang dari DB saat startup.
+
+    EXPIRY_ACTION "destroy" mengirim VM ke ReclamationQueue, "stop" hanya men-stop VM.
+    Stop yang gagal dijadwalkan ulang dengan backoff (EXPIRY_RETRY_DELAY) sampai berhasil.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        session_factory: sessionmaker,
+        proxmox_service: ProxmoxService,
+        reclaimer: ReclamationQueue,
+    ):
+        self.settings = settings
+        self.session_factory = session_factory
+        self.proxmox_service = proxmox_service
+        self.reclaimer = reclaimer
+        self.expired_count = 0
+        self._heap: List[Tuple[datetime, int]] = []
+        self._deadlines: Dict[int, datetime] = {}
+        # deployment_id -> jumlah stop gagal berturut-turut (backoff retry)
+        self._attempts: Dict[int, int] = {}
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.settings.EXPIRY_ENABLED or self._thread is not None:
+            return
+        with self._cond:
+            self._stop = False
+        self._thread = threading.Thread(target=self._run, name="expiry-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Expiry scheduler started ({} deadlines)", len(self))
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._deadlines)
+
+    def next_deadline(self) -> Optional[Tuple[datetime, int]]:
+        with self._cond:
+            self._discard_stale()
+            return self._heap[0] if self._heap else None
+
+    def schedule(self, deployment_id: int, expires_at: datetime) -> None:
+        """Set (atau ganti) deadline sebuah Deployment"""
+        with self._cond:
+            self._deadlines[deployment_id] = expires_at
+            heapq.heappush(self._heap, (expires_at, deployment_id))
+            self._compact()
+            # Bangunkan thread hanya kalau deadline terdekat berubah
+            if self._heap[0] == (expires_at, deployment_id):
+                self._cond.notify()
+
+    def cancel(self, deployment_id: int) -> None:
+        with self._cond:
+            self._deadlines.pop(deployment_id, None)
+            self._attempts.pop(deployment_id, None)
+
+    def tracked_statuses(self) -> Tuple[DeploymentStatus, ...]:
+        """Status Deployment yang masih punya aksi expiry untuk EXPIRY_ACTION saat ini"""
+        return _STOP_MODE_STATUSES if self.settings.EXPIRY_ACTION == "stop" else _TRACKED_STATUSES
+
+    def rebuild_from_db(self) -> int:
+        """
+        Isi ulang heap dari deployments yang masih memegang VM.
+        Deployment tanpa expires_at (data lama) diberi deadline created_at + durasi level.
+        """
+        db = self.session_factory()
+        try:
+            deployments = db.execute(
+                select(Deployment)
+                .options(joinedload(Deployment.challenge))
+                .where(Deployment.status.in_(self.tracked_statuses()))
+            ).scalars().all()
+            backfilled = 0
+            entries: Dict[int, datetime] = {}
+            for deployment in deployments:
+                if deployment.expires_at is None:
+                    level = deployment.challenge.level if deployment.challenge else None
+                    duration = self.duration_for(level.duration if level else None)
+                    deployment.expires_at = (deployment.started_at or deployment.created_at) + timedelta(seconds=duration)
+                    backfilled += 1
+                entries[deployment.id] = deployment.expires_at
+            if backfilled:
+                db.commit()
+                logger.info("Backfilled expires_at for {} deployments", backfilled)
+        finally:
+            db.close()
+
+        with self._cond:
+            self._deadlines = entries
+            self._heap = [(deadline, deployment_id) for deployment_id, deadline in entries.items()]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+        return len(entries)
+
+    def duration_for(self, level_duration: Optional[int]) -> int:
+        """Durasi challenge dalam detik: per level, fallback ke DEFAULT_CHALLENGE_DURATION"""
+        return level_duration if level_duration else self.settings.DEFAULT_CHALLENGE_DURATION
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                due = self._pop_due(datetime.utcnow())
+                while not due and not self._stop:
+                    self._discard_stale()
+                    timeout = None
+                    if self._heap:
+                        timeout = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+                    if timeout is None or timeout > 0:
+                        # Batas atas supaya perubahan jam sistem tidak membuat thread tidur terlalu lama
+                        self._cond.wait(min(timeout, 60) if timeout is not None else 60)
+                    due = self._pop_due(datetime.utcnow())
+                if self._stop:
+                    return
+            for deployment_id in due:
+                try:
+                    with tracer.start_trace("expiry.expire", deployment_id=deployment_id):
+                        self._expire(deployment_id)
+                except Exception as e:
+                    logger.error("Failed to expire deployment {}: {}", deployment_id, e)
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, deployment_id = heapq.heappop(self._heap)
+            if self._deadlines.get(deployment_id) == deadline:
+                del self._deadlines[deployment_id]
+                due.append(deployment_id)
+        return due
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        # Extend berulang meninggalkan entry basi; rebuild kalau heap sudah jauh lebih besar
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, deployment_id) for deployment_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def _expire(self, deployment_id: int) -> None:
+        db = self.session_factory()
+        try:
+            deployment = db.execute(
+                select(Deployment)
+                .options(joinedload(Deployment.challenge))
+                .where(Deployment.id == deployment_id)
+            ).scalars().first()
+            if deployment is None or deployment.status not in self.tracked_statuses():
+                self._attempts.pop(deployment_id, None)
+                return
+            # Deadline diperpanjang oleh proses lain setelah entry ini dijadwalkan
+            if deployment.expires_at and deployment.expires_at > datetime.utcnow():
+                self.schedule(deployment_id, deployment.expires_at)
+                return
+
+            vmid = deployment.vm_id
+            logger.info("Deployment {} (VM {}) expired, action={}", deployment_id, vmid, self.settings.EXPIRY_ACTION)
+            if deployment.challenge is not None:
+                deployment.challenge.deactivate()
+
+            if self.settings.EXPIRY_ACTION == "stop":
+                if vmid is not None:
+                    try:
+                        self.proxmox_service.stop_vm(vmid, node=deployment.node)
+                    except ResourceNotFoundError:
+                        pass
+                    except Exception as e:
+                        # Proxmox sedang bermasalah: batalkan deactivate dan coba lagi nanti
+                        db.rollback()
+                        self._retry_later(deployment_id, vmid, e)
+                        return
+                    deployment.status = DeploymentStatus.STOPPED
+                    deployment.stopped_at = datetime.utcnow()
+                db.commit()
+            elif vmid is None:
+                deployment.status = DeploymentStatus.TERMINATED
+                deployment.terminated_at = datetime.utcnow()
+                db.commit()
+            else:
+                deployment.status = DeploymentStatus.TERMINATING
+                db.commit()
+                self.reclaimer.enqueue(vmid, deployment_id, deployment.node)
+            self._attempts.pop(deployment_id, None)
+            self.expired_count += 1
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _retry_later(self, deployment_id: int, vmid: int, error: Exception) -> None:
+        attempts = self._attempts.get(deployment_id, 0) + 1
+        self._attempts[deployment_id] = attempts
+        delay = min(self.settings.EXPIRY_RETRY_DELAY * (2 ** (attempts - 1)), self.settings.EXPIRY_RETRY_MAX_DELAY)
+        logger.warning(
+            "Stopping expired VM {} (deployment {}) failed (attempt {}), retrying in {:.0f}s: {}",
+            vmid, deployment_id, attempts, delay, error,
+        )
+        self.schedule(deployment_id, datetime.utcnow() + timedelta(seconds=delay))
@@ -0,0 +1,154 @@
+"""
+Health Prober
+Cek Proxmox, database dan Ansible di background, endpoint health cukup membaca cache
+"""
+
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import Settings
+from core.logging import logger
+from schemas.types.health_types import ComponentHealth
+from services.ansible_service import AnsibleService
+from services.proxmox_service import ProxmoxService
+
+# Komponen yang wajib up supaya instance dianggap ready menerima traffic.
+# Proxmox sengaja tidak termasuk: saat Proxmox down, scoreboard dan submit flag tetap harus
+# dilayani (provisioning gagal cepat lewat circuit breaker), jadi cukup status "degraded".
+READINESS_COMPONENTS = ("database",)
+# Komponen yang membuat /health "degraded" (fitur provisioning terganggu) tapi tetap ready
+DEGRADED_COMPONENTS = ("proxmox", "ansible")
+
+
+class HealthProber:
+    """
+    Probe dependency setiap HEALTH_CHECK_INTERVAL detik dan simpan hasilnya beserta timestamp.
+
+    Request health tidak pernah menyentuh Proxmox/DB langsung, sehingga load balancer
+    yang polling tiap detik tidak menambah beban dan tidak ikut hang saat Proxmox lambat.
+
+    Tiap komponen punya thread probe sendiri: call Proxmox yang lambat (sampai
+    PROXMOX_CALL_DEADLINE) tidak menunda probe database sampai hasilnya stale.
+    Probe yang belum selesai lebih dari HEALTH_PROBE_TIMEOUT dilaporkan down.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        proxmox_service: ProxmoxService,
+        session_factory: sessionmaker,
+        ansible_service: AnsibleService,
+    ):
+        self.settings = settings
+        self.proxmox_service = proxmox_service
+        self.session_factory = session_factory
+        self.ansible_service = ansible_service
+        self._checks: Dict[str, Callable[[], None]] = {
+            "proxmox": self.proxmox_service.check_connection,
+            "database": self._check_database,
+            "ansible": self._check_ansible,
+        }
+        self._results: Dict[str, ComponentHealth] = {name: ComponentHealth() for name in self._checks}
+        # Komponen yang probe-nya sedang berjalan -> waktu mulai (datetime.utcnow)
+        self._inflight: Dict[str, datetime] = {}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for name in self._checks:
+            thread = threading.Thread(target=self._run, args=(name,), name=f"health-prober-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Health prober started (interval {}s)", self.settings.HEALTH_CHECK_INTERVAL)
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _run(self, name: str) -> None:
+        # Probe pertama langsung supaya readiness tidak menunggu satu interval
+        while True:
+            try:
+                self._probe(name, self._checks[name])
+            except Exception as e:
+                logger.error("Health probe '{}' failed: {}", name, e)
+            if self._stop.wait(self.settings.HEALTH_CHECK_INTERVAL):
+                return
+
+    def probe_once(self) -> Dict[str, ComponentHealth]:
+        """Probe semua komponen sekali secara berurutan (sinkron), untuk test dan tooling"""
+        for name, check in self._checks.items():
+            self._probe(name, check)
+        return self.snapshot()
+
+    def _probe(self, name: str, check: Callable[[], None]) -> None:
+        start = time.perf_counter()
+        self._inflight[name] = datetime.utcnow()
+        try:
+            check()
+            result = ComponentHealth(status="up")
+        except Exception as e:
+            result = ComponentHealth(status="down", error=str(e))
+            if self._results[name].status != "down":
+                logger.warning("Health probe '{}' down: {}", name, e)
+        finally:
+            self._inflight.pop(name, None)
+        result.checked_at = datetime.utcnow()
+        result.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        # Replace dict entry (atomic), reader tidak butuh lock
+        self._results[name] = result
+
+    def _check_database(self) -> None:
+        with self.session_factory() as session:
+            session.execute(text("SELECT 1"))
+
+    def _check_ansible(self) -> None:
+        if not self.ansible_service.playbook_dir.is_dir():
+            raise RuntimeError(f"Playbook directory not found: {self.ansible_service.playbook_dir}")
+        if shutil.which("ansible-playbook") is None:
+            raise RuntimeError("ansible-playbook executable not found in PATH")
+
+    def snapshot(self, now: Optional[datetime] = None) -> Dict[str, ComponentHealth]:
+        now = now or datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.settings.HEALTH_STALE_AFTER)
+        timeout = self.settings.HEALTH_PROBE_TIMEOUT
+        snapshot = {}
+        for name, result in self._results.items():
+            update = {"stale": result.checked_at is None or result.checked_at < stale_before}
+            started_at = self._inflight.get(name)
+            if started_at is not None and (now - started_at).total_seconds() > timeout:
+                # Probe masih menggantung: jangan tunggu sampai stale untuk melaporkan down
+                update.update(status="down", error=f"Probe timed out after {timeout}s")
+            snapshot[name] = result.model_copy(update=update)
+        return snapshot
+
+    def is_ready(self, now: Optional[datetime] = None) -> bool:
+        """Ready jika semua READINESS_COMPONENTS up dan hasil probe-nya belum stale"""
+        return self._all_up(self.snapshot(now), READINESS_COMPONENTS)
+
+    def status(self, now: Optional[datetime] = None) -> str:
+        """
+        starting (komponen readiness belum pernah di-probe) / healthy / degraded (Proxmox
+        atau Ansible bermasalah) / unhealthy (tidak ready)
+        """
+        snapshot = self.snapshot(now)
+        if any(snapshot[name].status == "unknown" for name in READINESS_COMPONENTS):
+            return "starting"
+        if not self._all_up(snapshot, READINESS_COMPONENTS):
+            return "unhealthy"
+        return "healthy" if self._all_up(snapshot, DEGRADED_COMPONENTS) else "degraded"
+
+    @staticmethod
+    def _all_up(snapshot: Dict[str, ComponentHealth], names) -> bool:
+        return all(snapshot[name].status == "up" and not snapshot[name].stale for name in names)
@@ -0,0 +1,186 @@
+"""
+Idle Detector
+Hibernate VM challenge yang idle supaya memory node bisa dipakai team lain
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import Settings
+from core.logging import logger
+from core.tracing import tracer
+from models import Deployment, DeploymentStatus
+from services.proxmox_service import ProxmoxService
+
+
+@dataclass
+class _IdleSample:
+    net_bytes: int
+    sampled_at: float
+    idle_since: Optional[float] = None
+
+
+class IdleDetector:
+    """
+    Deteksi VM idle dari metrics cluster/resources (satu request untuk semua guest per pass).
+
+    VM dianggap idle pada sebuah pass jika CPU di bawah IDLE_CPU_THRESHOLD dan traffic
+    jaringan sejak sample sebelumnya di bawah IDLE_NET_BYTES. VM yang idle terus-menerus
+    selama IDLE_SUSPEND_AFTER detik di-hibernate (suspend to disk), maksimal
+    IDLE_SUSPEND_BATCH per pass. Resume dilakukan ChallengeService saat team memakai challenge lagi.
+    """
+
+    def __init__(self, settings: Settings, proxmox_service: ProxmoxService, session_factory: sessionmaker):
+        self.settings = settings
+        self.proxmox_service = proxmox_service
+        self.session_factory = session_factory
+        self.suspended_count = 0
+        self._samples: Dict[int, _IdleSample] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.settings.IDLE_SUSPEND_ENABLED or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="idle-detector", daemon=True)
+        self._thread.start()
+        logger.info("Idle detector started (suspend after {}s idle)", self.settings.IDLE_SUSPEND_AFTER)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def forget(self, vmid: int) -> None:
+        """Reset status idle VM (mis. setelah di-resume)"""
+        self._samples.pop(vmid, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.settings.IDLE_CHECK_INTERVAL):
+            try:
+                with tracer.start_trace("idle.check"):
+                    self.check()
+            except Exception as e:
+                logger.error("Idle check failed: {}", e)
+
+    def check(self, now: Optional[float] = None) -> List[int]:
+        """
+        Run one idle pass.
+
+        Returns:
+            VMID yang di-suspend pada pass ini
+        """
+        now = time.monotonic() if now is None else now
+        db = self.session_factory()
+        try:
+            running = {
+                vmid: deployment_id
+                for deployment_id, vmid in db.execute(
+                    select(Deployment.id, Deployment.vm_id).where(
+                        Deployment.status == DeploymentStatus.RUNNING,
+                        Deployment.vm_id.is_not(None),
+                    )
+                ).all()
+            }
+        finally:
+            db.close()
+
+        metrics = self.proxmox_service.get_guest_metrics()
+        # Buang sample VM yang sudah tidak RUNNING
+        self._samples = {vmid: s for vmid, s in self._samples.items() if vmid in running}
+
+        candidates = []
+        for vmid in running:
+            res = metrics.get(vmid)
+            if not res or res.get('type') != 'qemu' or res.get('status') != 'running':
+                continue
+            if self._observe(vmid, res, now) >= self.settings.IDLE_SUSPEND_AFTER:
+                candidates.append(vmid)
+
+        # Yang paling lama idle di-suspend duluan
+        candidates.sort(key=lambda vmid: self._samples[vmid].idle_since)
+        suspended = []
+        for vmid in candidates[:max(1, self.settings.IDLE_SUSPEND_BATCH)]:
+            if self._stop.is_set():
+                break
+            if self._suspend(vmid, running[vmid], metrics[vmid].get('node')):
+                suspended.append(vmid)
+        return suspended
+
+    def _observe(self, vmid: int, res: dict, now: float) -> float:
+        """Update sample VM dan kembalikan lama idle (detik)"""
+        net_bytes = int(res.get('netin') or 0) + int(res.get('netout') or 0)
+        previous = self._samples.get(vmid)
+        sample = _IdleSample(net_bytes=net_bytes, sampled_at=now)
+        self._samples[vmid] = sample
+        if previous is None:
+            return 0.0
+
+        # Counter reset (VM reboot) dianggap aktivitas
+        net_delta = net_bytes - previous.net_bytes
+        idle = (
+            0 <= net_delta < self.settings.IDLE_NET_BYTES
+            and float(res.get('cpu') or 0) < self.settings.IDLE_CPU_THRESHOLD
+        )
+        if not idle:
+            return 0.0
+        sample.idle_since = previous.idle_since if previous.idle_since is not None else previous.sampled_at
+        return now - sample.idle_since
+
+    def _suspend(self, vmid: int, deployment_id: int, node: Optional[str] = None) -> bool:
+        """
+        Tandai SUSPENDED dulu (UPDATE ... WHERE status=RUNNING), baru hibernate VM.
+
+        Team yang membuka challenge selama suspend berjalan melihat SUSPENDED dan me-resume VM.
+        Kalau resume itu sudah mengembalikan status ke RUNNING sebelum suspend selesai,
+        VM di-resume lagi di sini supaya tidak tertinggal hibernate dengan status RUNNING.
+        """
+        db = self.session_factory()
+        try:
+            # Status berubah sejak awal pass (submit, terminate, expire): rowcount 0
+            claimed = db.execute(
+                update(Deployment)
+                .where(
+                    Deployment.id == deployment_id,
+                    Deployment.vm_id == vmid,
+                    Deployment.status == DeploymentStatus.RUNNING,
+                )
+                .values(status=DeploymentStatus.SUSPENDED)
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return False
+            try:
+                self.proxmox_service.suspend_vm(vmid, node=node)
+            except Exception as e:
+                logger.error("Failed to suspend idle VM {}: {}", vmid, e)
+                db.execute(
+                    update(Deployment)
+                    .where(Deployment.id == deployment_id, Deployment.status == DeploymentStatus.SUSPENDED)
+                    .values(status=DeploymentStatus.RUNNING)
+                )
+                db.commit()
+                return False
+            status = db.execute(select(Deployment.status).where(Deployment.id == deployment_id)).scalar()
+        finally:
+            db.close()
+        if status == DeploymentStatus.RUNNING:
+            # Team memakai challenge lagi selama suspend berjalan
+            logger.info("Deployment {} was resumed while VM {} was being suspended, resuming again", deployment_id, vmid)
+            try:
+                self.proxmox_service.resume_vm(vmid, node=node)
+            except Exception as e:
+                logger.error("Failed to resume VM {} after concurrent use: {}", vmid, e)
+            self.forget(vmid)
+            return False
+        self.forget(vmid)
+        self.suspended_count += 1
+        logger.info("Idle VM {} (deployment {}) suspended to disk", vmid, deployment_id)
+        return True
@@ -0,0 +1,52 @@
+"""
+Level Profile Cache
+Cache in-memory profil provisioning Level supaya create_challenge tidak query tabel levels setiap kali
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import Settings
+from models import Level
+from schemas.types.level_types import LevelProfile
+
+
+class LevelProfileCache:
+    """
+    Cache LevelProfile per level_id dengan TTL LEVEL_PROFILE_TTL.
+
+    Perubahan lewat API levels memanggil invalidate(), TTL hanya jaring pengaman
+    untuk perubahan langsung di DB.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Tuple[LevelProfile, float]] = {}
+
+    def get(self, db: Session, level_id: int) -> Optional[LevelProfile]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(level_id)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+        level = db.execute(select(Level).where(Level.id == level_id)).scalars().first()
+        if level is None:
+            return None
+        profile = LevelProfile.from_level(level)
+        with self._lock:
+            self._entries[level_id] = (profile, now + self.settings.LEVEL_PROFILE_TTL)
+        return profile
+
+    def invalidate(self, level_id: Optional[int] = None) -> None:
+        """Hapus satu level dari cache, atau semuanya jika level_id None"""
+        with self._lock:
+            if level_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(level_id, None)
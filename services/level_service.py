@@ -0,0 +1,46 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Level
+from services.level_profile_cache import LevelProfileCache
+from core.exceptions import ResourceNotFoundError
+from core.logging import logger
+from schemas.types.level_types import LevelProfile
+
+
+class LevelService:
+    """Service untuk profil provisioning Level"""
+
+    # Field profil yang boleh diubah lewat API
+    PROFILE_FIELDS = ("backend", "duration", "template_vmid", "memory", "cores", "full_clone", "storage", "node")
+
+    def __init__(self, db: Session, profiles: LevelProfileCache):
+        self.db = db
+        self.profiles = profiles
+
+    def get_profile(self, level_id: int) -> LevelProfile:
+        profile = self.profiles.get(self.db, level_id)
+        if profile is None:
+            raise ResourceNotFoundError(f"Level {level_id} not found")
+        return profile
+
+    def update_profile(self, level_id: int, changes: dict) -> LevelProfile:
+        """
+        Update sebagian field profil lalu invalidate cache.
+
+        Raises:
+            ResourceNotFoundError: If the level does not exist
+        """
+        level: Optional[Level] = self.db.execute(select(Level).where(Level.id == level_id)).scalars().first()
+        if level is None:
+            raise ResourceNotFoundError(f"Level {level_id} not found")
+
+        for field, value in changes.items():
+            if field in self.PROFILE_FIELDS:
+                setattr(level, field, value)
+        self.db.commit()
+        self.profiles.invalidate(level_id)
+        logger.info("Level {} profile updated: {}", level_id, sorted(changes))
+        return LevelProfile.from_level(level)
@@ -0,0 +1,123 @@
+"""
+Provisioning Registry
+Mencegah provisioning ganda untuk (team, level) yang sama dan menyimpan hasil per Idempotency-Key
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from config.settings import Settings
+from core.exceptions import IdempotencyKeyConflictError, ProvisioningInProgressError
+from schemas.types.challenge_types import ChallengeResult
+
+
+@dataclass
+class ProvisioningTicket:
+    """Satu provisioning yang sedang/sudah berjalan untuk sebuah slot (team, level)"""
+    slot: str
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[ChallengeResult] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class _KeyEntry:
+    slot: str
+    ticket: ProvisioningTicket
+    expires_at: float
+
+
+class ProvisioningRegistry:
+    """
+    Registry in-process untuk provisioning yang sedang berjalan.
+
+    Request pertama untuk sebuah slot menjadi owner dan menjalankan provisioning,
+    request lain (retry dengan atau tanpa Idempotency-Key) menunggu hasil yang sama.
+    Hasil sukses disimpan per Idempotency-Key sampai IDEMPOTENCY_TTL; hasil gagal
+    tidak disimpan supaya client bisa retry.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, ProvisioningTicket] = {}
+        self._keys: "OrderedDict[str, _KeyEntry]" = OrderedDict()
+
+    def begin(self, slot: str, key: Optional[str] = None) -> Tuple[ProvisioningTicket, bool]:
+        """
+        Claim a slot for provisioning.
+
+        Returns:
+            Tuple of (ticket, is_owner). Only the owner may provision; others wait on the ticket.
+
+        Raises:
+            IdempotencyKeyConflictError: If the key was used for a different (team, level)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+
+            if key is not None and key in self._keys:
+                entry = self._keys[key]
+                if entry.slot != slot:
+                    raise IdempotencyKeyConflictError(f"Idempotency-Key '{key}' was already used for another request")
+                return entry.ticket, False
+
+            ticket = self._inflight.get(slot)
+            is_owner = ticket is None
+            if is_owner:
+                ticket = ProvisioningTicket(slot=slot)
+                self._inflight[slot] = ticket
+
+            if key is not None:
+                self._keys[key] = _KeyEntry(slot=slot, ticket=ticket, expires_at=now + self.settings.IDEMPOTENCY_TTL)
+                while len(self._keys) > self.settings.IDEMPOTENCY_MAX_KEYS:
+                    self._keys.popitem(last=False)
+
+            return ticket, is_owner
+
+    def finish(
+        self,
+        ticket: ProvisioningTicket,
+        result: Optional[ChallengeResult] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Publish the owner's outcome to every waiter and release the slot"""
+        with self._lock:
+            if self._inflight.get(ticket.slot) is ticket:
+                del self._inflight[ticket.slot]
+            if error is not None:
+                for key in [k for k, entry in self._keys.items() if entry.ticket is ticket]:
+                    del self._keys[key]
+            ticket.result = result
+            ticket.error = error
+        ticket.done.set()
+
+    def wait(self, ticket: ProvisioningTicket, timeout: Optional[float] = None) -> ChallengeResult:
+        """
+        Wait for another request's provisioning and return its result.
+
+        Raises:
+            ProvisioningInProgressError: If it is still running after the timeout
+        """
+        if not ticket.done.wait(timeout):
+            raise ProvisioningInProgressError(f"Provisioning for '{ticket.slot}' is still in progress")
+        if ticket.error is not None:
+            raise ticket.error
+        assert ticket.result is not None
+        return ticket.result.model_copy(update={"existing": True})
+
+    def inflight_count(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def _purge_expired(self, now: float) -> None:
+        # Insertion order == expiry order karena TTL konstan
+        while self._keys:
+            key, entry = next(iter(self._keys.items()))
+            if entry.expires_at > now:
+                break
+            del self._keys[key]
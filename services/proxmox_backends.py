@@ -0,0 +1,101 @@
+"""
+Proxmox Guest Backends
+Perbedaan API antara VM (qemu) dan container (lxc) dikumpulkan di sini,
+ProxmoxService cukup memilih backend sesuai tipe guest
+"""
+
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+
+
+class GuestBackend:
+    """Base class backend guest Proxmox (nodes/{node}/{vm_type}/{vmid})"""
+
+    vm_type: str = ""
+    # Nama setting template default jika tidak dikirim via config
+    template_setting: str = ""
+    default_net0: str = ""
+    supports_suspend: bool = False
+
+    def collection(self, proxmox: "ProxmoxAPI", node: str):
+        return getattr(proxmox.nodes(node), self.vm_type)
+
+    def resource(self, proxmox: "ProxmoxAPI", node: str, vmid: int):
+        return self.collection(proxmox, node)(vmid)
+
+    def clone(
+        self,
+        proxmox: "ProxmoxAPI",
+        node: str,
+        template_vmid: int,
+        vmid: int,
+        name: str,
+        target_node: str,
+        storage: str,
+        full: int,
+    ) -> Optional[str]:
+        """Clone template, mengembalikan UPID task clone"""
+        raise NotImplementedError
+
+    def apply_config(self, guest, memory: int, cores: int, net0: Optional[str]) -> Any:
+        raise NotImplementedError
+
+    def clone_params(self, storage: str, full: int) -> Dict[str, Any]:
+        # Target storage hanya valid untuk full clone; linked clone selalu di storage template
+        # dan Proxmox menolak parameter storage kalau full=0
+        return {'full': full, 'storage': storage} if full else {'full': full}
+
+    def destroy_params(self) -> Dict[str, Any]:
+        # purge: hapus dari backup job/HA, destroy-unreferenced-disks: buang disk yang tidak terpasang
+        return {'purge': 1, 'destroy-unreferenced-disks': 1}
+
+
+class QemuBackend(GuestBackend):
+    """Full VM (KVM/QEMU)"""
+
+    vm_type = "qemu"
+    template_setting = "TEMPLATE_VMID"
+    default_net0 = "virtio,bridge=vmbr0"
+    supports_suspend = True
+
+    def clone(self, proxmox, node, template_vmid, vmid, name, target_node, storage, full):
+        return self.resource(proxmox, node, template_vmid).clone.post(
+            newid=vmid,
+            name=name,
+            target=target_node,
+            # full=1 untuk full clone (copy disk), 0 untuk linked clone (butuh template di storage yang sama)
+            **self.clone_params(storage, full),
+        )
+
+    def apply_config(self, guest, memory, cores, net0):
+        return guest.config.post(memory=memory, cores=cores, net0=net0 or self.default_net0)
+
+
+class LxcBackend(GuestBackend):
+    """
+    Container LXC: start sekitar satu detik dan memory jauh lebih kecil,
+    cocok untuk challenge web. Tidak mendukung hibernate (suspend to disk).
+    """
+
+    vm_type = "lxc"
+    template_setting = "TEMPLATE_CTID"
+    default_net0 = "name=eth0,bridge=vmbr0,ip=dhcp"
+
+    def clone(self, proxmox, node, template_vmid, vmid, name, target_node, storage, full):
+        return self.resource(proxmox, node, template_vmid).clone.post(
+            newid=vmid,
+            hostname=name,
+            target=target_node,
+            **self.clone_params(storage, full),
+        )
+
+    def apply_config(self, guest, memory, cores, net0):
+        # Config container hanya tersedia via PUT (sinkron)
+        return guest.config.put(memory=memory, cores=cores, net0=net0 or self.default_net0)
+
+
+BACKENDS: Dict[str, GuestBackend] = {
+    backend.vm_type: backend for backend in (QemuBackend(), LxcBackend())
+}
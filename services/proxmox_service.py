@@ -3,22 +3,129 @@ Proxmox Service
 Mengelola koneksi dan operasi dengan Proxmox VE
 """
 
-from proxmoxer import ProxmoxAPI
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator, Callable, Set, TypeVar, TYPE_CHECKING
 from config.settings import Settings
+from core.circuit_breaker import CircuitBreaker, backoff_delay
 from core.logging import logger
+from core.metrics import PROXMOX_API_DURATION, PROXMOX_API_ERRORS, PROXMOX_API_RETRIES
+from core.tracing import tracer
 from schemas.types.vm_types import VMResult, VMInfo
-from core.exceptions import ProxmoxConnectionError, ProxmoxNodeError, VMCreationError, ResourceNotFoundError
+from core.exceptions import (
+    CircuitOpenError,
+    ProxmoxConnectionError,
+    ProxmoxNodeError,
+    ProxmoxUnavailableError,
+    VMCreationError,
+    ResourceNotFoundError,
+)
+from services.proxmox_backends import BACKENDS, GuestBackend
+from core.lazy import LazyCallable
+
+if TYPE_CHECKING:
+    from proxmoxer import ProxmoxAPI
+else:
+    # proxmoxer (+ requests) baru di-import saat koneksi pertama
+    ProxmoxAPI = LazyCallable("proxmoxer", "ProxmoxAPI")
+
+T = TypeVar("T")
+
+# Status HTTP yang berarti Proxmox (atau proxy di depannya) sedang tidak sanggup melayani;
+# 595 = pveproxy gagal menghubungi node
+TRANSIENT_STATUS = {502, 503, 504, 595}
+
+
+def is_transient(error: BaseException) -> bool:
+    """Error jaringan/timeout (requests & socket = OSError) atau 5xx gateway dari Proxmox"""
+    if isinstance(error, OSError):
+        return True
+    return getattr(error, "status_code", None) in TRANSIENT_STATUS
+
 
 class ProxmoxService:
     """Service untuk mengelola koneksi dan operasi Proxmox"""
     
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.proxmox: Optional[ProxmoxAPI] = None
+        self.proxmox: Optional["ProxmoxAPI"] = None
         self.node = settings.PROXMOX_NODE
+        # vmid -> 'qemu' / 'lxc', diisi list_vms/create_vm supaya operasi per VMID tidak perlu deteksi ulang
+        self._guest_types: Dict[int, str] = {}
+        # vmid -> node tempat guest berada (node affinity Level bisa beda dari PROXMOX_NODE)
+        self._guest_nodes: Dict[int, str] = {}
+        # VMID yang sedang di-clone di proses ini; AdmissionController menjalankan beberapa
+        # clone paralel, tanpa reservasi semuanya memilih VMID kosong yang sama
+        self._vmid_lock = threading.Lock()
+        self._reserved_vmids: Set[int] = set()
+        self.breaker = CircuitBreaker(
+            "proxmox",
+            failure_threshold=settings.PROXMOX_BREAKER_FAILURES,
+            reset_timeout=settings.PROXMOX_BREAKER_RESET,
+            half_open_calls=settings.PROXMOX_BREAKER_HALF_OPEN_CALLS,
+        )
     
-    def _ensure_connected(self) -> ProxmoxAPI:
+    @contextmanager
+    def _api(self, endpoint: str) -> Iterator[None]:
+        """
+        Catat latency dan error satu call Proxmox API (label endpoint, tanpa VMID/node).
+
+        Call lewat circuit breaker: selama circuit open, call langsung gagal tanpa
+        menyentuh Proxmox. Error transient dilaporkan sebagai ProxmoxUnavailableError.
+        """
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise ProxmoxUnavailableError(f"Proxmox unavailable: {e}", retry_after=e.retry_after) from e
+        start = time.perf_counter()
+        try:
+            with tracer.span("proxmox.api", endpoint=endpoint, node=self.node):
+                yield
+        except Exception as e:
+            PROXMOX_API_ERRORS.inc(endpoint=endpoint)
+            if not is_transient(e):
+                # Proxmox menjawab (mis. 404/500 karena request), jadi dia sehat
+                self.breaker.record_success()
+                raise
+            self.breaker.record_failure()
+            raise ProxmoxUnavailableError(
+                f"Proxmox {endpoint} failed: {e}", retry_after=self.breaker.retry_after()
+            ) from e
+        else:
+            self.breaker.record_success()
+        finally:
+            PROXMOX_API_DURATION.observe(time.perf_counter() - start, endpoint=endpoint)
+
+    def _get(self, endpoint: str, fn: Callable[[], T]) -> T:
+        """
+        Jalankan call idempotent (GET) dengan retry backoff eksponensial + jitter.
+
+        Hanya error transient yang di-retry, dan total waktunya dibatasi
+        PROXMOX_CALL_DEADLINE. Call yang mengubah state (clone/start/stop/delete)
+        tidak lewat sini karena retry bisa menjalankannya dua kali.
+        """
+        deadline = time.monotonic() + self.settings.PROXMOX_CALL_DEADLINE
+        attempt = 0
+        while True:
+            try:
+                with self._api(endpoint):
+                    return fn()
+            except ProxmoxUnavailableError as e:
+                if isinstance(e.__cause__, CircuitOpenError):
+                    # Fail fast selama Proxmox pulih
+                    raise
+                attempt += 1
+                delay = backoff_delay(
+                    attempt - 1, self.settings.PROXMOX_RETRY_BASE_DELAY, self.settings.PROXMOX_RETRY_MAX_DELAY
+                )
+                if attempt >= self.settings.PROXMOX_RETRY_ATTEMPTS or time.monotonic() + delay >= deadline:
+                    raise
+                PROXMOX_API_RETRIES.inc(endpoint=endpoint)
+                logger.debug("Retrying Proxmox {} in {:.2f}s (attempt {}): {}", endpoint, delay, attempt, e)
+                time.sleep(delay)
+
+    def _ensure_connected(self) -> "ProxmoxAPI":
         """
         Ensure Proxmox connection is active
         
@@ -32,55 +139,99 @@ class ProxmoxService:
             return self.proxmox
 
         try:
-            logger.debug(f"Connecting to Proxmox at {self.settings.PROXMOX_HOST}...")
-            self.proxmox = ProxmoxAPI(
-                self.settings.PROXMOX_HOST,
-                user=self.settings.PROXMOX_USER,
-                password=self.settings.PROXMOX_PASSWORD,
-                verify_ssl=self.settings.PROXMOX_VERIFY_SSL
-            )
+            logger.debug("Connecting to Proxmox at {}...", self.settings.PROXMOX_HOST)
+            # Login juga lewat breaker: saat Proxmox down tidak ada login ulang di tiap request
+            with self._api("login"):
+                proxmox = ProxmoxAPI(
+                    self.settings.PROXMOX_HOST,
+                    user=self.settings.PROXMOX_USER,
+                    password=self.settings.PROXMOX_PASSWORD,
+                    verify_ssl=self.settings.PROXMOX_VERIFY_SSL,
+                    timeout=self.settings.PROXMOX_TIMEOUT,
+                )
             # Verify connection
-            self.proxmox.version.get()
+            self._get("version", proxmox.version.get)
+            self.proxmox = proxmox
             return self.proxmox
+        except ProxmoxUnavailableError as e:
+            self.proxmox = None
+            logger.warning("Proxmox unavailable: {}", e)
+            raise
         except Exception as e:
             self.proxmox = None
-            logger.error(f"Failed to connect to Proxmox: {str(e)}")
+            logger.error("Failed to connect to Proxmox: {}", e)
             raise ProxmoxConnectionError(f"Could not connect to Proxmox: {str(e)}")
 
-    def list_vms(self) -> List[Dict[str, Any]]:
+    def check_connection(self) -> None:
+        """
+        Verifikasi Proxmox masih merespon (dipakai health prober)
+        
+        Raises:
+            ProxmoxConnectionError: If Proxmox is unreachable
+        """
+        proxmox = self._ensure_connected()
+        try:
+            self._get("version", proxmox.version.get)
+        except ProxmoxUnavailableError:
+            self.proxmox = None
+            raise
+        except Exception as e:
+            # Paksa reconnect di call berikutnya (mis. ticket expired)
+            self.proxmox = None
+            raise ProxmoxConnectionError(f"Proxmox not responding: {e}")
+
+    def list_vms(self, strict: bool = False, node: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List semua VM/Container di node
+        
+        Args:
+            strict: Raise instead of skipping a guest type that failed to list.
+                Required by callers that treat a missing VM as deleted (reconciler).
+            node: Node yang di-list, default PROXMOX_NODE
         """
+        node = node or self.node
         try:
             proxmox = self._ensure_connected()
             all_vms = []
             
             # Get QEMU VMs
             try:
-                qemu_vms = proxmox.nodes(self.node).qemu.get()
+                qemu_vms = self._get("qemu/list", proxmox.nodes(node).qemu.get)
                 if qemu_vms:
                     for vm in qemu_vms:
                         vm['type'] = 'qemu'
+                        vm['node'] = node
+                        self._remember_type(vm.get('vmid'), 'qemu', node)
                         all_vms.append(vm)
+            except ProxmoxUnavailableError:
+                raise
             except Exception as e:
-                logger.warning(f"Failed to fetch QEMU VMs: {e}")
+                if strict:
+                    raise
+                logger.warning("Failed to fetch QEMU VMs: {}", e)
 
             # Get LXC Containers
             try:
-                lxc_containers = proxmox.nodes(self.node).lxc.get()
+                lxc_containers = self._get("lxc/list", proxmox.nodes(node).lxc.get)
                 if lxc_containers:
                     for container in lxc_containers:
                         container['type'] = 'lxc'
+                        container['node'] = node
+                        self._remember_type(container.get('vmid'), 'lxc', node)
                         all_vms.append(container)
+            except ProxmoxUnavailableError:
+                raise
             except Exception as e:
-                logger.warning(f"Failed to fetch LXC containers: {e}")
+                if strict:
+                    raise
+                logger.warning("Failed to fetch LXC containers: {}", e)
 
             return all_vms
             
         except ProxmoxConnectionError:
             raise
         except Exception as e:
-            logger.error(f"Unexpected error listing VMs: {e}")
+            logger.error("Unexpected error listing VMs: {}", e)
             raise ProxmoxNodeError(f"Failed to list VMs: {e}")
 
     def create_vm(
@@ -88,87 +239,118 @@ class ProxmoxService:
         level_id: int, 
         team: str, 
         time_limit: int, 
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        vm_type: str = "qemu"
     ) -> VMResult:
         """
-        Membuat VM baru dengan cara clone dari template yang sudah ada
+        Membuat VM (qemu) atau container (lxc) baru dengan cara clone dari template yang sudah ada
         """
         
         team = team.strip()
         time_limit = max(1, time_limit)
+        backend = self._backend(vm_type=vm_type)
         
-        logger.info(f"Cloning VM for team '{team}', level '{level_id}'...")
+        logger.info("Cloning {} guest for team '{}', level '{}'...", backend.vm_type, team, level_id)
         
+        vmid: Optional[int] = None
         try:
             proxmox = self._ensure_connected()
-            vmid = self._get_next_vmid()
+            vmid = self._reserve_vmid()
             vm_name = f"{team}-{level_id}-{vmid}"
 
             # Template dan storage default dari settings (bisa di override via config)
             # TODO: set vmid template
-            template_vmid = int(config.get('template_vmid', getattr(self.settings, 'TEMPLATE_VMID', 0)))
+            template_vmid = int(config.get('template_vmid', getattr(self.settings, backend.template_setting, 0)))
             if not template_vmid:
-                raise VMCreationError("Template VMID tidak ditemukan. Set TEMPLATE_VMID di Settings atau kirim via config.")
+                raise VMCreationError(
+                    f"Template VMID tidak ditemukan. Set {backend.template_setting} di Settings atau kirim via config."
+                )
 
             storage = config.get('storage', getattr(self.settings, 'DEFAULT_STORAGE', 'local-lvm'))
             target_node = config.get('target_node', self.node)
 
-            # Opsi clone
-            clone_opts = {
-                'newid': vmid,
-                'name': vm_name,
-                'target': target_node,
-                'storage': storage,
-                # full=1 untuk full clone (copy disk), 0 untuk linked clone (butuh template template di storage yang sama)
-                'full': int(config.get('full', 1)),
-            }
-
-            # Lakukan clone dari template
-            logger.debug(f"Cloning template VMID {template_vmid} to VMID {vmid} on node {target_node} storage {storage}...")
-            proxmox.nodes(self.node).qemu(template_vmid).clone.post(**clone_opts)
+            # Lakukan clone dari template, tunggu sampai selesai (guest terkunci selama clone)
+            logger.debug("Cloning template VMID {} to VMID {} on node {} storage {}...", template_vmid, vmid, target_node, storage)
+            phases: Dict[str, float] = {}
+            start = time.perf_counter()
+            with self._api(f"{backend.vm_type}/clone"):
+                upid = backend.clone(
+                    proxmox, self.node, template_vmid, vmid, vm_name,
+                    target_node=target_node,
+                    storage=storage,
+                    full=int(config.get('full', 1)),
+                )
+            self.wait_for_task(upid)
+            phases['clone'] = time.perf_counter() - start
+            self._remember_type(vmid, backend.vm_type, target_node)
+            guest = backend.resource(proxmox, target_node, vmid)
+            start = time.perf_counter()
 
             # Optional: apply overrides setelah clone (memory, cores, net)
             memory = config.get('memory', self.settings.DEFAULT_VM_MEMORY)
             cores = config.get('cores', self.settings.DEFAULT_VM_CORES)
-            net0 = config.get('net0', 'virtio,bridge=vmbr0')
 
             try:
-                proxmox.nodes(target_node).qemu(vmid).config.post(
-                    memory=memory,
-                    cores=cores,
-                    net0=net0
-                )
+                with self._api(f"{backend.vm_type}/config"):
+                    backend.apply_config(guest, memory=memory, cores=cores, net0=config.get('net0'))
             except Exception as e:
-                logger.warning(f"Gagal apply config ke VM {vmid}: {e}")
+                logger.warning("Gagal apply config ke VM {}: {}", vmid, e)
+            phases['configure'] = time.perf_counter() - start
 
             # Start VM
+            start = time.perf_counter()
             try:
-                proxmox.nodes(target_node).qemu(vmid).status.start.post()
+                with self._api(f"{backend.vm_type}/start"):
+                    upid = guest.status.start.post()
+                self.wait_for_task(upid)
             except Exception as e:
-                logger.error(f"Failed to start VM {vmid}, rolling back...")
-                proxmox.nodes(target_node).qemu(vmid).delete()
+                logger.error("Failed to start VM {}, rolling back...", vmid)
+                guest.delete()
                 raise VMCreationError(f"Cloned VM but failed to start: {e}")
+            phases['boot'] = time.perf_counter() - start
 
             # Get Info and Return Pydantic Model
-            raw_info = self.get_vm_info(vmid)
+            raw_info = self.get_vm_info(vmid, vm_type=backend.vm_type, node=target_node)
             vm_info = VMInfo(**raw_info)
 
             return VMResult(
                 status="success",
                 vmid=vmid,
-                info=vm_info
+                info=vm_info,
+                vm_type=backend.vm_type,
+                node=target_node,
+                phases=phases
             )
             
+        except ProxmoxUnavailableError:
+            logger.warning("Proxmox unavailable while cloning VM")
+            raise
         except Exception as e:
             logger.exception("Failed to clone VM")
             raise VMCreationError(str(e))
+        finally:
+            if vmid is not None:
+                self._release_vmid(vmid)
+
+    def _reserve_vmid(self) -> int:
+        """
+        Pilih dan reservasi VMID sampai create_vm selesai (sukses atau gagal).
+
+        Daftar VMID cluster dibaca di dalam lock: reservasi baru dilepas setelah task clone
+        selesai, jadi snapshot yang diambil setelahnya pasti sudah memuat guest tersebut.
+        """
+        with self._vmid_lock:
+            vmid = self._get_next_vmid()
+            self._reserved_vmids.add(vmid)
+            return vmid
+
+    def _release_vmid(self, vmid: int) -> None:
+        with self._vmid_lock:
+            self._reserved_vmids.discard(vmid)
 
     def _get_next_vmid(self) -> int:
         """Calculate next available VMID"""
-        all_vms = self.list_vms()
-        # Safe casting: filter first, then cast. 
-        # Using 'or 0' is a fallback for type checker, though logic prevents it.
-        existing_ids = {int(vm.get('vmid', 0)) for vm in all_vms if vm.get('vmid')}
+        existing_ids = self._cluster_vmids() | self._reserved_vmids
         
         start_id = self.settings.STARTING_VMID
         max_id = self.settings.MAX_VMID
@@ -179,34 +361,182 @@ class ProxmoxService:
         
         raise ProxmoxNodeError("No available VMIDs in the configured range")
 
-    def stop_vm(self, vmid: int) -> Dict[str, Any]:
+    def _cluster_vmids(self) -> Set[int]:
+        """
+        VMID yang sudah dipakai di seluruh cluster (cluster/resources). VMID unik se-cluster,
+        jadi guest di node affinity Level juga harus ikut dihitung, bukan hanya PROXMOX_NODE.
+        """
+        proxmox = self._ensure_connected()
+        resources = self._get("cluster/resources", lambda: proxmox.cluster.resources.get(type='vm')) or []
+        return {int(res['vmid']) for res in resources if res.get('vmid') is not None}
+
+    def _remember_type(self, vmid: Any, vm_type: str, node: Optional[str] = None) -> None:
+        if vmid is not None:
+            self._guest_types[int(vmid)] = vm_type
+            if node:
+                self._guest_nodes[int(vmid)] = node
+
+    def _node_for(self, vmid: int, node: Optional[str] = None) -> str:
+        """Node guest: dari argumen (Deployment.node), cache, atau PROXMOX_NODE"""
+        return node or self._guest_nodes.get(vmid) or self.node
+
+    def _task_node(self, upid: str) -> str:
+        """Task berjalan di node yang tercantum di UPID ('UPID:<node>:...')"""
+        parts = upid.split(":")
+        return parts[1] if len(parts) > 2 and parts[0] == "UPID" and parts[1] else self.node
+
+    def _backend(
+        self, vmid: Optional[int] = None, vm_type: Optional[str] = None, node: Optional[str] = None
+    ) -> GuestBackend:
+        """
+        Pilih backend guest. Tanpa vm_type, tipe diambil dari cache
+        atau dideteksi dengan GET status ke tiap backend.
+        """
+        if vm_type is None and vmid is not None:
+            vm_type = self._guest_types.get(vmid) or self._detect_type(vmid, self._node_for(vmid, node))
+        backend = BACKENDS.get(vm_type or "qemu")
+        if backend is None:
+            raise ProxmoxNodeError(f"Unsupported guest type '{vm_type}'")
+        return backend
+
+    def _detect_type(self, vmid: int, node: str) -> str:
+        proxmox = self._ensure_connected()
+        for backend in BACKENDS.values():
+            try:
+                self._get(f"{backend.vm_type}/status", backend.resource(proxmox, node, vmid).status.current.get)
+            except ProxmoxUnavailableError:
+                raise
+            except Exception:
+                continue
+            self._remember_type(vmid, backend.vm_type, node)
+            return backend.vm_type
+        # Tidak ditemukan di kedua tipe, biarkan operasi berikutnya yang melaporkan not found
+        return "qemu"
+
+    def stop_vm(
+        self, vmid: int, vm_type: Optional[str] = None, check_exists: bool = True, node: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Stop a VM/Container by VMID
+
+        Args:
+            check_exists: GET status dulu untuk pesan error yang lebih jelas. StopQueue
+                mematikan ini karena status sudah diambil sekali per batch.
+            node: Node guest (Deployment.node), default dari cache atau PROXMOX_NODE
         
         Raises:
             ProxmoxNodeError: If stopping fails
         """
         try:
             proxmox = self._ensure_connected()
+            node = self._node_for(vmid, node)
+            backend = self._backend(vmid, vm_type, node)
             # Check if VM exists first to provide better error message
             # This implicitly raises ResourceNotFoundError if not found
-            self.get_vm_info(vmid)
+            if check_exists:
+                self.get_vm_info(vmid, vm_type=backend.vm_type, node=node)
             
-            proxmox.nodes(self.node).qemu(vmid).status.stop.post()
-            logger.info(f"VM {vmid} stopped successfully")
+            with self._api(f"{backend.vm_type}/stop"):
+                backend.resource(proxmox, node, vmid).status.stop.post()
+            logger.info("VM {} stopped successfully", vmid)
             return {"success": True, "vmid": vmid}
-        except ResourceNotFoundError:
+        except (ResourceNotFoundError, ProxmoxUnavailableError):
             raise
         except Exception as e:
-            logger.error(f"Failed to stop VM {vmid}: {e}")
+            logger.error("Failed to stop VM {}: {}", vmid, e)
             raise ProxmoxNodeError(f"Failed to stop VM {vmid}: {e}")
 
-    def get_vm_info(self, vmid: int) -> Dict[str, Any]:
+    def get_guest_metrics(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Metrics semua guest di cluster dalam satu request (cluster/resources).
+        VMID unik se-cluster, jadi guest di node affinity Level ikut terbaca.
+
+        Returns:
+            Dict vmid -> resource entry (node, type, status, cpu, mem, netin, netout, ...).
+            netin/netout adalah counter kumulatif dalam bytes.
+        
+        Raises:
+            ProxmoxNodeError: If the request fails
+        """
+        try:
+            proxmox = self._ensure_connected()
+            resources = self._get("cluster/resources", lambda: proxmox.cluster.resources.get(type='vm')) or []
+            metrics = {}
+            for res in resources:
+                if res.get('vmid') is None:
+                    continue
+                metrics[int(res['vmid'])] = dict(res)
+                if res.get('type') in BACKENDS:
+                    self._remember_type(res['vmid'], res['type'], res.get('node'))
+            return metrics
+        except ProxmoxConnectionError:
+            raise
+        except Exception as e:
+            logger.error("Failed to fetch guest metrics: {}", e)
+            raise ProxmoxNodeError(f"Failed to fetch guest metrics: {e}")
+
+    def suspend_vm(self, vmid: int, vm_type: Optional[str] = None, node: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Hibernate VM (suspend to disk): RAM ditulis ke state volume lalu VM dimatikan,
+        sehingga memory host bebas sampai VM di-resume
+        
+        Raises:
+            ProxmoxNodeError: If suspending fails or the guest type does not support it
+        """
+        try:
+            proxmox = self._ensure_connected()
+            node = self._node_for(vmid, node)
+            backend = self._backend(vmid, vm_type, node)
+            if not backend.supports_suspend:
+                raise ProxmoxNodeError(f"Guest type '{backend.vm_type}' does not support suspend to disk")
+            with self._api(f"{backend.vm_type}/suspend"):
+                upid = backend.resource(proxmox, node, vmid).status.suspend.post(todisk=1)
+            self.wait_for_task(upid)
+            logger.info("VM {} suspended to disk", vmid)
+            return {"success": True, "vmid": vmid}
+        except ProxmoxUnavailableError:
+            raise
+        except Exception as e:
+            logger.error("Failed to suspend VM {}: {}", vmid, e)
+            raise ProxmoxNodeError(f"Failed to suspend VM {vmid}: {e}")
+
+    def resume_vm(self, vmid: int, vm_type: Optional[str] = None, node: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resume VM yang di-hibernate. VM hasil suspend-to-disk di-start ulang
+        dan Proxmox otomatis me-restore state RAM-nya
+        
+        Raises:
+            ProxmoxNodeError: If resuming fails
+        """
+        try:
+            proxmox = self._ensure_connected()
+            node = self._node_for(vmid, node)
+            backend = self._backend(vmid, vm_type, node)
+            vm = backend.resource(proxmox, node, vmid)
+            current = self._get(f"{backend.vm_type}/status", vm.status.current.get) or {}
+            if current.get('status') == 'running':
+                if current.get('qmpstatus') == 'paused':
+                    with self._api(f"{backend.vm_type}/resume"):
+                        vm.status.resume.post()
+            else:
+                with self._api(f"{backend.vm_type}/start"):
+                    upid = vm.status.start.post()
+                self.wait_for_task(upid)
+            logger.info("VM {} resumed", vmid)
+            return {"success": True, "vmid": vmid}
+        except ProxmoxUnavailableError:
+            raise
+        except Exception as e:
+            logger.error("Failed to resume VM {}: {}", vmid, e)
+            raise ProxmoxNodeError(f"Failed to resume VM {vmid}: {e}")
+
+    def get_vm_info(self, vmid: int, vm_type: Optional[str] = None, node: Optional[str] = None) -> Dict[str, Any]:
         """
         Get detailed info of a VM/Container by VMID
         
         Args:
             vmid: VMID of the VM/Container
+            node: Node guest, default dari cache atau PROXMOX_NODE
             
         Returns:
             Dict[str, Any]: VM info dictionary
@@ -219,11 +549,80 @@ class ProxmoxService:
             proxmox = self._ensure_connected()
             # 'config.get()' usually raises if VM doesn't exist on the node
             # Cast result to dict to satisfy type checker
-            result = proxmox.nodes(self.node).qemu(vmid).config.get()
+            node = self._node_for(vmid, node)
+            backend = self._backend(vmid, vm_type, node)
+            result = self._get(f"{backend.vm_type}/config", backend.resource(proxmox, node, vmid).config.get)
             if result is None:
                  raise ResourceNotFoundError(f"VM {vmid} returned empty config")
             return dict(result)
+        except ProxmoxUnavailableError:
+            # Proxmox down bukan berarti VM hilang (reconciler/reclaim menganggap not found = terhapus)
+            raise
         except Exception as e:
             # Proxmoxer usually raises generic Exception or HTTPError on 404
-            logger.warning(f"Failed to get info for VM {vmid}: {e}")
-            raise ResourceNotFoundError(f"VM {vmid} not found or inaccessible")
\ No newline at end of file
+            logger.warning("Failed to get info for VM {}: {}", vmid, e)
+            raise ResourceNotFoundError(f"VM {vmid} not found or inaccessible")
+
+    def destroy_vm(self, vmid: int, vm_type: Optional[str] = None, node: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Stop (jika masih running) lalu hapus VM/container beserta disk-nya
+        
+        Raises:
+            ResourceNotFoundError: If VM does not exist
+            ProxmoxNodeError: If destroying fails
+        """
+        try:
+            proxmox = self._ensure_connected()
+            node = self._node_for(vmid, node)
+            backend = self._backend(vmid, vm_type, node)
+            vm = backend.resource(proxmox, node, vmid)
+            try:
+                current = self._get(f"{backend.vm_type}/status", vm.status.current.get)
+            except ProxmoxUnavailableError:
+                raise
+            except Exception:
+                raise ResourceNotFoundError(f"VM {vmid} not found or inaccessible")
+
+            if current and current.get('status') == 'running':
+                with self._api(f"{backend.vm_type}/stop"):
+                    upid = vm.status.stop.post()
+                self.wait_for_task(upid)
+
+            with self._api(f"{backend.vm_type}/delete"):
+                upid = vm.delete(**backend.destroy_params())
+            self.wait_for_task(upid)
+            self._guest_types.pop(vmid, None)
+            self._guest_nodes.pop(vmid, None)
+            logger.info("VM {} destroyed", vmid)
+            return {"success": True, "vmid": vmid, "upid": upid}
+        except (ResourceNotFoundError, ProxmoxUnavailableError):
+            raise
+        except Exception as e:
+            logger.error("Failed to destroy VM {}: {}", vmid, e)
+            raise ProxmoxNodeError(f"Failed to destroy VM {vmid}: {e}")
+
+    def wait_for_task(self, upid: Optional[str], timeout: float = 120, interval: float = 1.0) -> Dict[str, Any]:
+        """
+        Tunggu task Proxmox (UPID) selesai. Status di-poll dari node yang tercantum di UPID.
+        
+        Raises:
+            ProxmoxNodeError: If the task fails or does not finish within timeout
+        """
+        if not upid:
+            return {}
+        with tracer.span("proxmox.wait_task", upid=upid):
+            return self._poll_task(upid, timeout, interval)
+
+    def _poll_task(self, upid: str, timeout: float, interval: float) -> Dict[str, Any]:
+        proxmox = self._ensure_connected()
+        node = self._task_node(upid)
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self._get("tasks/status", proxmox.nodes(node).tasks(upid).status.get)
+            if status and status.get('status') == 'stopped':
+                if status.get('exitstatus') != 'OK':
+                    raise ProxmoxNodeError(f"Task {upid} failed: {status.get('exitstatus')}")
+                return dict(status)
+            if time.monotonic() >= deadline:
+                raise ProxmoxNodeError(f"Task {upid} did not finish within {timeout}s")
+            time.sleep(interval)
@@ -0,0 +1,203 @@
+"""
+Reclamation Queue
+Pipeline background untuk stop + destroy + purge VM dan update lifecycle Deployment
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from config.settings import Settings
+from core.exceptions import ResourceNotFoundError
+from core.logging import logger
+from core.tracing import tracer
+from models import Deployment, DeploymentStatus
+from schemas.types.reclaim_types import ReclaimQueueStats
+from services.proxmox_service import ProxmoxService
+
+
+@dataclass
+class ReclaimJob:
+    """Satu VM yang harus dihapus, opsional terikat ke sebuah Deployment"""
+    vmid: int
+    deployment_id: Optional[int] = None
+    node: Optional[str] = None
+    attempts: int = 0
+
+
+class ReclamationQueue:
+    """
+    Queue destroy VM dengan concurrency terbatas.
+
+    Request path hanya enqueue (O(1), tidak menunggu task Proxmox). RECLAIM_CONCURRENCY
+    worker thread menjalankan destroy_vm, jadi paling banyak sejumlah itu task
+    stop/destroy yang berjalan bersamaan di node. Deployment berpindah
+    TERMINATING -> TERMINATED (VMID/IP dilepas), atau ERROR setelah RECLAIM_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, settings: Settings, proxmox_service: ProxmoxService, session_factory: sessionmaker):
+        self.settings = settings
+        self.proxmox_service = proxmox_service
+        self.session_factory = session_factory
+        self.stats = ReclaimQueueStats()
+        self._queue: "queue.Queue[Optional[ReclaimJob]]" = queue.Queue()
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._timers: Set[threading.Timer] = set()
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._stop.clear()
+        for i in range(max(1, self.settings.RECLAIM_CONCURRENCY)):
+            worker = threading.Thread(target=self._run, name=f"reclaim-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        self.recover()
+        logger.info("Reclamation queue started ({} workers)", len(self._workers))
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            timers, self._timers = self._timers, set()
+        for timer in timers:
+            timer.cancel()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+    def enqueue(self, vmid: int, deployment_id: Optional[int] = None, node: Optional[str] = None) -> bool:
+        """
+        Jadwalkan destroy VM. Tidak blocking.
+
+        Returns:
+            False jika VM tersebut sudah ada di queue
+        """
+        with self._lock:
+            if vmid in self._pending:
+                return False
+            self._pending.add(vmid)
+            self.stats.queued += 1
+        self._queue.put(ReclaimJob(vmid=vmid, deployment_id=deployment_id, node=node))
+        return True
+
+    def recover(self) -> int:
+        """Enqueue ulang Deployment yang tertinggal di TERMINATING (mis. aplikasi restart di tengah destroy)"""
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(Deployment.id, Deployment.vm_id, Deployment.node).where(
+                    Deployment.status == DeploymentStatus.TERMINATING,
+                    Deployment.vm_id.is_not(None),
+                )
+            ).all()
+        finally:
+            db.close()
+        count = sum(1 for deployment_id, vmid, node in rows if self.enqueue(vmid, deployment_id, node))
+        if count:
+            logger.info("Re-queued {} deployments stuck in TERMINATING", count)
+        return count
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def snapshot(self) -> ReclaimQueueStats:
+        with self._lock:
+            return self.stats.model_copy(update={"pending": len(self._pending)})
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None or self._stop.is_set():
+                break
+            try:
+                with tracer.start_trace("reclaim.destroy", vmid=job.vmid, attempt=job.attempts + 1):
+                    self._process(job)
+            except Exception as e:
+                # Jangan sampai worker mati, job dilepas supaya bisa di-enqueue ulang
+                logger.exception("Reclaim job for VM {} crashed: {}", job.vmid, e)
+                self._release(job)
+
+    def _process(self, job: ReclaimJob) -> None:
+        try:
+            self.proxmox_service.destroy_vm(job.vmid, node=job.node)
+        except ResourceNotFoundError:
+            logger.info("VM {} already gone", job.vmid)
+        except Exception as e:
+            job.attempts += 1
+            if job.attempts < self.settings.RECLAIM_MAX_ATTEMPTS and not self._stop.is_set():
+                self._retry_later(job)
+                return
+            logger.error("Giving up destroying VM {} after {} attempts: {}", job.vmid, job.attempts, e)
+            self._mark(job, DeploymentStatus.ERROR, error=str(e))
+            with self._lock:
+                self.stats.failed += 1
+            self._release(job)
+            return
+
+        self._mark(job, DeploymentStatus.TERMINATED)
+        with self._lock:
+            self.stats.destroyed += 1
+        self._release(job)
+
+    def _retry_later(self, job: ReclaimJob) -> None:
+        # Backoff eksponensial; timer supaya worker tidak tertahan selama jeda
+        delay = self.settings.RECLAIM_RETRY_DELAY * (2 ** (job.attempts - 1))
+        logger.warning("Destroying VM {} failed (attempt {}), retrying in {:.0f}s", job.vmid, job.attempts, delay)
+
+        def requeue() -> None:
+            with self._lock:
+                self._timers.discard(timer)
+            if not self._stop.is_set():
+                self._queue.put(job)
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        with self._lock:
+            self._timers.add(timer)
+            self.stats.retried += 1
+        timer.start()
+
+    def _release(self, job: ReclaimJob) -> None:
+        with self._lock:
+            self._pending.discard(job.vmid)
+
+    def _mark(self, job: ReclaimJob, status: DeploymentStatus, error: Optional[str] = None) -> None:
+        if job.deployment_id is None:
+            return
+        db = self.session_factory()
+        try:
+            deployment = db.execute(
+                select(Deployment)
+                .options(joinedload(Deployment.challenge))
+                .where(Deployment.id == job.deployment_id)
+            ).scalars().first()
+            # VMID sudah dilepas/dipakai ulang oleh proses lain (mis. reconciler)
+            if deployment is None or deployment.vm_id != job.vmid:
+                return
+            deployment.status = status
+            if status == DeploymentStatus.TERMINATED:
+                deployment.terminated_at = datetime.utcnow()
+                deployment.vm_id = None
+                deployment.vm_ip = None
+                deployment.error_message = None
+                if deployment.challenge is not None:
+                    deployment.challenge.deactivate()
+            else:
+                deployment.error_message = f"Destroy failed: {error}"
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
@@ -0,0 +1,200 @@
+"""
+Orphan Reconciler
+Membandingkan inventory Proxmox dengan tabel deployments, menghapus VM yatim
+dan melepas VMID/IP milik Deployment yang VM-nya sudah tidak ada
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from config.settings import Settings
+from core.exceptions import ResourceNotFoundError
+from core.logging import logger
+from core.tracing import tracer
+from models import Deployment, DeploymentStatus, Level
+from schemas.types.reclaim_types import ReclaimReport, ReclaimTotals
+from services.proxmox_service import ProxmoxService
+
+
+class OrphanReconciler:
+    """
+    Reconciler periodik untuk VM di range STARTING_VMID..MAX_VMID.
+
+    - VM tanpa Deployment (mis. sisa rollback create_challenge) dihapus setelah
+      ORPHAN_GRACE_SECONDS, dalam batch RECLAIM_BATCH_SIZE dengan jeda
+      RECLAIM_BATCH_INTERVAL supaya task queue node tidak banjir.
+    - Deployment yang VM-nya sudah hilang ditandai TERMINATED, VMID/IP dilepas
+      dan challenge-nya dinonaktifkan.
+
+    Inventory diambil dari semua node yang dipakai: PROXMOX_NODE, node Deployment
+    dan node affinity Level (VM yatim bisa tertinggal di node affinity).
+    """
+
+    def __init__(self, settings: Settings, proxmox_service: ProxmoxService, session_factory: sessionmaker):
+        self.settings = settings
+        self.proxmox_service = proxmox_service
+        self.session_factory = session_factory
+        self.last_report: Optional[ReclaimReport] = None
+        self.totals = ReclaimTotals()
+        self._first_seen: Dict[int, float] = {}
+        self._pass_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.settings.ORPHAN_RECONCILE_ENABLED or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="orphan-reconciler", daemon=True)
+        self._thread.start()
+        logger.info("Orphan reconciler started (interval {}s)", self.settings.ORPHAN_RECONCILE_INTERVAL)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def trigger(self) -> None:
+        """Jalankan pass berikutnya sekarang tanpa menunggu interval"""
+        self._wake.set()
+
+    @property
+    def running(self) -> bool:
+        return self._pass_lock.locked()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.settings.ORPHAN_RECONCILE_INTERVAL)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                with tracer.start_trace("orphan.reconcile"):
+                    self.reconcile()
+            except Exception as e:
+                logger.error("Orphan reconcile pass failed: {}", e)
+
+    def reconcile(self, dry_run: bool = False) -> ReclaimReport:
+        """
+        Run one reconcile pass.
+
+        Args:
+            dry_run: Only report what would be destroyed/released
+        """
+        with self._pass_lock:
+            report = ReclaimReport(started_at=datetime.utcnow(), dry_run=dry_run)
+            db = self.session_factory()
+            try:
+                # Baca DB dulu baru inventory: VM yang dibuat di antaranya jatuh ke grace period,
+                # bukan salah dianggap hilang
+                tracked = db.execute(
+                    select(Deployment)
+                    .options(joinedload(Deployment.challenge))
+                    .where(
+                        Deployment.vm_id.is_not(None),
+                        Deployment.status != DeploymentStatus.TERMINATED,
+                    )
+                ).scalars().all()
+                known = {d.vm_id for d in tracked}
+
+                inventory = {
+                    int(vm['vmid']): vm
+                    for node in sorted(self._nodes_in_use(db, tracked))
+                    for vm in self.proxmox_service.list_vms(strict=True, node=node)
+                    if vm.get('vmid') is not None
+                    and self.settings.STARTING_VMID <= int(vm['vmid']) < self.settings.MAX_VMID
+                    and not vm.get('template')
+                }
+                report.scanned = len(inventory)
+
+                self._release_stale(db, tracked, inventory, report)
+                if not dry_run:
+                    db.commit()
+
+                orphans = self._select_orphans([vmid for vmid in inventory if vmid not in known], report)
+                if not dry_run:
+                    self._destroy(orphans, inventory, report)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            report.finished_at = datetime.utcnow()
+            if not dry_run:
+                self._accumulate(report)
+            self.last_report = report
+
+        logger.info(
+            "Reconcile pass: scanned={} orphans={} destroyed={} failed={} released={} reclaimed={}B",
+            report.scanned, len(report.orphans), len(report.destroyed), len(report.failed),
+            report.released_deployments, report.reclaimed_bytes,
+        )
+        return report
+
+    def _nodes_in_use(self, db, tracked: List[Deployment]) -> Set[str]:
+        nodes = {self.settings.PROXMOX_NODE}
+        nodes.update(d.node for d in tracked if d.node)
+        nodes.update(node for node in db.execute(select(Level.node).where(Level.node.is_not(None))).scalars() if node)
+        return nodes
+
+    def _release_stale(self, db, tracked: List[Deployment], inventory: Dict[int, dict], report: ReclaimReport) -> None:
+        for deployment in tracked:
+            if deployment.vm_id in inventory:
+                continue
+            logger.warning("VM {} of deployment {} no longer exists, releasing", deployment.vm_id, deployment.id)
+            report.released_deployments += 1
+            if deployment.vm_ip:
+                report.released_ips += 1
+            if report.dry_run:
+                continue
+            deployment.status = DeploymentStatus.TERMINATED
+            deployment.terminated_at = datetime.utcnow()
+            deployment.vm_id = None
+            deployment.vm_ip = None
+            if deployment.challenge is not None:
+                deployment.challenge.deactivate()
+
+    def _select_orphans(self, candidates: List[int], report: ReclaimReport) -> List[int]:
+        now = time.monotonic()
+        # Lupakan VMID yang sudah bukan kandidat (sudah punya Deployment atau sudah hilang)
+        self._first_seen = {vmid: self._first_seen.get(vmid, now) for vmid in candidates}
+        for vmid in sorted(candidates):
+            if now - self._first_seen[vmid] >= self.settings.ORPHAN_GRACE_SECONDS:
+                report.orphans.append(vmid)
+            else:
+                report.pending_grace.append(vmid)
+        return report.orphans
+
+    def _destroy(self, orphans: List[int], inventory: Dict[int, dict], report: ReclaimReport) -> None:
+        batch_size = max(1, self.settings.RECLAIM_BATCH_SIZE)
+        for start in range(0, len(orphans), batch_size):
+            if start and self._stop.wait(self.settings.RECLAIM_BATCH_INTERVAL):
+                break
+            for vmid in orphans[start:start + batch_size]:
+                try:
+                    self.proxmox_service.destroy_vm(vmid, node=inventory[vmid].get('node'))
+                    report.reclaimed_bytes += int(inventory[vmid].get('maxdisk') or 0)
+                except ResourceNotFoundError:
+                    pass # Sudah dihapus pihak lain
+                except Exception as e:
+                    logger.error("Failed to destroy orphan VM {}: {}", vmid, e)
+                    report.failed.append(vmid)
+                    continue
+                report.destroyed.append(vmid)
+                self._first_seen.pop(vmid, None)
+
+    def _accumulate(self, report: ReclaimReport) -> None:
+        self.totals.passes += 1
+        self.totals.destroyed += len(report.destroyed)
+        self.totals.released_deployments += report.released_deployments
+        self.totals.released_ips += report.released_ips
+        self.totals.reclaimed_bytes += report.reclaimed_bytes
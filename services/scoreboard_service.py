@@ -0,0 +1,174 @@
+"""
+Scoreboard Service
+Scoreboard in-memory yang di-update secara incremental setiap kali flag benar di-submit
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sortedcontainers import SortedList
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Challenge, Level
+from core.logging import logger
+from schemas.types.scoreboard_types import ScoreboardEntry, FirstBlood, ScoreUpdate
+
+
+@dataclass
+class _TeamScore:
+    team: str
+    score: int = 0
+    solves: int = 0
+    last_solve_at: Optional[datetime] = None
+
+    @property
+    def sort_key(self) -> Tuple[int, float, str]:
+        # Higher score first, earlier last solve breaks ties, team name keeps keys unique
+        last = self.last_solve_at.timestamp() if self.last_solve_at else 0.0
+        return (-self.score, last, self.team)
+
+
+class Scoreboard:
+    """
+    Scoreboard yang disimpan di memory.
+
+    Ranking disimpan di SortedList sehingga update dan lookup rank cukup O(log n),
+    tanpa scan tabel challenges. State dibangun ulang dari DB saat startup.
+
+    State ini per proses: hanya proses yang menerima solve yang melihat update-nya,
+    karena itu platform dijalankan sebagai satu proses (lihat core.instance_lock).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._teams: Dict[str, _TeamScore] = {}
+        self._ranking: SortedList = SortedList()
+        self._solved: Set[Tuple[str, int]] = set()
+        self._first_bloods: Dict[int, FirstBlood] = {}
+        self._listeners: List[Callable[[ScoreUpdate], None]] = []
+
+    def add_listener(self, callback: Callable[[ScoreUpdate], None]) -> None:
+        """Register callback yang dipanggil untuk setiap perubahan scoreboard (live solve saja)"""
+        self._listeners.append(callback)
+
+    def record_solve(self, team: str, level_id: int, points: int, solved_at: datetime) -> Optional[ScoreUpdate]:
+        """
+        Apply a single solve to the scoreboard and notify listeners.
+
+        Returns:
+            ScoreUpdate describing the change, or None if this (team, level) was already counted
+        """
+        update = self._apply(team, level_id, points, solved_at)
+        if update is not None:
+            for callback in self._listeners:
+                try:
+                    callback(update)
+                except Exception as e:
+                    logger.error("Scoreboard listener failed: {}", e)
+        return update
+
+    def _apply(self, team: str, level_id: int, points: int, solved_at: datetime) -> Optional[ScoreUpdate]:
+        with self._lock:
+            if (team, level_id) in self._solved:
+                return None
+            self._solved.add((team, level_id))
+
+            entry = self._teams.get(team)
+            previous_rank: Optional[int] = None
+            if entry is None:
+                entry = _TeamScore(team=team)
+                self._teams[team] = entry
+            else:
+                previous_rank = self._ranking.index(entry.sort_key) + 1
+                self._ranking.remove(entry.sort_key)
+
+            entry.score += points
+            entry.solves += 1
+            if entry.last_solve_at is None or solved_at > entry.last_solve_at:
+                entry.last_solve_at = solved_at
+            self._ranking.add(entry.sort_key)
+
+            first_blood = level_id not in self._first_bloods
+            if first_blood:
+                self._first_bloods[level_id] = FirstBlood(level_id=level_id, team=team, solved_at=solved_at)
+
+            return ScoreUpdate(
+                team=team,
+                level_id=level_id,
+                points=points,
+                score=entry.score,
+                rank=self._ranking.index(entry.sort_key) + 1,
+                previous_rank=previous_rank,
+                first_blood=first_blood,
+                solved_at=solved_at,
+            )
+
+    def standings(self, offset: int = 0, limit: Optional[int] = None) -> List[ScoreboardEntry]:
+        """Return the ranked standings, optionally sliced"""
+        with self._lock:
+            stop = None if limit is None else offset + limit
+            return [
+                self._to_entry(offset + i + 1, self._teams[key[2]])
+                for i, key in enumerate(self._ranking.islice(offset, stop))
+            ]
+
+    def get_team(self, team: str) -> Optional[ScoreboardEntry]:
+        """Return a single team's position, or None if it has not scored yet"""
+        with self._lock:
+            entry = self._teams.get(team)
+            if entry is None:
+                return None
+            return self._to_entry(self._ranking.index(entry.sort_key) + 1, entry)
+
+    def first_bloods(self) -> List[FirstBlood]:
+        with self._lock:
+            return sorted(self._first_bloods.values(), key=lambda fb: fb.level_id)
+
+    def total_teams(self) -> int:
+        with self._lock:
+            return len(self._ranking)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._teams.clear()
+            self._ranking.clear()
+            self._solved.clear()
+            self._first_bloods.clear()
+
+    def rebuild_from_db(self, db: Session) -> int:
+        """
+        Rebuild scoreboard state from submitted challenges.
+
+        Returns:
+            int: Number of solves loaded
+        """
+        stmt = (
+            select(Challenge.team, Challenge.level_id, Level.points, Challenge.flag_submitted_at)
+            .join(Level, Challenge.level_id == Level.id)
+            .where(Challenge.flag_submitted.is_(True))
+            .order_by(Challenge.flag_submitted_at, Challenge.id)
+        )
+        rows = db.execute(stmt).all()
+
+        with self._lock:
+            self.reset()
+            loaded = 0
+            for team, level_id, points, solved_at in rows:
+                if self._apply(team, level_id, points, solved_at or datetime.fromtimestamp(0)) is not None:
+                    loaded += 1
+
+        logger.info("Scoreboard rebuilt: {} solves, {} teams", loaded, self.total_teams())
+        return loaded
+
+    @staticmethod
+    def _to_entry(rank: int, entry: _TeamScore) -> ScoreboardEntry:
+        return ScoreboardEntry(
+            rank=rank,
+            team=entry.team,
+            score=entry.score,
+            solves=entry.solves,
+            last_solve_at=entry.last_solve_at,
+        )
@@ -0,0 +1,233 @@
+"""
+Stop Queue
+Worker background untuk stop VM setelah flag benar: submit cukup commit lalu enqueue,
+stop ke Proxmox dan update Deployment (STOPPED, stopped_at) dikerjakan di sini.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from config.settings import Settings
+from core.exceptions import ResourceNotFoundError
+from core.logging import logger
+from core.tracing import tracer
+from models import Challenge, Deployment, DeploymentStatus
+from schemas.types.reclaim_types import StopQueueStats
+from services.proxmox_service import ProxmoxService
+
+
+@dataclass
+class StopJob:
+    vmid: int
+    deployment_id: Optional[int] = None
+    vm_type: Optional[str] = None
+    node: Optional[str] = None
+    attempts: int = 0
+    # time.monotonic() paling cepat job boleh diproses (backoff retry)
+    not_before: float = 0.0
+
+
+class StopQueue:
+    """
+    Queue stop VM yang di-batch dan di-dedup per VMID.
+
+    Satu worker mengumpulkan job selama STOP_BATCH_WINDOW (maks STOP_BATCH_SIZE),
+    lalu untuk satu batch:
+    1. satu call cluster/resources untuk status semua VM (ganti get_vm_info per VM)
+    2. stop hanya VM yang masih running, tanpa cek ulang per VM
+    3. satu transaksi DB untuk semua Deployment yang berhasil di-stop
+    Stop yang gagal di-retry dengan backoff sampai STOP_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, settings: Settings, proxmox_service: ProxmoxService, session_factory: sessionmaker):
+        self.settings = settings
+        self.proxmox_service = proxmox_service
+        self.session_factory = session_factory
+        self.stats = StopQueueStats()
+        self._jobs: Dict[int, StopJob] = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="vm-stop", daemon=True)
+        self._worker.start()
+        self.recover()
+        logger.info("Stop queue started")
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+        self._worker = None
+
+    def enqueue(
+        self, vmid: int, deployment_id: Optional[int] = None, vm_type: Optional[str] = None, node: Optional[str] = None
+    ) -> bool:
+        """
+        Jadwalkan stop VM. Tidak blocking.
+
+        Returns:
+            False jika VM tersebut sudah ada di queue
+        """
+        with self._cond:
+            if vmid in self._jobs:
+                self.stats.deduplicated += 1
+                return False
+            self._jobs[vmid] = StopJob(vmid=vmid, deployment_id=deployment_id, vm_type=vm_type, node=node)
+            self.stats.queued += 1
+            self._cond.notify()
+        return True
+
+    def recover(self) -> int:
+        """Enqueue ulang challenge yang sudah solved tapi VM-nya belum di-stop (mis. restart sebelum batch jalan)"""
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(Deployment.id, Deployment.vm_id, Deployment.vm_type, Deployment.node)
+                .join(Challenge, Challenge.id == Deployment.challenge_id)
+                .where(
+                    Challenge.flag_submitted.is_(True),
+                    Deployment.status == DeploymentStatus.RUNNING,
+                    Deployment.vm_id.is_not(None),
+                )
+            ).all()
+        finally:
+            db.close()
+        count = sum(
+            1 for deployment_id, vmid, vm_type, node in rows if self.enqueue(vmid, deployment_id, vm_type, node)
+        )
+        if count:
+            logger.info("Re-queued {} solved deployments still running", count)
+        return count
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def snapshot(self) -> StopQueueStats:
+        with self._cond:
+            return self.stats.model_copy(update={"pending": len(self._jobs)})
+
+    # --- Worker ---
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                with tracer.start_trace("stop_queue.batch", size=len(batch)):
+                    self.process_batch(batch)
+            except Exception as e:
+                # Jangan sampai worker mati; batch di-retry
+                logger.exception("Stop batch of {} VMs crashed: {}", len(batch), e)
+                self._retry(batch, e)
+
+    def _next_batch(self) -> List[StopJob]:
+        """Tunggu job siap, lalu linger STOP_BATCH_WINDOW supaya submit lain ikut batch yang sama"""
+        with self._cond:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if any(job.not_before <= now for job in self._jobs.values()):
+                    break
+                # Job yang sedang diproses punya not_before = inf
+                waits = [job.not_before - now for job in self._jobs.values() if job.not_before != float("inf")]
+                self._cond.wait(timeout=min(waits) if waits else None)
+            else:
+                return []
+        if self.settings.STOP_BATCH_WINDOW > 0:
+            self._stop.wait(self.settings.STOP_BATCH_WINDOW)
+        with self._cond:
+            now = time.monotonic()
+            ready = [job for job in self._jobs.values() if job.not_before <= now]
+            batch = ready[: max(1, self.settings.STOP_BATCH_SIZE)]
+            for job in batch:
+                # Tetap tercatat di _jobs (dedup) tapi tidak diambil batch lain selama diproses
+                job.not_before = float("inf")
+            return batch
+
+    def process_batch(self, batch: List[StopJob]) -> None:
+        statuses = self.proxmox_service.get_guest_metrics()
+        stopped: List[StopJob] = []
+        failed: List[StopJob] = []
+        errors: Dict[int, Exception] = {}
+        for job in batch:
+            resource = statuses.get(job.vmid)
+            if resource is None or resource.get("status") == "stopped":
+                # Sudah mati/terhapus, cukup update DB
+                stopped.append(job)
+                continue
+            try:
+                self.proxmox_service.stop_vm(
+                    job.vmid,
+                    vm_type=job.vm_type or resource.get("type"),
+                    check_exists=False,
+                    node=resource.get("node") or job.node,
+                )
+                stopped.append(job)
+            except ResourceNotFoundError:
+                stopped.append(job)
+            except Exception as e:
+                errors[job.vmid] = e
+                failed.append(job)
+
+        self._mark_stopped(stopped)
+        with self._cond:
+            for job in stopped:
+                self._jobs.pop(job.vmid, None)
+            self.stats.stopped += len(stopped)
+            self.stats.batches += 1
+        for job in failed:
+            self._retry([job], errors[job.vmid])
+        logger.info("Stop batch done: {} stopped, {} failed", len(stopped), len(failed))
+
+    def _retry(self, jobs: List[StopJob], error: Exception) -> None:
+        with self._cond:
+            for job in jobs:
+                job.attempts += 1
+                if job.attempts >= self.settings.STOP_MAX_ATTEMPTS or self._stop.is_set():
+                    logger.error("Giving up stopping VM {} after {} attempts: {}", job.vmid, job.attempts, error)
+                    self._jobs.pop(job.vmid, None)
+                    self.stats.failed += 1
+                    continue
+                # Backoff eksponensial
+                delay = self.settings.STOP_RETRY_DELAY * (2 ** (job.attempts - 1))
+                job.not_before = time.monotonic() + delay
+                self.stats.retried += 1
+            self._cond.notify()
+
+    def _mark_stopped(self, jobs: List[StopJob]) -> None:
+        ids = [job.deployment_id for job in jobs if job.deployment_id is not None]
+        if not ids:
+            return
+        vmids = {job.deployment_id: job.vmid for job in jobs}
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            deployments = db.execute(select(Deployment).where(Deployment.id.in_(ids))).scalars().all()
+            for deployment in deployments:
+                # Jangan timpa transisi lain (terminate/expiry) yang terjadi selama stop di queue
+                if deployment.vm_id != vmids[deployment.id] or deployment.status not in (
+                    DeploymentStatus.RUNNING, DeploymentStatus.SUSPENDED,
+                ):
+                    continue
+                deployment.status = DeploymentStatus.STOPPED
+                deployment.stopped_at = now
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
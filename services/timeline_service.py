@@ -0,0 +1,112 @@
+"""
+Deployment Timeline
+Mencatat durasi tiap fase provisioning dan menghitung percentile latency per fase
+"""
+
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import DeploymentPhase
+from schemas.types.timeline_types import PhaseLatency
+
+# Urutan fase di laporan
+PHASE_ORDER = ("admission", "clone", "configure", "boot", "ansible", "db", "total")
+
+
+class PhaseTimer:
+    """Stopwatch untuk fase-fase satu provisioning, disimpan setelah Deployment dibuat"""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, datetime, int]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at, time.perf_counter() - start)
+
+    def record(self, name: str, started_at: datetime, seconds: float) -> None:
+        """Tambah satu fase yang durasinya (detik) diukur sendiri oleh caller, mis. total provisioning"""
+        self.phases.append((name, started_at, int(seconds * 1000)))
+
+    def add_sequence(self, started_at: datetime, durations: Dict[str, float]) -> None:
+        """Tambah sub-fase berurutan (detik) yang diukur di tempat lain, mis. VMResult.phases"""
+        for name, seconds in durations.items():
+            self.record(name, started_at, seconds)
+            started_at += timedelta(seconds=seconds)
+
+    def to_rows(self, level_id: Optional[int], node: Optional[str]) -> List[DeploymentPhase]:
+        return [
+            DeploymentPhase(phase=name, started_at=started_at, duration_ms=ms, level_id=level_id, node=node)
+            for name, started_at, ms in self.phases
+        ]
+
+
+def percentile(sorted_values: Sequence[int], pct: float) -> int:
+    """Nearest-rank percentile dari list yang sudah terurut"""
+    if not sorted_values:
+        return 0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class TimelineService:
+    """Laporan latency provisioning dari tabel deployment_phases"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def latency_report(
+        self,
+        window_seconds: int,
+        level_id: Optional[int] = None,
+        node: Optional[str] = None,
+    ) -> List[PhaseLatency]:
+        """
+        p50/p90/p99 per (fase, level, node) untuk provisioning dalam window terakhir.
+        """
+        since = datetime.utcnow() - timedelta(seconds=window_seconds)
+        stmt = select(
+            DeploymentPhase.phase,
+            DeploymentPhase.level_id,
+            DeploymentPhase.node,
+            DeploymentPhase.duration_ms,
+        ).where(DeploymentPhase.started_at >= since)
+        if level_id is not None:
+            stmt = stmt.where(DeploymentPhase.level_id == level_id)
+        if node is not None:
+            stmt = stmt.where(DeploymentPhase.node == node)
+
+        groups: Dict[Tuple[str, Optional[int], Optional[str]], List[int]] = defaultdict(list)
+        for phase, row_level, row_node, duration_ms in self.db.execute(stmt):
+            groups[(phase, row_level, row_node)].append(duration_ms)
+
+        def sort_key(key):
+            phase, row_level, row_node = key
+            order = PHASE_ORDER.index(phase) if phase in PHASE_ORDER else len(PHASE_ORDER)
+            return (row_level or 0, row_node or "", order, phase)
+
+        report = []
+        for key in sorted(groups, key=sort_key):
+            values = sorted(groups[key])
+            report.append(PhaseLatency(
+                phase=key[0],
+                level_id=key[1],
+                node=key[2],
+                count=len(values),
+                p50_ms=percentile(values, 50),
+                p90_ms=percentile(values, 90),
+                p99_ms=percentile(values, 99),
+                max_ms=values[-1],
+            ))
+        return report
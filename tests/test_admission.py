@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from core.exceptions import DeploymentQueueFullError, DeploymentQueueTimeoutError
+from core.executors import ExecutorLane
+from services.admission_controller import AdmissionController
+
+
+def _settings(**overrides):
+    values = dict(
+        MAX_CONCURRENT_DEPLOYMENTS=2,
+        MAX_CONCURRENT_DEPLOYMENTS_PER_NODE=0,
+        DEPLOYMENT_QUEUE_SIZE=2,
+        DEPLOYMENT_QUEUE_TIMEOUT=5,
+        DEPLOYMENT_ESTIMATE_SECONDS=60,
+        DEPLOYMENT_QUEUE_PER_TEAM=0,
+        DEPLOYMENT_PRIORITY_BURST=3,
+        DEPLOYMENT_RETRY_WINDOW=900,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _acquire_in_thread(controller, node, results, timeout=None, **kwargs):
+    def run():
+        try:
+            results.append(controller.acquire(node, timeout=timeout, **kwargs))
+        except Exception as e:
+            results.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def _wait_queued(controller, count):
+    deadline = time.monotonic() + 2
+    while controller.queued_count() != count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_global_limit_queues_then_admits_fifo():
+    controller = AdmissionController(_settings())
+    first = controller.acquire("pve")
+    second = controller.acquire("pve")
+    assert controller.stats()["active"] == 2
+
+    results = []
+    waiter = _acquire_in_thread(controller, "pve", results)
+    _wait_queued(controller, 1)
+    assert controller.estimated_wait() == 60  # 1 antri, kapasitas 2 -> selesai di gelombang pertama
+
+    controller.release(first)
+    waiter.join(timeout=2)
+    assert results and results[0].node == "pve"
+    assert controller.stats()["active"] == 2
+    controller.release(second)
+    controller.release(results[0])
+    assert controller.stats()["active"] == 0
+
+
+def test_queue_full_is_rejected_with_retry_after():
+    controller = AdmissionController(_settings(MAX_CONCURRENT_DEPLOYMENTS=1, DEPLOYMENT_QUEUE_SIZE=1))
+    held = controller.acquire("pve")
+    results = []
+    waiter = _acquire_in_thread(controller, "pve", results)
+    _wait_queued(controller, 1)
+
+    with pytest.raises(DeploymentQueueFullError) as exc:
+        controller.acquire("pve")
+    assert not isinstance(exc.value, DeploymentQueueTimeoutError)
+    assert exc.value.retry_after == 120
+    assert controller.stats()["rejected"] == 1
+
+    controller.release(held)
+    waiter.join(timeout=2)
+    controller.release(results[0])
+
+
+def test_queue_timeout_raises_503_error():
+    controller = AdmissionController(_settings(MAX_CONCURRENT_DEPLOYMENTS=1))
+    held = controller.acquire("pve")
+    with pytest.raises(DeploymentQueueTimeoutError) as exc:
+        controller.acquire("pve", timeout=0.05)
+    assert exc.value.retry_after >= 1
+    assert controller.queued_count() == 0
+    assert controller.stats()["timed_out"] == 1
+    controller.release(held)
+
+
+def test_per_node_limit_does_not_block_other_nodes():
+    controller = AdmissionController(_settings(MAX_CONCURRENT_DEPLOYMENTS=3, MAX_CONCURRENT_DEPLOYMENTS_PER_NODE=1))
+    held = controller.acquire("pve1")
+
+    results = []
+    blocked = _acquire_in_thread(controller, "pve1", results, timeout=2)
+    _wait_queued(controller, 1)
+    # Waiter pve1 di depan antrian tidak menahan request untuk node lain
+    other = controller.acquire("pve2", timeout=0.5)
+    assert other.node == "pve2"
+    assert controller.queued_count() == 1
+
+    controller.release(held)
+    blocked.join(timeout=2)
+    assert results[0].node == "pve1"
+    controller.release(results[0])
+    controller.release(other)
+
+
+def test_duration_estimate_follows_completed_provisioning():
+    controller = AdmissionController(_settings(MAX_CONCURRENT_DEPLOYMENTS=1, DEPLOYMENT_ESTIMATE_SECONDS=100))
+    ticket = controller.acquire("pve")
+    ticket.admitted_at -= 10  # provisioning "selesai" dalam 10 detik
+    controller.release(ticket)
+    assert controller.stats()["avg_duration_s"] == pytest.approx(82.0, abs=0.1)
+
+
+def test_router_maps_admission_errors_to_429_and_503():
+    from api.routers import challenges
+    from schemas.requests import CreateChallengeRequest
+
+    class Service:
+        def __init__(self, error):
+            self.error = error
+
+        def create_challenge(self, *args, **kwargs):
+            raise self.error
+
+    request = CreateChallengeRequest(level_id=1, team_name="t")
+    lane = ExecutorLane("test", 1, 1)
+    for error, status in (
+        (DeploymentQueueFullError("full", retry_after=42), 429),
+        (DeploymentQueueTimeoutError("slow", retry_after=7), 503),
+    ):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(challenges.create_challenge(request, Service(error), lane, SimpleNamespace(status_code=201), None))
+        assert exc.value.status_code == status
+        assert exc.value.headers["Retry-After"] == str(error.retry_after)
+
+
+def _drain_order(controller, held, results, count):
+    """Lepas slot satu per satu dan catat urutan team/lane yang di-admit"""
+    order = []
+    current = held
+    for _ in range(count):
+        before = set(id(t) for t in results)
+        controller.release(current)
+        deadline = time.monotonic() + 2
+        while len(results) == len(before):
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        current = next(t for t in results if id(t) not in before)
+        order.append((current.team, current.lane))
+    controller.release(current)
+    return order
+
+
+def _enqueue(controller, results, threads, team, **kwargs):
+    queued = controller.queued_count()
+    threads.append(_acquire_in_thread(controller, "pve", results, team=team, **kwargs))
+    _wait_queued(controller, queued + 1)
+
+
+def test_round_robin_across_teams():
+    controller = AdmissionController(_settings(MAX_CONCURRENT_DEPLOYMENTS=1, DEPLOYMENT_QUEUE_SIZE=10))
+    held = controller.acquire("pve", team="x")
+    results, threads = [], []
+    # Team a menembak 3 level sekaligus, team b dan c datang belakangan
+    for _ in range(3):
+        _enqueue(controller, results, threads, "a")
+    _enqueue(controller, results, threads, "b")
+    _enqueue(controller, results, threads, "c")
+    assert controller.estimated_wait(team="d") == 3 * 60 + 60
+
+    order = [team for team, _ in _drain_order(controller, held, results, 5)]
+    assert order == ["a", "b", "c", "a", "a"]
+    for thread in threads:
+        thread.join(timeout=2)
+
+
+def test_priority_lanes_with_burst_limit():
+    controller = AdmissionController(_settings(
+        MAX_CONCURRENT_DEPLOYMENTS=1, DEPLOYMENT_QUEUE_SIZE=10, DEPLOYMENT_PRIORITY_BURST=2,
+    ))
+    failed = controller.acquire("pve", team="r", slot="r:1")
+    controller.release(failed, failed=True)
+
+    held = controller.acquire("pve", team="x")
+    results, threads = [], []
+    _enqueue(controller, results, threads, "n1")
+    _enqueue(controller, results, threads, "n2")
+    _enqueue(controller, results, threads, "s1", redeploy=True)
+    _enqueue(controller, results, threads, "s2", redeploy=True)
+    _enqueue(controller, results, threads, "r", slot="r:1")
+    assert controller.stats()["queued_retry"] == 1
+
+    order = _drain_order(controller, held, results, 5)
+    # retry > reset, tapi lane normal dapat giliran setelah 2 admit prioritas
+    assert order == [("r", "retry"), ("s1", "reset"), ("n1", "normal"), ("s2", "reset"), ("n2", "normal")]
+    for thread in threads:
+        thread.join(timeout=2)
+
+
+def test_per_team_queue_quota():
+    controller = AdmissionController(_settings(
+        MAX_CONCURRENT_DEPLOYMENTS=1, DEPLOYMENT_QUEUE_SIZE=10, DEPLOYMENT_QUEUE_PER_TEAM=1,
+    ))
+    held = controller.acquire("pve", team="a")
+    results, threads = [], []
+    _enqueue(controller, results, threads, "a")
+    with pytest.raises(DeploymentQueueFullError, match="team 'a'"):
+        controller.acquire("pve", team="a", timeout=0.01)
+    # Team lain masih boleh antri
+    _enqueue(controller, results, threads, "b")
+
+    assert [team for team, _ in _drain_order(controller, held, results, 2)] == ["a", "b"]
+    for thread in threads:
+        thread.join(timeout=2)
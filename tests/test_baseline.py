@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from benchmarks import baseline as bl
+
+
+def _result(p50=10.0, rps=100.0, error_rate=0.0, elapsed=5.0):
+    return {
+        "options": {"teams": 10},
+        "phases": {
+            "herd": {
+                "elapsed_s": elapsed,
+                "endpoints": {"POST /api/challenges": {
+                    "p50_ms": p50, "p90_ms": p50 * 2, "p99_ms": p50 * 3,
+                    "error_rate": error_rate, "rps": rps, "count": 100,
+                }},
+            },
+        },
+    }
+
+
+def test_no_regression_within_noise():
+    base = bl.build_baseline("herd", [_result(p50=10.0), _result(p50=10.5), _result(p50=9.5)])
+    comparisons = bl.compare(base, [_result(p50=10.8)])
+    assert comparisons
+    assert not any(c.regression for c in comparisons)
+
+
+def test_latency_regression_named_by_scenario_and_metric():
+    base = bl.build_baseline("herd", [_result(p50=10.0), _result(p50=10.2)])
+    comparisons = bl.compare(base, [_result(p50=20.0)])
+    regressed = {(c.scenario, c.endpoint, c.metric) for c in comparisons if c.regression}
+    assert ("herd", "POST /api/challenges", "p50_ms") in regressed
+
+    report = bl.format_comparison(base, comparisons, [])
+    assert "REGRESSION" in report
+    assert "[herd] POST /api/challenges p50_ms: 10.1 -> 20" in report
+
+
+def test_noisy_baseline_widens_limit():
+    # stddev besar -> perubahan 30% masih dalam noise
+    base = bl.build_baseline("herd", [_result(p50=5.0), _result(p50=15.0), _result(p50=10.0)])
+    p50 = [c for c in bl.compare(base, [_result(p50=13.0)]) if c.metric == "p50_ms"][0]
+    assert not p50.regression
+    assert p50.limit > 13.0 - 10.0
+
+
+def test_throughput_drop_and_error_rate_are_regressions():
+    base = bl.build_baseline("herd", [_result()])
+    comparisons = bl.compare(base, [_result(rps=50.0, error_rate=0.2)])
+    regressed = {c.metric for c in comparisons if c.regression}
+    assert {"rps", "error_rate"} <= regressed
+    # Throughput naik bukan regresi
+    assert not any(c.regression for c in bl.compare(base, [_result(rps=500.0)]) if c.metric == "rps")
+
+
+def test_save_resolve_and_cli_exit_code(tmp_path):
+    run = tmp_path / "run.json"
+    run.write_text(json.dumps(_result()))
+    slow = tmp_path / "slow.json"
+    slow.write_text(json.dumps(_result(p50=50.0, elapsed=10.0)))
+
+    assert bl.main(["--dir", str(tmp_path / "b"), "save", str(run), "--name", "herd"]) == 0
+    path = bl.resolve_baseline("herd", str(tmp_path / "b"))
+    assert bl.load_baseline(path)["format_version"] == bl.FORMAT_VERSION
+
+    assert bl.main(["--dir", str(tmp_path / "b"), "compare", "herd", str(run)]) == 0
+    report = tmp_path / "report.json"
+    assert bl.main(["--dir", str(tmp_path / "b"), "compare", "herd", str(slow), "--json", str(report)]) == 1
+    data = json.loads(report.read_text())
+    assert any(c["regression"] and c["metric"] == "elapsed_s" for c in data["comparisons"])
+
+
+def test_missing_endpoint_and_unknown_format(tmp_path):
+    base = bl.build_baseline("herd", [_result()])
+    assert bl.missing_endpoints(base, [{"phases": {}}]) == ["herd *", "herd POST /api/challenges"]
+
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"format_version": 99}))
+    with pytest.raises(ValueError):
+        bl.load_baseline(str(bad))
+    with pytest.raises(FileNotFoundError):
+        bl.resolve_baseline("nope", str(tmp_path))
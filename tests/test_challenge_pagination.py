@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.challange_service import ChallengeService
+
+# --- Fixtures ---
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "ctf.db"
+
+@pytest.fixture
+def service(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    levels = [
+        Level(name=f"level-{i}", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY)
+        for i in range(2)
+    ]
+    session.add_all(levels)
+    session.flush()
+
+    # 3 teams x 2 levels, every other challenge has a running deployment
+    for n, (team, level) in enumerate((t, l) for t in ("alpha", "beta", "gamma") for l in levels):
+        challenge = Challenge(level_id=level.id, team=team, flag=f"CTF{{{n}}}", is_active=team != "gamma")
+        session.add(challenge)
+        session.flush()
+        status = DeploymentStatus.RUNNING if n % 2 == 0 else DeploymentStatus.STOPPED
+        session.add(Deployment(challenge_id=challenge.id, vm_id=200 + n, status=status))
+    session.commit()
+
+    yield ChallengeService(session, MagicMock(), MagicMock(), Settings())
+    session.close()
+
+# --- Tests ---
+
+def test_get_page_walks_all_rows_with_cursor(service):
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = service.get_page(after_id=cursor, limit=4)
+        seen.extend(c.id for c in page)
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 6
+
+def test_get_page_last_page_has_no_cursor(service):
+    page, cursor = service.get_page(limit=6)
+    assert len(page) == 6
+    assert cursor is None
+
+def test_get_page_filters(service):
+    page, _ = service.get_page(team="alpha")
+    assert {c.team for c in page} == {"alpha"}
+
+    page, _ = service.get_page(is_active=False)
+    assert {c.team for c in page} == {"gamma"}
+
+    page, _ = service.get_page(status=DeploymentStatus.RUNNING)
+    assert len(page) == 3
+    assert all(c.deployment.status == DeploymentStatus.RUNNING for c in page)
+
+def test_count_matches_filters(service):
+    assert service.count() == 6
+    assert service.count(team="beta") == 2
+    assert service.count(is_active=True, status=DeploymentStatus.STOPPED) == 2
+
+def test_async_paths_match_sync(service, db_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with async_sessionmaker(engine, expire_on_commit=False)() as async_db:
+            service.async_db = async_db
+            page, cursor = await service.get_page_async(limit=4, status=DeploymentStatus.RUNNING)
+            total = await service.count_async(team="alpha")
+        await engine.dispose()
+        return [c.id for c in page], cursor, total
+
+    ids, cursor, total = asyncio.run(scenario())
+    service.async_db = None
+    sync_page, sync_cursor = service.get_page(limit=4, status=DeploymentStatus.RUNNING)
+    assert ids == [c.id for c in sync_page]
+    assert cursor == sync_cursor
+    assert total == 2
+
+def test_async_paths_fall_back_to_sync_session(service):
+    page, _ = asyncio.run(service.get_page_async(team="beta"))
+    assert {c.team for c in page} == {"beta"}
+    assert asyncio.run(service.count_async(is_active=False)) == 2
@@ -0,0 +1,197 @@
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config.settings import Settings
+from core.circuit_breaker import CIRCUIT_STATE, CLOSED, HALF_OPEN, OPEN, CircuitBreaker, backoff_delay
+from core.exceptions import CircuitOpenError, ProxmoxNodeError, ProxmoxUnavailableError, ResourceNotFoundError
+from services.proxmox_service import ProxmoxService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProxmoxHTTPError(Exception):
+    """Meniru proxmoxer ResourceException (punya status_code)"""
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+# --- CircuitBreaker ---
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test-open", failure_threshold=3, reset_timeout=30, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # sukses me-reset hitungan
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 10
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.retry_after == 20
+
+
+def test_breaker_half_open_allows_limited_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test-half-open", failure_threshold=1, reset_timeout=30, half_open_calls=1, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()  # probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # Probe gagal: open lagi selama reset_timeout penuh
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 30
+
+    clock.now = 60
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_late_success_does_not_close_open_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test-late-success", failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.before_call()  # call lambat dimulai saat masih closed
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    breaker.record_success()  # call lambat tadi akhirnya sukses
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # Setelah reset_timeout, probe half-open yang sukses tetap menutup circuit
+    clock.now = 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_state_gauge_keeps_one_callback_per_breaker_name():
+    breakers = [CircuitBreaker("test-gauge", failure_threshold=1, reset_timeout=30) for _ in range(20)]
+    breakers[-1].record_failure()
+
+    assert CIRCUIT_STATE._callbacks["test-gauge"]() == {("test-gauge",): 2}
+    del breakers
+    assert CIRCUIT_STATE._callbacks["test-gauge"]() == {}
+
+
+def test_backoff_delay_is_capped_full_jitter():
+    rng = random.Random(1)
+    delays = [backoff_delay(attempt, 0.5, 4.0, rng) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert max(backoff_delay(0, 0.5, 4.0, rng) for _ in range(50)) <= 0.5
+
+
+# --- ProxmoxService ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.PROXMOX_RETRY_ATTEMPTS = 3
+    settings.PROXMOX_RETRY_BASE_DELAY = 0
+    settings.PROXMOX_BREAKER_FAILURES = 5
+    return settings
+
+
+@pytest.fixture
+def proxmox():
+    with patch("services.proxmox_service.ProxmoxAPI") as mock:
+        instance = mock.return_value
+        instance.version.get.return_value = {"version": "8.1"}
+        yield instance
+
+
+def test_idempotent_get_is_retried_on_transient_error(settings, proxmox):
+    config = proxmox.nodes.return_value.qemu.return_value.config.get
+    config.side_effect = [ConnectionError("reset"), ProxmoxHTTPError(503), {"name": "vm"}]
+    service = ProxmoxService(settings)
+
+    assert service.get_vm_info(200, vm_type="qemu") == {"name": "vm"}
+    assert config.call_count == 3
+
+
+def test_non_transient_error_is_not_retried(settings, proxmox):
+    config = proxmox.nodes.return_value.qemu.return_value.config.get
+    config.side_effect = ProxmoxHTTPError(500)
+    service = ProxmoxService(settings)
+
+    with pytest.raises(ResourceNotFoundError):
+        service.get_vm_info(200, vm_type="qemu")
+    assert config.call_count == 1
+    assert service.breaker.state == CLOSED
+
+
+def test_mutating_call_is_not_retried(settings, proxmox):
+    stop = proxmox.nodes.return_value.qemu.return_value.status.stop.post
+    stop.side_effect = TimeoutError("read timed out")
+    service = ProxmoxService(settings)
+
+    with pytest.raises(ProxmoxUnavailableError):
+        service.stop_vm(200, vm_type="qemu", check_exists=False)
+    assert stop.call_count == 1
+
+
+def test_open_circuit_fails_fast_without_calling_proxmox(settings, proxmox):
+    settings.PROXMOX_BREAKER_FAILURES = 2
+    settings.PROXMOX_RETRY_ATTEMPTS = 1
+    config = proxmox.nodes.return_value.qemu.return_value.config.get
+    config.side_effect = ConnectionError("refused")
+    service = ProxmoxService(settings)
+
+    for _ in range(2):
+        with pytest.raises(ProxmoxUnavailableError):
+            service.get_vm_info(200, vm_type="qemu")
+    assert service.breaker.state == OPEN
+
+    proxmox.reset_mock()
+    # Unavailable, bukan not found: VM tidak boleh dianggap terhapus
+    with pytest.raises(ProxmoxUnavailableError) as exc:
+        service.get_vm_info(200, vm_type="qemu")
+    assert exc.value.retry_after > 0
+    config.assert_not_called()
+    with pytest.raises(ProxmoxUnavailableError):
+        service.list_vms()
+    proxmox.nodes.return_value.qemu.get.assert_not_called()
+
+
+def test_task_failure_is_not_a_breaker_failure(settings, proxmox):
+    proxmox.nodes.return_value.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "ERROR"}
+    service = ProxmoxService(settings)
+
+    with pytest.raises(ProxmoxNodeError):
+        service.wait_for_task("UPID:1")
+    assert service.breaker.state == CLOSED
+
+
+def test_login_is_not_repeated_while_circuit_open(settings):
+    settings.PROXMOX_BREAKER_FAILURES = 1
+    with patch("services.proxmox_service.ProxmoxAPI", MagicMock(side_effect=ConnectionError("down"))) as api:
+        service = ProxmoxService(settings)
+        with pytest.raises(ProxmoxUnavailableError):
+            service.check_connection()
+        with pytest.raises(ProxmoxUnavailableError):
+            service.check_connection()
+    assert api.call_count == 1
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.event_broadcaster import EventBroadcaster, track_deployment_status
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.SSE_KEEPALIVE_SECONDS = 1
+    settings.SSE_SUBSCRIBER_QUEUE_SIZE = 4
+    return settings
+
+async def next_frame(stream) -> bytes:
+    return await asyncio.wait_for(stream.__anext__(), timeout=2)
+
+# --- Tests for EventBroadcaster ---
+
+def test_publish_fans_out_to_matching_topics(settings):
+    async def scenario():
+        broadcaster = EventBroadcaster(settings)
+        broadcaster.start()
+        scores = broadcaster.subscribe(frozenset({"scoreboard"}))
+        everything = broadcaster.subscribe()
+        score_stream = broadcaster.stream(scores)
+        all_stream = broadcaster.stream(everything)
+        assert await next_frame(score_stream) == b"retry: 3000\n\n"
+        assert await next_frame(all_stream) == b"retry: 3000\n\n"
+
+        # Publish from a worker thread, like a sync route handler would
+        thread = threading.Thread(target=broadcaster.publish, args=("deployment", {"status": "running"}))
+        thread.start()
+        thread.join()
+        broadcaster.publish("scoreboard", {"team": "alpha"})
+
+        assert b"event: deployment" in await next_frame(all_stream)
+        assert b"event: scoreboard" in await next_frame(all_stream)
+        frame = await next_frame(score_stream)
+        assert frame == b'id: 2\nevent: scoreboard\ndata: {"team": "alpha"}\n\n'
+
+        await score_stream.aclose()
+        await all_stream.aclose()
+        assert broadcaster.subscriber_count == 0
+
+    asyncio.run(scenario())
+
+def test_replay_after_last_event_id(settings):
+    async def scenario():
+        broadcaster = EventBroadcaster(settings)
+        broadcaster.start()
+        for i in range(3):
+            broadcaster.publish("scoreboard", {"n": i})
+
+        stream = broadcaster.stream(broadcaster.subscribe(), last_event_id=1)
+        await next_frame(stream)
+        assert b"id: 2\n" in await next_frame(stream)
+        assert b"id: 3\n" in await next_frame(stream)
+        assert await next_frame(stream) == b": keepalive\n\n"
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+def test_lagging_subscriber_is_dropped(settings):
+    async def scenario():
+        broadcaster = EventBroadcaster(settings)
+        broadcaster.start()
+        sub = broadcaster.subscribe()
+        for i in range(settings.SSE_SUBSCRIBER_QUEUE_SIZE + 1):
+            broadcaster.publish("scoreboard", {"n": i})
+        await asyncio.sleep(0) # Let the scheduled fan-out run
+
+        assert sub.lagged is True
+        assert broadcaster.subscriber_count == 0
+        frames = [frame async for frame in broadcaster.stream(sub)]
+        assert frames == [b"retry: 3000\n\n"] # Stream ends, client reconnects with Last-Event-ID
+
+    asyncio.run(scenario())
+
+def test_subscriber_limit(settings):
+    async def scenario():
+        settings.SSE_MAX_SUBSCRIBERS = 1
+        broadcaster = EventBroadcaster(settings)
+        broadcaster.subscribe()
+        with pytest.raises(OverflowError):
+            broadcaster.subscribe()
+
+    asyncio.run(scenario())
+
+# --- Tests for deployment status tracking ---
+
+def test_deployment_status_published_after_commit(settings):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    broadcaster = EventBroadcaster(settings)
+    track_deployment_status(factory, broadcaster)
+
+    session = factory()
+    level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY)
+    session.add(level)
+    session.flush()
+    challenge = Challenge(level_id=level.id, team="alpha", flag="CTF{x}")
+    session.add(challenge)
+    session.flush()
+    deployment = Deployment(challenge_id=challenge.id, vm_id=200, status=DeploymentStatus.RUNNING)
+    session.add(deployment)
+    session.commit()
+
+    deployment.status = DeploymentStatus.ERROR
+    session.flush()
+    session.rollback() # Rolled back change must not be published
+
+    assert deployment.status == DeploymentStatus.RUNNING # Reload after rollback
+    deployment.status = DeploymentStatus.STOPPED
+    session.commit()
+
+    events = [frame[2].decode() for frame in broadcaster._history]
+    assert len(events) == 2
+    assert '"status":"running"' in events[0]
+    assert '"status":"stopped","previous_status":"running"' in events[1]
+    session.close()
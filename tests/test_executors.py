@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from contextvars import ContextVar
+
+import anyio
+import anyio.to_thread
+import pytest
+
+from core.exceptions import ExecutorSaturatedError
+from core.executors import EXECUTOR_QUEUE_WAIT, ExecutorLane, configure_default_threadpool, limiter_stats
+
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+def test_lane_runs_with_caller_context_and_records_queue_wait():
+    lane = ExecutorLane("ctx-test", 1, 10)
+    before = EXECUTOR_QUEUE_WAIT.collect().get(("ctx-test",), ([0], 0.0))[0]
+
+    async def main():
+        request_id.set("abc")
+        return await lane.run(lambda: (request_id.get(), threading.current_thread().name))
+
+    value, thread_name = asyncio.run(main())
+    lane.shutdown()
+    assert value == "abc"
+    assert thread_name.startswith("lane-ctx-test")
+    counts, _ = EXECUTOR_QUEUE_WAIT.collect()[("ctx-test",)]
+    assert sum(counts) == sum(before) + 1
+
+
+def test_lane_rejects_when_workers_busy_and_queue_full():
+    lane = ExecutorLane("sat-test", 1, 1)
+    release = threading.Event()
+    running = lane.submit(release.wait, 5)
+    queued = lane.submit(lambda: "queued")
+    # Tunggu task pertama benar-benar dipegang worker
+    for _ in range(200):
+        if lane.stats()["active"] == 1:
+            break
+        threading.Event().wait(0.005)
+
+    with pytest.raises(ExecutorSaturatedError):
+        lane.submit(lambda: None)
+    assert lane.stats()["rejected"] == 1
+
+    release.set()
+    assert running.result(timeout=2) is True
+    assert queued.result(timeout=2) == "queued"
+    assert lane.stats() == {"workers": 1, "active": 0, "queued": 0, "max_queue": 1, "rejected": 1}
+    lane.shutdown()
+
+
+def test_busy_provisioning_lane_does_not_block_default_threadpool():
+    lane = ExecutorLane("iso-test", 2, 10)
+    release = threading.Event()
+
+    async def main():
+        limiter = configure_default_threadpool(2)
+        # Provisioning lambat memenuhi lane-nya sendiri
+        slow = [asyncio.ensure_future(lane.run(release.wait, 5)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        assert lane.stats()["queued"] == 2
+        # Handler sync (threadpool AnyIO) tetap langsung jalan
+        with anyio.fail_after(1):
+            fast = await anyio.to_thread.run_sync(lambda: "submit ok")
+        stats = limiter_stats(limiter)
+        release.set()
+        await asyncio.gather(*slow)
+        return fast, stats
+
+    fast, stats = asyncio.run(main())
+    lane.shutdown()
+    assert fast == "submit ok"
+    assert stats["workers"] == 2
@@ -0,0 +1,191 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from core.exceptions import ProxmoxUnavailableError, ResourceNotFoundError
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.challange_service import ChallengeService
+from services.expiry_scheduler import ExpiryScheduler
+from services.proxmox_service import ProxmoxService
+from services.reclamation_service import ReclamationQueue
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.DEFAULT_CHALLENGE_DURATION = 3600
+    settings.CHALLENGE_EXTEND_MAX = 1800
+    settings.CHALLENGE_MAX_LIFETIME = 3600
+    settings.EXPIRY_ACTION = "destroy"
+    return settings
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    now = datetime.utcnow()
+    with factory() as session:
+        level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY, duration=600)
+        session.add(level)
+        session.flush()
+        # alpha: sudah lewat deadline, beta: data lama tanpa expires_at, gamma: sudah TERMINATED
+        rows = (
+            ("alpha", 200, DeploymentStatus.RUNNING, now - timedelta(seconds=5)),
+            ("beta", 201, DeploymentStatus.RUNNING, None),
+            ("gamma", 202, DeploymentStatus.TERMINATED, now - timedelta(seconds=5)),
+        )
+        for team, vmid, status, expires_at in rows:
+            challenge = Challenge(level_id=level.id, team=team, flag=f"CTF{{{team}}}",
+                                  active_slot=Challenge.slot_for(team, level.id))
+            session.add(challenge)
+            session.flush()
+            session.add(Deployment(challenge_id=challenge.id, vm_id=vmid, status=status,
+                                   started_at=now - timedelta(seconds=60), expires_at=expires_at))
+        session.commit()
+    return factory
+
+@pytest.fixture
+def reclaimer():
+    return MagicMock(spec=ReclamationQueue)
+
+@pytest.fixture
+def scheduler(settings, session_factory, reclaimer):
+    scheduler = ExpiryScheduler(settings, session_factory, MagicMock(spec=ProxmoxService), reclaimer)
+    yield scheduler
+    scheduler.stop()
+
+def wait_for(predicate, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+# --- Tests for the heap ---
+
+def test_schedule_extend_and_cancel(scheduler):
+    now = datetime.utcnow()
+    scheduler.schedule(1, now + timedelta(seconds=30))
+    scheduler.schedule(2, now + timedelta(seconds=10))
+    assert scheduler.next_deadline() == (now + timedelta(seconds=10), 2)
+
+    scheduler.schedule(2, now + timedelta(seconds=60)) # extend: entry lama jadi basi
+    assert scheduler.next_deadline() == (now + timedelta(seconds=30), 1)
+    assert len(scheduler) == 2
+
+    scheduler.cancel(1)
+    assert scheduler.next_deadline() == (now + timedelta(seconds=60), 2)
+    assert scheduler._pop_due(now + timedelta(seconds=120)) == [2]
+    assert len(scheduler) == 0
+
+def test_rebuild_from_db_backfills_missing_deadlines(scheduler, session_factory):
+    assert scheduler.rebuild_from_db() == 2
+
+    with session_factory() as session:
+        beta = session.get(Deployment, 2)
+        assert beta.expires_at == beta.started_at + timedelta(seconds=600) # Level.duration
+    assert scheduler.next_deadline()[1] == 1
+
+# --- Tests for expiry ---
+
+def test_expired_deployment_is_sent_to_reclamation(scheduler, session_factory, reclaimer):
+    scheduler.rebuild_from_db()
+    scheduler.start()
+    wait_for(lambda: reclaimer.enqueue.called)
+
+    reclaimer.enqueue.assert_called_once_with(200, 1, None)
+    assert scheduler.expired_count == 1
+    with session_factory() as session:
+        alpha = session.get(Deployment, 1)
+        assert alpha.status == DeploymentStatus.TERMINATING
+        assert alpha.challenge.active_slot is None
+    assert len(scheduler) == 1 # beta masih menunggu
+
+def test_stop_action_keeps_vm(settings, scheduler, session_factory, reclaimer):
+    settings.EXPIRY_ACTION = "stop"
+    scheduler._expire(1)
+
+    scheduler.proxmox_service.stop_vm.assert_called_once_with(200, node=None)
+    reclaimer.enqueue.assert_not_called()
+    with session_factory() as session:
+        assert session.get(Deployment, 1).status == DeploymentStatus.STOPPED
+
+def test_stop_action_does_not_track_stopped_deployments(settings, scheduler, session_factory):
+    settings.EXPIRY_ACTION = "stop"
+    with session_factory() as session:
+        session.get(Deployment, 2).status = DeploymentStatus.STOPPED
+        session.commit()
+
+    assert scheduler.rebuild_from_db() == 1
+    assert scheduler.next_deadline()[1] == 1
+
+def test_failed_stop_is_retried_with_backoff(settings, scheduler, session_factory):
+    settings.EXPIRY_ACTION = "stop"
+    settings.EXPIRY_RETRY_DELAY = 30
+    scheduler.proxmox_service.stop_vm.side_effect = ProxmoxUnavailableError("circuit open")
+
+    before = datetime.utcnow()
+    scheduler._expire(1)
+    scheduler._pop_due(datetime.utcnow() + timedelta(seconds=31))
+    scheduler._expire(1)
+
+    deadline, deployment_id = scheduler.next_deadline()
+    assert deployment_id == 1
+    assert deadline >= before + timedelta(seconds=60)  # attempt kedua: 30 * 2
+    with session_factory() as session:
+        alpha = session.get(Deployment, 1)
+        assert alpha.status == DeploymentStatus.RUNNING
+        assert alpha.challenge.active_slot is not None
+
+    scheduler.proxmox_service.stop_vm.side_effect = None
+    scheduler._expire(1)
+    assert scheduler._attempts == {}
+    with session_factory() as session:
+        assert session.get(Deployment, 1).status == DeploymentStatus.STOPPED
+
+def test_expire_reschedules_when_extended_in_db(scheduler, session_factory, reclaimer):
+    later = datetime.utcnow() + timedelta(seconds=300)
+    with session_factory() as session:
+        session.get(Deployment, 1).expires_at = later
+        session.commit()
+
+    scheduler._expire(1)
+
+    reclaimer.enqueue.assert_not_called()
+    assert scheduler.next_deadline() == (later, 1)
+
+# --- Tests for ChallengeService.extend_challenge ---
+
+def test_extend_challenge_caps_to_max_lifetime(settings, session_factory, scheduler):
+    with session_factory() as session:
+        session.get(Deployment, 2).expires_at = datetime.utcnow() + timedelta(seconds=60)
+        session.commit()
+
+    session = session_factory()
+    service = ChallengeService(session, MagicMock(), MagicMock(), settings, expiry=scheduler)
+
+    first = service.extend_challenge(2, 10_000) # dipotong ke CHALLENGE_EXTEND_MAX
+    started_at = session.get(Deployment, 2).started_at
+    assert first["expires_at"] <= started_at + timedelta(seconds=settings.CHALLENGE_MAX_LIFETIME)
+    assert scheduler.next_deadline() == (first["expires_at"], 2)
+
+    service.extend_challenge(2, 1800)
+    assert session.get(Deployment, 2).expires_at == started_at + timedelta(seconds=settings.CHALLENGE_MAX_LIFETIME)
+    with pytest.raises(ValueError):
+        service.extend_challenge(2, 60)
+    session.close()
+
+def test_extend_inactive_challenge(settings, session_factory):
+    session = session_factory()
+    service = ChallengeService(session, MagicMock(), MagicMock(), settings)
+    with pytest.raises(ResourceNotFoundError):
+        service.extend_challenge(3, 60)
+    session.close()
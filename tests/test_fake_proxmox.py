@@ -0,0 +1,102 @@
+import threading
+import pytest
+
+from config.settings import Settings
+from core.exceptions import ProxmoxNodeError, VMCreationError
+from benchmarks.fake_proxmox import FakeProxmox, FakeProxmoxConfig
+from services.proxmox_service import ProxmoxService
+
+# --- Fixtures ---
+
+def instant_tasks(**overrides):
+    config = FakeProxmoxConfig(task_seconds={}, seed=1)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+@pytest.fixture
+def fake():
+    with FakeProxmox(instant_tasks()) as fake:
+        yield fake
+
+def make_service(fake):
+    settings = Settings()
+    settings.PROXMOX_HOST = fake.host
+    settings.PROXMOX_NODE = fake.config.node
+    settings.PROXMOX_VERIFY_SSL = False
+    settings.TEMPLATE_VMID = 9000
+    settings.TEMPLATE_CTID = 8000
+    return ProxmoxService(settings)
+
+# --- Tests ---
+
+def test_real_service_lifecycle_against_fake(fake):
+    service = make_service(fake)
+
+    vm = service.create_vm(level_id=1, team="alpha", time_limit=60, config={"memory": 1024})
+    assert vm.vmid == service.settings.STARTING_VMID
+    assert vm.info.name == f"alpha-1-{vm.vmid}"
+    guest = fake.cluster.guests[vm.vmid]
+    assert (guest.status, guest.memory) == ("running", 1024)
+
+    ct = service.create_vm(level_id=2, team="beta", time_limit=60, config={}, vm_type="lxc")
+    assert fake.cluster.guests[ct.vmid].vm_type == "lxc"
+    assert {vm["vmid"] for vm in service.list_vms()} >= {vm.vmid, ct.vmid}
+
+    service.destroy_vm(vm.vmid)
+    service.list_vms() # settle task delete
+    assert vm.vmid not in fake.cluster.guests
+    assert fake.cluster.calls["clone"] == 2
+
+def test_guest_metrics_from_cluster_resources(fake):
+    service = make_service(fake)
+    vm = service.create_vm(level_id=1, team="alpha", time_limit=60, config={})
+
+    metrics = service.get_guest_metrics()
+    assert metrics[vm.vmid]["status"] == "running"
+    assert 9000 in metrics
+
+def test_lock_contention_fails_second_clone():
+    config = instant_tasks(task_seconds={"clone": 30.0}, lock_timeout=0.1)
+    with FakeProxmox(config) as fake:
+        service = make_service(fake)
+        cluster = fake.cluster
+        with cluster.lock:
+            first = cluster._task("clone", [cluster.guests[9000]])
+            second = cluster._task("clone", [cluster.guests[9000]])
+        assert cluster.tasks[first].exitstatus == "OK"
+        assert "can't lock file" in cluster.tasks[second].exitstatus
+
+        with pytest.raises(ProxmoxNodeError):
+            service.wait_for_task(second, timeout=5, interval=0.05)
+
+def test_injected_failures(fake):
+    fake.config.failure_rate = 1.0
+    fake.config.failure_operations = frozenset({"clone"})
+    service = make_service(fake)
+
+    with pytest.raises(VMCreationError):
+        service.create_vm(level_id=1, team="alpha", time_limit=60, config={})
+    assert service.list_vms() is not None # operasi lain tidak terpengaruh
+
+def test_concurrent_creates_get_distinct_vmids():
+    config = instant_tasks(task_seconds={"clone": 0.05}, latency=0.01)
+    with FakeProxmox(config) as fake:
+        service = make_service(fake)
+        results, errors = [], []
+
+        def create(i):
+            try:
+                results.append(service.create_vm(level_id=1, team=f"team{i}", time_limit=60, config={}).vmid)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=create, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert errors == []
+    assert len(set(results)) == 8
+    assert service._reserved_vmids == set()
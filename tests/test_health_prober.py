@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config.settings import Settings
+from core.exceptions import ProxmoxConnectionError
+from services.health_service import HealthProber
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.HEALTH_STALE_AFTER = 30
+    return settings
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return sessionmaker(bind=engine)
+
+@pytest.fixture
+def ansible(tmp_path):
+    ansible = MagicMock()
+    ansible.playbook_dir = tmp_path
+    return ansible
+
+# --- Tests ---
+
+def test_not_ready_before_first_probe(settings, session_factory, ansible):
+    prober = HealthProber(settings, MagicMock(), session_factory, ansible)
+    assert prober.is_ready() is False
+    assert prober.status() == "starting"
+    assert prober.snapshot()["proxmox"].status == "unknown"
+
+def test_probe_caches_results(settings, session_factory, ansible):
+    proxmox = MagicMock()
+    prober = HealthProber(settings, proxmox, session_factory, ansible)
+
+    snapshot = prober.probe_once()
+
+    assert snapshot["proxmox"].status == "up"
+    assert snapshot["database"].status == "up"
+    assert snapshot["database"].checked_at is not None
+    assert prober.is_ready() is True
+    # Baca snapshot tidak memanggil Proxmox lagi
+    prober.snapshot()
+    assert proxmox.check_connection.call_count == 1
+
+def test_proxmox_down_is_degraded_but_ready(settings, session_factory, ansible):
+    proxmox = MagicMock()
+    proxmox.check_connection.side_effect = ProxmoxConnectionError("timeout")
+    prober = HealthProber(settings, proxmox, session_factory, ansible)
+
+    snapshot = prober.probe_once()
+
+    assert snapshot["proxmox"].status == "down"
+    assert "timeout" in snapshot["proxmox"].error
+    # Scoreboard dan submit flag tetap dilayani selama Proxmox down
+    assert prober.is_ready() is True
+    assert prober.status() == "degraded"
+
+def test_stale_results_are_not_ready(settings, session_factory, ansible):
+    prober = HealthProber(settings, MagicMock(), session_factory, ansible)
+    prober.probe_once()
+
+    later = datetime.utcnow() + timedelta(seconds=60)
+    assert prober.snapshot(later)["database"].stale is True
+    assert prober.is_ready(later) is False
+
+def test_missing_playbook_dir_marks_ansible_down(settings, session_factory, tmp_path):
+    ansible = MagicMock()
+    ansible.playbook_dir = tmp_path / "missing"
+    prober = HealthProber(settings, MagicMock(), session_factory, ansible)
+
+    snapshot = prober.probe_once()
+
+    assert snapshot["ansible"].status == "down"
+    assert prober.is_ready() is True # Ansible tidak menentukan readiness
+
+def test_slow_proxmox_does_not_stale_database(settings, session_factory, ansible):
+    settings.HEALTH_CHECK_INTERVAL = 0.01
+    settings.HEALTH_PROBE_TIMEOUT = 0
+    release = threading.Event()
+    proxmox = MagicMock()
+    proxmox.check_connection.side_effect = lambda: release.wait(5)
+    prober = HealthProber(settings, proxmox, session_factory, ansible)
+    prober.start()
+    try:
+        deadline = time.monotonic() + 2
+        while prober.snapshot()["database"].checked_at is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Probe Proxmox masih menggantung, database tetap di-probe di thread sendiri
+        later = datetime.utcnow() + timedelta(seconds=settings.HEALTH_STALE_AFTER - 1)
+        assert prober.is_ready(later) is True
+        proxmox_health = prober.snapshot()["proxmox"]
+        assert proxmox_health.status == "down"
+        assert "timed out" in proxmox_health.error
+        assert prober.status() == "degraded"
+    finally:
+        release.set()
+        prober.stop()
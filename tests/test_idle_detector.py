@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from core.exceptions import ProxmoxNodeError
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.challange_service import ChallengeService
+from services.idle_service import IdleDetector
+from services.proxmox_service import ProxmoxService
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.IDLE_SUSPEND_AFTER = 120
+    settings.IDLE_CPU_THRESHOLD = 0.05
+    settings.IDLE_NET_BYTES = 1000
+    settings.IDLE_SUSPEND_BATCH = 1
+    return settings
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY)
+        session.add(level)
+        session.flush()
+        for team, vmid in (("alpha", 200), ("beta", 201)):
+            challenge = Challenge(level_id=level.id, team=team, flag=f"CTF{{{team}}}",
+                                  active_slot=Challenge.slot_for(team, level.id))
+            session.add(challenge)
+            session.flush()
+            session.add(Deployment(challenge_id=challenge.id, vm_id=vmid, status=DeploymentStatus.RUNNING))
+        session.commit()
+    return factory
+
+@pytest.fixture
+def proxmox():
+    return MagicMock(spec=ProxmoxService)
+
+def metrics(**guests):
+    """guests: vmid=(cpu, net_bytes)"""
+    return {
+        int(vmid[2:]): {"vmid": int(vmid[2:]), "type": "qemu", "status": "running", "cpu": cpu, "netin": net, "netout": 0}
+        for vmid, (cpu, net) in guests.items()
+    }
+
+def get_status(session_factory, deployment_id):
+    with session_factory() as session:
+        return session.get(Deployment, deployment_id).status
+
+# --- Tests for IdleDetector ---
+
+def test_suspends_vm_idle_past_threshold(settings, session_factory, proxmox):
+    detector = IdleDetector(settings, proxmox, session_factory)
+
+    # alpha idle terus, beta ada traffic tiap pass
+    proxmox.get_guest_metrics.return_value = metrics(vm200=(0.01, 500), vm201=(0.01, 0))
+    assert detector.check(now=0) == []
+    proxmox.get_guest_metrics.return_value = metrics(vm200=(0.01, 600), vm201=(0.01, 5000))
+    assert detector.check(now=60) == []
+    proxmox.get_guest_metrics.return_value = metrics(vm200=(0.01, 700), vm201=(0.01, 10000))
+    assert detector.check(now=120) == [200]
+
+    proxmox.suspend_vm.assert_called_once_with(200, node=None)
+    assert get_status(session_factory, 1) == DeploymentStatus.SUSPENDED
+    assert get_status(session_factory, 2) == DeploymentStatus.RUNNING
+    assert detector.suspended_count == 1
+
+def test_cpu_activity_resets_idle_timer(settings, session_factory, proxmox):
+    detector = IdleDetector(settings, proxmox, session_factory)
+    for now, cpu in ((0, 0.0), (60, 0.0), (100, 0.5), (160, 0.0)):
+        proxmox.get_guest_metrics.return_value = metrics(vm200=(cpu, 0))
+        assert detector.check(now=now) == []
+    proxmox.get_guest_metrics.return_value = metrics(vm200=(0.0, 0))
+    assert detector.check(now=220) == [200] # idle sejak 100
+
+def test_batch_limit_and_failed_suspend(settings, session_factory, proxmox):
+    detector = IdleDetector(settings, proxmox, session_factory)
+    proxmox.suspend_vm.side_effect = ProxmoxNodeError("locked")
+    for now in (0, 200):
+        proxmox.get_guest_metrics.return_value = metrics(vm200=(0.0, 0), vm201=(0.0, 0))
+        assert detector.check(now=now) == []
+
+    assert proxmox.suspend_vm.call_count == 1 # IDLE_SUSPEND_BATCH
+    assert get_status(session_factory, 1) == DeploymentStatus.RUNNING
+
+def test_deployment_marked_suspended_before_vm_is_hibernated(settings, session_factory, proxmox):
+    detector = IdleDetector(settings, proxmox, session_factory)
+    statuses = []
+    proxmox.suspend_vm.side_effect = lambda vmid, node=None: statuses.append(get_status(session_factory, 1))
+
+    assert detector._suspend(200, 1) is True
+    assert statuses == [DeploymentStatus.SUSPENDED]
+    assert get_status(session_factory, 1) == DeploymentStatus.SUSPENDED
+
+def test_team_using_challenge_during_suspend_gets_running_vm(settings, session_factory, proxmox):
+    detector = IdleDetector(settings, proxmox, session_factory)
+
+    def team_opens_challenge(vmid, node=None):
+        # Request team datang saat hibernate masih berjalan
+        with session_factory() as session:
+            ChallengeService(session, proxmox, MagicMock(), settings).create_challenge(level_id=1, team_name="alpha")
+    proxmox.suspend_vm.side_effect = team_opens_challenge
+
+    assert detector._suspend(200, 1) is False
+    # Resume oleh request team, lalu resume lagi setelah suspend selesai
+    assert proxmox.resume_vm.call_count == 2
+    assert get_status(session_factory, 1) == DeploymentStatus.RUNNING
+    assert detector.suspended_count == 0
+
+# --- Tests for resume ---
+
+def test_existing_challenge_request_resumes_vm(settings, session_factory, proxmox):
+    with session_factory() as session:
+        session.get(Deployment, 1).status = DeploymentStatus.SUSPENDED
+        session.commit()
+
+    session = session_factory()
+    service = ChallengeService(session, proxmox, MagicMock(), settings)
+    result = service.create_challenge(level_id=1, team_name="alpha")
+
+    assert result.existing is True
+    proxmox.resume_vm.assert_called_once_with(200, node=None)
+    proxmox.create_vm.assert_not_called()
+    assert get_status(session_factory, 1) == DeploymentStatus.RUNNING
+    session.close()
+
+def test_resume_challenge_is_noop_when_running(settings, session_factory, proxmox):
+    session = session_factory()
+    service = ChallengeService(session, proxmox, MagicMock(), settings)
+    result = service.resume_challenge(2)
+
+    assert result["status"] == "running"
+    proxmox.resume_vm.assert_not_called()
+    session.close()
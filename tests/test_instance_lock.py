@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from core.exceptions import InstanceLockError
+from core.instance_lock import InstanceLock, check_single_process
+
+# --- Tests ---
+
+def test_second_instance_is_rejected_until_release(tmp_path):
+    path = str(tmp_path / "platform.lock")
+    first, second = InstanceLock(path), InstanceLock(path)
+
+    first.acquire()
+    assert first.held
+    with open(path) as f:
+        assert f.read() == str(os.getpid())
+
+    with pytest.raises(InstanceLockError, match="single process"):
+        second.acquire()
+    assert not second.held
+
+    first.release()
+    second.acquire()
+    assert second.held
+    second.release()
+
+def test_multi_worker_configuration_is_rejected(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    with pytest.raises(InstanceLockError, match="WEB_CONCURRENCY=4"):
+        check_single_process()
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    check_single_process()
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    check_single_process()
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from core.exceptions import ResourceNotFoundError
+from config.settings import Settings
+from models import Deployment, Level, CategoryEnum, DifficultyEnum
+from schemas.types.vm_types import VMResult, VMInfo
+from schemas.types.ansible_types import AnsiblePlaybookReturn
+from services.challange_service import ChallengeService
+from services.level_profile_cache import LevelProfileCache
+from services.level_service import LevelService
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.MAX_VM_MEMORY = 1024
+    settings.MAX_VM_CORES = 2
+    return settings
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Level(name="tiny-web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY,
+                      backend="lxc", template_vmid=8000, memory=256, cores=1, full_clone=False, node="pve2"))
+    session.add(Level(name="default", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY))
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def profiles(settings):
+    return LevelProfileCache(settings)
+
+# --- Tests for LevelProfileCache ---
+
+def test_profile_is_cached_until_invalidated(session, profiles):
+    profile = profiles.get(session, 1)
+    assert profile.to_vm_config() == {
+        "full": 0, "template_vmid": 8000, "memory": 256, "cores": 1, "target_node": "pve2",
+    }
+
+    session.get(Level, 1).memory = 512
+    session.commit()
+    assert profiles.get(session, 1).memory == 256 # Still cached
+
+    profiles.invalidate(1)
+    assert profiles.get(session, 1).memory == 512
+
+def test_missing_level_is_not_cached(session, profiles):
+    assert profiles.get(session, 99) is None
+
+def test_level_service_update_invalidates_cache(session, profiles):
+    service = LevelService(session, profiles)
+    assert service.get_profile(2).backend == "qemu"
+
+    updated = service.update_profile(2, {"backend": "lxc", "memory": 128, "name": "ignored"})
+
+    assert updated.backend == "lxc"
+    assert service.get_profile(2).memory == 128
+    assert session.get(Level, 2).name == "default"
+    with pytest.raises(ResourceNotFoundError):
+        service.update_profile(99, {"memory": 128})
+
+# --- Tests for ChallengeService provisioning ---
+
+def test_create_challenge_uses_level_profile_and_clamps_overrides(session, profiles, settings):
+    proxmox = MagicMock()
+    proxmox.create_vm.return_value = VMResult(status="success", vmid=200, info=VMInfo(name="t-1-200"), vm_type="lxc",
+                                                node="pve2")
+    ansible = MagicMock()
+    ansible.run_playbook.return_value = AnsiblePlaybookReturn(success=True, status="successful", rc=0, stats={})
+    service = ChallengeService(session, proxmox, ansible, settings, profiles=profiles)
+
+    service.create_challenge(1, "alpha", vm_config={"memory": 8192, "cores": 16, "template_vmid": 1})
+    # Node affinity disimpan supaya stop/destroy/resume menyasar node yang benar
+    assert session.query(Deployment).one().node == "pve2"
+
+    kwargs = proxmox.create_vm.call_args.kwargs
+    assert kwargs["vm_type"] == "lxc"
+    assert kwargs["config"] == {
+        "full": 0, "template_vmid": 8000, "memory": 1024, "cores": 2, "target_node": "pve2",
+    }
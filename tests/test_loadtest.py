@@ -0,0 +1,72 @@
+from benchmarks.loadtest import (
+    LoadTestOptions, Recorder, error_rate_violations, format_report, parse_args, percentile,
+)
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+    assert percentile([7.0], 1) == 7.0
+
+
+def test_recorder_report_per_endpoint():
+    recorder = Recorder()
+    for i in range(9):
+        recorder.record("GET /a", 0.010, True, 200)
+    recorder.record("GET /a", 0.500, False, 500)
+    recorder.record("POST /b", 0.020, False, 0)
+    recorder.stop()
+
+    report = recorder.report()
+    a = report["GET /a"]
+    assert a.count == 10
+    assert a.errors == 1
+    assert a.error_rate == 0.1
+    assert a.p50_ms == 10.0
+    assert a.max_ms == 500.0
+    assert a.statuses == {"200": 9, "500": 1}
+    assert report["POST /b"].statuses == {"0": 1}
+    assert a.rps > 0
+
+
+def test_format_report_and_args():
+    options, args = parse_args(["--teams", "3", "--clone-seconds", "0.5", "--json", "out.json"])
+    assert options == LoadTestOptions(teams=3, clone_seconds=0.5)
+    assert args.json == "out.json"
+
+    recorder = Recorder()
+    recorder.record("GET /api/scoreboard", 0.01, True, 200)
+    recorder.stop()
+    result = {"phases": {"sustained": {
+        "elapsed_s": 1.0,
+        "endpoints": {k: vars(v) for k, v in recorder.report().items()},
+    }}}
+    text = format_report(result)
+    assert "== sustained" in text
+    assert "GET /api/scoreboard" in text
+    assert "200x1" in text
+
+
+def test_error_rate_threshold():
+    options, args = parse_args([])
+    assert args.max_error_rate == 0.01
+    assert options.lock_timeout == 10.0
+
+    recorder = Recorder()
+    for _ in range(22):
+        recorder.record("POST /api/challenges", 0.1, True, 201)
+    for _ in range(8):
+        recorder.record("POST /api/challenges", 0.1, False, 500)
+    recorder.record("GET /api/scoreboard", 0.01, True, 200)
+    recorder.stop()
+    result = {"phases": {"herd": {
+        "elapsed_s": 1.0,
+        "endpoints": {k: vars(v) for k, v in recorder.report().items()},
+    }}}
+
+    violations = error_rate_violations(result, args.max_error_rate)
+    assert violations == ["herd POST /api/challenges: 26.67% errors (201x22 500x8)"]
+    assert error_rate_violations(result, 0.3) == []
@@ -0,0 +1,58 @@
+import json
+
+from core.logging import logger, json_format, parse_sampling, sampling_filter, sampling_patcher, is_sampled
+
+# --- Helpers ---
+
+def record(name, level="DEBUG"):
+    return {"name": name, "level": logger.level(level)}
+
+# --- Tests ---
+
+def test_parse_sampling():
+    assert parse_sampling("core.database=0.01, services.proxmox_service=2,bad") == {
+        "core.database": 0.01, "services.proxmox_service": 1.0,
+    }
+    assert parse_sampling("") == {}
+
+def test_sampling_keeps_one_in_n():
+    check = sampling_filter({"core.database": 0.1, "services": 0.0})
+    kept = sum(check(record("core.database")) for _ in range(100))
+    assert kept == 10
+    # Prefix module ikut ter-sample, logger lain tidak
+    assert not any(check(record("services.proxmox_service")) for _ in range(10))
+    assert all(check(record("app")) for _ in range(10))
+
+def test_sampling_never_drops_warnings():
+    check = sampling_filter({"core.database": 0.0})
+    assert check(record("core.database", "WARNING"))
+    assert check(record("core.database", "ERROR"))
+
+def test_sampling_decided_once_for_all_sinks():
+    stdout, logfile = [], []
+    sinks = [logger.add(lines.append, format="{message}", level="DEBUG", filter=is_sampled) for lines in (stdout, logfile)]
+    sampled = logger.patch(sampling_patcher(sampling_filter({__name__: 0.1})))
+    try:
+        for i in range(1000):
+            sampled.debug("record {}", i)
+    finally:
+        for sink_id in sinks:
+            logger.remove(sink_id)
+
+    # Tiap sink mendapat 1/10 record yang sama, bukan 2/10 di sink pertama dan 0 di sink kedua
+    assert len(stdout) == 100
+    assert stdout == logfile
+
+def test_json_format_with_lazy_args():
+    lines = []
+    sink_id = logger.add(lines.append, format=json_format, level="DEBUG")
+    try:
+        logger.bind(vmid=200).info("VM {} resumed {}", 200, {"a": 1})
+    finally:
+        logger.remove(sink_id)
+
+    payload = json.loads(lines[0])
+    assert payload["message"] == "VM 200 resumed {'a': 1}"
+    assert payload["level"] == "INFO"
+    assert payload["extra"] == {"vmid": 200}
+    assert payload["logger"].endswith("test_logging")
@@ -0,0 +1,132 @@
+import threading
+import pytest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config.settings import Settings
+from core.database import Base
+from core.metrics import MetricsRegistry, PROXMOX_API_DURATION, PROXMOX_API_ERRORS
+from services.proxmox_service import ProxmoxService
+
+# --- Tests for registry ---
+
+def test_counter_sums_thread_shards():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ("queue",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(queue="reclaim")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert counter.value(queue="reclaim") == 4000
+    assert 'jobs_total{queue="reclaim"} 4000' in registry.render()
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("op_seconds", "Op", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value, op="clone")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE op_seconds histogram" in lines
+    assert 'op_seconds_bucket{op="clone",le="0.1"} 2' in lines
+    assert 'op_seconds_bucket{op="clone",le="1"} 3' in lines
+    assert 'op_seconds_bucket{op="clone",le="+Inf"} 4' in lines
+    assert 'op_seconds_count{op="clone"} 4' in lines
+    assert 'op_seconds_sum{op="clone"} 3.65' in lines
+
+def test_gauge_callback_errors_are_skipped():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("depth", "Depth", ("queue",))
+    gauge.set_function(lambda: {("reclaim",): 3}, key="reclaim")
+    gauge.set_function(lambda: 1 / 0, key="broken")
+
+    assert 'depth{queue="reclaim"} 3' in registry.render()
+
+def test_gauge_callback_with_same_key_is_replaced():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("state", "State", ("name",))
+    for value in range(100):
+        gauge.set_function(lambda value=value: {("proxmox",): value}, key="proxmox")
+
+    assert len(gauge._callbacks) == 1
+    assert 'state{name="proxmox"} 99' in registry.render()
+
+def test_dead_thread_shards_are_folded_into_base():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ("queue",))
+    hist = registry.histogram("op_seconds", "Op", buckets=(1.0,))
+
+    def work():
+        counter.inc(queue="stop")
+        hist.observe(0.5)
+
+    for _ in range(50):
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+
+    assert len(counter._shards) == 0
+    assert len(hist._shards) == 0
+    assert counter.value(queue="stop") == 50
+    assert hist.collect()[()] == ([50, 0], 25.0)
+
+def test_register_same_name_returns_existing():
+    registry = MetricsRegistry()
+    counter = registry.counter("x_total", "X")
+    assert registry.counter("x_total", "X") is counter
+    with pytest.raises(ValueError):
+        registry.gauge("x_total", "X")
+
+# --- Tests for ProxmoxService instrumentation ---
+
+def test_proxmox_calls_are_instrumented():
+    with patch("services.proxmox_service.ProxmoxAPI") as mock:
+        instance = mock.return_value
+        node = instance.nodes.return_value
+        node.qemu.get.return_value = []
+        node.lxc.get.side_effect = Exception("boom")
+        errors_before = PROXMOX_API_ERRORS.value(endpoint="lxc/list")
+
+        ProxmoxService(Settings()).list_vms()
+
+    assert PROXMOX_API_ERRORS.value(endpoint="lxc/list") == errors_before + 1
+    assert ("qemu/list",) in PROXMOX_API_DURATION.collect()
+
+# --- Tests for /metrics after app startup ---
+
+@pytest.fixture
+def started_app(monkeypatch, tmp_path):
+    import app as app_module
+    from api import dependencies
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    settings = app_module.settings
+    monkeypatch.setattr(settings, "DB_SCHEMA_CHECK", "off")
+    monkeypatch.setattr(settings, "INSTANCE_LOCK_FILE", str(tmp_path / "ctf_platform.lock"))
+    monkeypatch.setattr(settings, "ORPHAN_RECONCILE_ENABLED", False)
+    monkeypatch.setattr(settings, "IDLE_SUSPEND_ENABLED", False)
+    monkeypatch.setattr(app_module, "SessionLocal", factory)
+    for name in ("_orphan_reconciler", "_reclamation_queue", "_stop_queue", "_expiry_scheduler",
+                 "_idle_detector", "_health_prober"):
+        monkeypatch.setattr(getattr(dependencies, name), "session_factory", factory)
+    with TestClient(app_module.app) as client:
+        yield client
+
+def test_metrics_reports_every_executor_lane(started_app):
+    body = started_app.get("/metrics").text
+
+    lanes = {line.split('lane="')[1].split('"')[0] for line in body.splitlines() if line.startswith("executor_")}
+    assert lanes >= {"api", "provisioning", "proxmox"}
@@ -0,0 +1,135 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from core.exceptions import IdempotencyKeyConflictError, ProvisioningInProgressError, VMCreationError
+from config.settings import Settings
+from models import Challenge, Level, CategoryEnum, DifficultyEnum
+from schemas.types.vm_types import VMResult, VMInfo
+from schemas.types.challenge_types import ChallengeResult
+from schemas.types.ansible_types import AnsiblePlaybookReturn
+from services.challange_service import ChallengeService
+from services.provisioning_registry import ProvisioningRegistry
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.PROVISION_WAIT_TIMEOUT = 5
+    return settings
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ctf.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add(Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY))
+        session.commit()
+    return factory
+
+def make_proxmox(delay: float = 0.0) -> MagicMock:
+    proxmox = MagicMock()
+
+    def create_vm(**kwargs):
+        time.sleep(delay)
+        vmid = 200 + proxmox.create_vm.call_count
+        return VMResult(status="success", vmid=vmid, info=VMInfo(name=f"vm-{vmid}"))
+
+    proxmox.create_vm.side_effect = create_vm
+    return proxmox
+
+def make_ansible() -> MagicMock:
+    ansible = MagicMock()
+    ansible.run_playbook.return_value = AnsiblePlaybookReturn(success=True, status="successful", rc=0)
+    return ansible
+
+# --- Tests for ProvisioningRegistry ---
+
+def test_registry_single_owner_per_slot(settings):
+    registry = ProvisioningRegistry(settings)
+    ticket, owner = registry.begin("alpha:1", "key-1")
+    again, second_owner = registry.begin("alpha:1")
+    assert owner is True
+    assert second_owner is False
+    assert again is ticket
+
+    result = ChallengeResult(success=True, message="ok", challenge_id=7)
+    registry.finish(ticket, result=result)
+    assert registry.wait(again).existing is True
+
+    # Key replay returns the stored result; slot is free for new owners
+    replay, replay_owner = registry.begin("alpha:1", "key-1")
+    assert replay_owner is False
+    assert registry.wait(replay).challenge_id == 7
+    assert registry.begin("alpha:1")[1] is True
+
+def test_registry_rejects_key_reuse_for_other_slot(settings):
+    registry = ProvisioningRegistry(settings)
+    registry.begin("alpha:1", "key-1")
+    with pytest.raises(IdempotencyKeyConflictError):
+        registry.begin("beta:1", "key-1")
+
+def test_registry_forgets_failed_keys(settings):
+    registry = ProvisioningRegistry(settings)
+    ticket, _ = registry.begin("alpha:1", "key-1")
+    registry.finish(ticket, error=VMCreationError("boom"))
+    with pytest.raises(VMCreationError):
+        registry.wait(ticket)
+    assert registry.begin("alpha:1", "key-1")[1] is True
+
+def test_registry_wait_timeout(settings):
+    registry = ProvisioningRegistry(settings)
+    ticket, _ = registry.begin("alpha:1")
+    with pytest.raises(ProvisioningInProgressError):
+        registry.wait(ticket, timeout=0.01)
+
+# --- Tests for idempotent create_challenge ---
+
+def test_concurrent_retries_provision_once(settings, session_factory):
+    registry = ProvisioningRegistry(settings)
+    proxmox = make_proxmox(delay=0.2)
+    ansible = make_ansible()
+    results = []
+
+    def request(key):
+        with session_factory() as session:
+            service = ChallengeService(session, proxmox, ansible, settings, registry=registry)
+            results.append(service.create_challenge(1, "alpha", idempotency_key=key))
+
+    threads = [threading.Thread(target=request, args=(key,)) for key in ("k1", "k1", None, "k2")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert proxmox.create_vm.call_count == 1
+    assert len({r.challenge_id for r in results}) == 1
+    assert sorted(r.existing for r in results) == [False, True, True, True]
+
+def test_existing_active_challenge_is_returned(settings, session_factory):
+    proxmox = make_proxmox()
+    with session_factory() as session:
+        service = ChallengeService(session, proxmox, make_ansible(), settings, registry=ProvisioningRegistry(settings))
+        first = service.create_challenge(1, "alpha")
+        second = service.create_challenge(1, "alpha")
+
+        assert proxmox.create_vm.call_count == 1
+        assert second.existing is True
+        assert second.challenge_id == first.challenge_id
+        assert second.flag == first.flag
+        assert second.vm_info.vmid == first.vm_info.vmid
+
+        # Once the challenge is deactivated the team can deploy the level again
+        challenge = session.get(Challenge, first.challenge_id)
+        challenge.deactivate()
+        session.commit()
+        third = service.create_challenge(1, "alpha")
+        assert third.existing is False
+        assert proxmox.create_vm.call_count == 2
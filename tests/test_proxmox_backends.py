@@ -0,0 +1,125 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from config.settings import Settings
+from core.exceptions import ProxmoxNodeError
+from services.proxmox_service import ProxmoxService
+
+# --- Fixtures ---
+
+@pytest.fixture
+def api():
+    with patch("services.proxmox_service.ProxmoxAPI") as mock:
+        instance = mock.return_value
+        instance.version.get.return_value = {"version": "8.1"}
+        node = instance.nodes.return_value
+        node.qemu.get.return_value = []
+        node.lxc.get.return_value = []
+        node.tasks.return_value.status.get.return_value = {"status": "stopped", "exitstatus": "OK"}
+        yield instance
+
+@pytest.fixture
+def service(api):
+    return ProxmoxService(Settings())
+
+# --- Tests ---
+
+def test_create_lxc_clones_ct_template(service, api):
+    node = api.nodes.return_value
+    node.lxc.return_value.config.get.return_value = {"hostname": "team-A-1-200", "memory": 256}
+
+    result = service.create_vm(level_id=1, team="team-A", time_limit=60,
+                               config={"template_vmid": 8000, "memory": 256}, vm_type="lxc")
+
+    assert result.vm_type == "lxc"
+    assert result.vmid == 200
+    node.lxc.assert_any_call(8000)
+    clone_kwargs = node.lxc.return_value.clone.post.call_args.kwargs
+    assert clone_kwargs["hostname"] == "team-A-1-200"
+    assert "name" not in clone_kwargs
+    node.lxc.return_value.config.put.assert_called_once_with(
+        memory=256, cores=service.settings.DEFAULT_VM_CORES, net0="name=eth0,bridge=vmbr0,ip=dhcp"
+    )
+    node.lxc.return_value.status.start.post.assert_called_once()
+    node.qemu.return_value.clone.post.assert_not_called()
+
+def test_destroy_uses_cached_guest_type(service, api):
+    node = api.nodes.return_value
+    node.lxc.get.return_value = [{"vmid": 300, "status": "stopped"}]
+    service.list_vms()
+
+    service.destroy_vm(300)
+
+    node.lxc.return_value.delete.assert_called_once_with(**{"purge": 1, "destroy-unreferenced-disks": 1})
+    node.qemu.return_value.delete.assert_not_called()
+    assert 300 not in service._guest_types
+
+def test_unknown_vmid_type_is_detected(service, api):
+    node = api.nodes.return_value
+    node.qemu.return_value.status.current.get.side_effect = Exception("500 no such VM")
+    node.lxc.return_value.status.current.get.return_value = {"status": "running"}
+
+    service.stop_vm(301)
+
+    node.lxc.return_value.status.stop.post.assert_called_once()
+    assert service._guest_types[301] == "lxc"
+
+def test_lxc_cannot_be_suspended(service):
+    with pytest.raises(ProxmoxNodeError):
+        service.suspend_vm(302, vm_type="lxc")
+
+def test_unsupported_backend(service):
+    with pytest.raises(ProxmoxNodeError):
+        service.create_vm(level_id=1, team="team-A", time_limit=60, config={}, vm_type="docker")
+
+def test_guest_on_affinity_node_is_addressed_on_that_node(service, api):
+    node = api.nodes.return_value
+    node.qemu.return_value.config.get.return_value = {"name": "team-A-1-200"}
+
+    result = service.create_vm(level_id=1, team="team-A", time_limit=60,
+                               config={"template_vmid": 9000, "target_node": "pve2"})
+    assert result.node == "pve2"
+
+    # Node diambil dari cache create_vm
+    api.nodes.reset_mock()
+    service.stop_vm(result.vmid, check_exists=False)
+    assert {c.args[0] for c in api.nodes.call_args_list} == {"pve2"}
+
+    # Status task di-poll dari node di UPID
+    api.nodes.reset_mock()
+    service.wait_for_task("UPID:pve2:0000A1B2:00C3D4E5:65000000:qmstop:200:root@pam:")
+    api.nodes.assert_called_once_with("pve2")
+
+def test_node_argument_used_without_cache(api):
+    # Service baru (mis. setelah restart): node datang dari Deployment.node
+    service = ProxmoxService(Settings())
+    node = api.nodes.return_value
+    node.qemu.return_value.status.current.get.return_value = {"status": "stopped"}
+    node.qemu.return_value.delete.return_value = "UPID:pve2:0000A1B2:00C3D4E5:65000000:qmdestroy:310:root@pam:"
+
+    service.destroy_vm(310, vm_type="qemu", node="pve2")
+
+    assert {c.args[0] for c in api.nodes.call_args_list} == {"pve2"}
+
+def test_next_vmid_skips_guests_on_other_nodes(service, api):
+    # VMID 200 dipakai guest di node affinity lain, tidak terlihat dari list PROXMOX_NODE
+    api.cluster.resources.get.return_value = [
+        {"vmid": 200, "type": "qemu", "node": "pve2"},
+        {"vmid": 201, "type": "lxc", "node": "pve3"},
+    ]
+
+    assert service._get_next_vmid() == 202
+    api.cluster.resources.get.assert_called_with(type="vm")
+
+@pytest.mark.parametrize("vm_type", ["qemu", "lxc"])
+def test_linked_clone_sends_no_target_storage(service, api, vm_type):
+    clone = getattr(api.nodes.return_value, vm_type).return_value.clone.post
+
+    service.create_vm(level_id=1, team="team-A", time_limit=60,
+                      config={"template_vmid": 9000, "full": 0, "storage": "local-lvm"}, vm_type=vm_type)
+    assert clone.call_args.kwargs["full"] == 0
+    assert "storage" not in clone.call_args.kwargs
+
+    service.create_vm(level_id=1, team="team-A", time_limit=60,
+                      config={"template_vmid": 9000, "full": 1, "storage": "local-lvm"}, vm_type=vm_type)
+    assert clone.call_args.kwargs["storage"] == "local-lvm"
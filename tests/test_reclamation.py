@@ -0,0 +1,142 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from core.exceptions import ProxmoxNodeError, ResourceNotFoundError
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.challange_service import ChallengeService
+from services.proxmox_service import ProxmoxService
+from services.reclamation_service import ReclamationQueue
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.RECLAIM_CONCURRENCY = 2
+    settings.RECLAIM_MAX_ATTEMPTS = 2
+    settings.RECLAIM_RETRY_DELAY = 0
+    return settings
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # File DB (bukan StaticPool) karena worker reclaim paralel butuh koneksi sendiri-sendiri
+    engine = create_engine(f"sqlite:///{tmp_path / 'reclaim.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY)
+        session.add(level)
+        session.flush()
+        for team, vmid, status in (("alpha", 200, DeploymentStatus.RUNNING), ("beta", 201, DeploymentStatus.TERMINATING)):
+            challenge = Challenge(level_id=level.id, team=team, flag=f"CTF{{{team}}}",
+                                  active_slot=Challenge.slot_for(team, level.id))
+            session.add(challenge)
+            session.flush()
+            session.add(Deployment(challenge_id=challenge.id, vm_id=vmid, vm_ip="10.0.0.5", status=status))
+        session.commit()
+    return factory
+
+@pytest.fixture
+def proxmox():
+    return MagicMock(spec=ProxmoxService)
+
+def drain(reclaimer, timeout=2):
+    deadline = time.monotonic() + timeout
+    while reclaimer.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert reclaimer.pending_count() == 0
+
+def get_deployment(session_factory, deployment_id):
+    with session_factory() as session:
+        deployment = session.get(Deployment, deployment_id)
+        return deployment.status, deployment.vm_id, deployment.vm_ip, deployment.terminated_at, deployment.error_message
+
+# --- Tests ---
+
+def test_start_recovers_terminating_deployments(settings, session_factory, proxmox):
+    reclaimer = ReclamationQueue(settings, proxmox, session_factory)
+    reclaimer.start()
+    drain(reclaimer)
+    reclaimer.stop()
+
+    proxmox.destroy_vm.assert_called_once_with(201, node=None)
+    status, vm_id, vm_ip, terminated_at, _ = get_deployment(session_factory, 2)
+    assert status == DeploymentStatus.TERMINATED
+    assert vm_id is None and vm_ip is None
+    assert terminated_at is not None
+    with session_factory() as session:
+        assert session.get(Challenge, 2).active_slot is None
+    assert reclaimer.snapshot().destroyed == 1
+
+def test_enqueue_is_deduplicated(settings, session_factory, proxmox):
+    reclaimer = ReclamationQueue(settings, proxmox, session_factory)
+    assert reclaimer.enqueue(200, 1) is True
+    assert reclaimer.enqueue(200, 1) is False
+    assert reclaimer.pending_count() == 1
+
+def test_vm_already_gone_counts_as_destroyed(settings, session_factory, proxmox):
+    proxmox.destroy_vm.side_effect = ResourceNotFoundError("gone")
+    reclaimer = ReclamationQueue(settings, proxmox, session_factory)
+    reclaimer.enqueue(200, 1)
+    reclaimer.start()
+    drain(reclaimer)
+    reclaimer.stop()
+
+    assert get_deployment(session_factory, 1)[0] == DeploymentStatus.TERMINATED
+
+def test_retries_then_marks_error(settings, session_factory, proxmox):
+    proxmox.destroy_vm.side_effect = ProxmoxNodeError("locked")
+    reclaimer = ReclamationQueue(settings, proxmox, session_factory)
+    reclaimer.enqueue(200, 1)
+    reclaimer.start()
+    drain(reclaimer)
+    reclaimer.stop()
+
+    # 201 dari recover juga gagal dua kali
+    assert proxmox.destroy_vm.call_count == 2 * settings.RECLAIM_MAX_ATTEMPTS
+    status, vm_id, _, _, error = get_deployment(session_factory, 1)
+    assert status == DeploymentStatus.ERROR
+    assert vm_id == 200 # VMID tetap dipegang supaya bisa di-terminate ulang
+    assert "locked" in error
+    stats = reclaimer.snapshot()
+    assert stats.failed == 2
+    assert stats.retried == 2
+
+def test_terminate_challenge_marks_terminating_and_enqueues(settings, session_factory, proxmox):
+    reclaimer = MagicMock(spec=ReclamationQueue)
+    session = session_factory()
+    service = ChallengeService(session, proxmox, MagicMock(), settings, reclaimer=reclaimer)
+
+    result = service.terminate_challenge(1)
+
+    assert result["status"] == "terminating"
+    reclaimer.enqueue.assert_called_once_with(200, 1, None)
+    proxmox.destroy_vm.assert_not_called()
+    challenge = session.get(Challenge, 1)
+    assert challenge.is_active is False
+    assert challenge.active_slot is None
+    session.close()
+
+def test_terminate_challenge_without_queue_destroys_inline(settings, session_factory, proxmox):
+    session = session_factory()
+    service = ChallengeService(session, proxmox, MagicMock(), settings)
+
+    result = service.terminate_challenge(1)
+
+    assert result["status"] == "terminated"
+    proxmox.destroy_vm.assert_called_once_with(200, node=None)
+    assert session.get(Deployment, 1).vm_id is None
+    session.close()
+
+def test_terminate_unknown_challenge(settings, session_factory, proxmox):
+    session = session_factory()
+    service = ChallengeService(session, proxmox, MagicMock(), settings)
+    with pytest.raises(ResourceNotFoundError):
+        service.terminate_challenge(999)
+    session.close()
@@ -0,0 +1,132 @@
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from core.exceptions import ProxmoxNodeError, ResourceNotFoundError
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.proxmox_service import ProxmoxService
+from services.reconciler_service import OrphanReconciler
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.ORPHAN_GRACE_SECONDS = 0
+    settings.RECLAIM_BATCH_SIZE = 2
+    settings.RECLAIM_BATCH_INTERVAL = 0
+    return settings
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY)
+        session.add(level)
+        session.flush()
+        for team, vmid in (("alpha", 200), ("beta", 201)):
+            challenge = Challenge(level_id=level.id, team=team, flag=f"CTF{{{team}}}",
+                                  active_slot=Challenge.slot_for(team, level.id))
+            session.add(challenge)
+            session.flush()
+            session.add(Deployment(challenge_id=challenge.id, vm_id=vmid, vm_ip=f"10.0.0.{vmid - 199}",
+                                   status=DeploymentStatus.RUNNING))
+        session.commit()
+    return factory
+
+def make_proxmox(vmids):
+    proxmox = MagicMock(spec=ProxmoxService)
+    proxmox.list_vms.return_value = [
+        {"vmid": vmid, "type": "qemu", "maxdisk": 1024, "template": 1 if vmid == 100 else 0}
+        for vmid in vmids
+    ]
+    return proxmox
+
+# --- Tests ---
+
+def test_reconcile_destroys_orphans_and_releases_missing(settings, session_factory):
+    # 200 is tracked and present, 201 is tracked but gone, 202-204 are orphans,
+    # 100 is a template outside the range, 600 is outside the range
+    proxmox = make_proxmox([100, 200, 202, 203, 204, 600])
+    proxmox.destroy_vm.side_effect = [None, ProxmoxNodeError("locked"), ResourceNotFoundError("gone")]
+    reconciler = OrphanReconciler(settings, proxmox, session_factory)
+
+    report = reconciler.reconcile()
+
+    assert report.scanned == 4
+    assert report.orphans == [202, 203, 204]
+    assert report.destroyed == [202, 204]
+    assert report.failed == [203]
+    assert report.reclaimed_bytes == 1024 # Only 202 was actually deleted by us
+    assert report.released_deployments == 1
+    assert report.released_ips == 1
+    assert reconciler.totals.destroyed == 2
+    proxmox.list_vms.assert_called_once_with(strict=True, node="pve")
+
+    with session_factory() as session:
+        released = session.query(Deployment).filter(Deployment.id == 2).one()
+        assert released.status == DeploymentStatus.TERMINATED
+        assert released.vm_id is None
+        assert released.vm_ip is None
+        assert released.terminated_at is not None
+        assert released.challenge.is_active is False
+        assert released.challenge.active_slot is None
+
+def test_reconcile_respects_grace_period(settings, session_factory):
+    settings.ORPHAN_GRACE_SECONDS = 3600
+    proxmox = make_proxmox([200, 201, 250])
+    reconciler = OrphanReconciler(settings, proxmox, session_factory)
+
+    report = reconciler.reconcile()
+
+    assert report.orphans == []
+    assert report.pending_grace == [250]
+    proxmox.destroy_vm.assert_not_called()
+
+def test_reconcile_dry_run_changes_nothing(settings, session_factory):
+    proxmox = make_proxmox([200, 250])
+    reconciler = OrphanReconciler(settings, proxmox, session_factory)
+
+    report = reconciler.reconcile(dry_run=True)
+
+    assert report.orphans == [250]
+    assert report.released_deployments == 1
+    proxmox.destroy_vm.assert_not_called()
+    assert reconciler.totals.passes == 0
+    with session_factory() as session:
+        assert session.query(Deployment).filter(Deployment.status == DeploymentStatus.TERMINATED).count() == 0
+
+def test_reconcile_aborts_when_inventory_fails(settings, session_factory):
+    proxmox = MagicMock(spec=ProxmoxService)
+    proxmox.list_vms.side_effect = ProxmoxNodeError("timeout")
+    reconciler = OrphanReconciler(settings, proxmox, session_factory)
+
+    with pytest.raises(ProxmoxNodeError):
+        reconciler.reconcile()
+    with session_factory() as session:
+        assert session.query(Deployment).filter(Deployment.status == DeploymentStatus.RUNNING).count() == 2
+
+def test_reconcile_lists_every_node_in_use(settings, session_factory):
+    with session_factory() as session:
+        session.query(Deployment).filter(Deployment.vm_id == 201).one().node = "pve2"
+        session.commit()
+    proxmox = MagicMock(spec=ProxmoxService)
+    proxmox.list_vms.side_effect = lambda strict, node: [
+        {"vmid": vmid, "type": "qemu", "node": node} for vmid in {"pve": [200], "pve2": [201, 260]}[node]
+    ]
+    reconciler = OrphanReconciler(settings, proxmox, session_factory)
+
+    report = reconciler.reconcile()
+
+    # VM di node affinity tidak dianggap hilang, dan orphan di sana dihapus di node-nya
+    assert report.scanned == 3
+    assert report.released_deployments == 0
+    assert report.destroyed == [260]
+    proxmox.destroy_vm.assert_called_once_with(260, node="pve2")
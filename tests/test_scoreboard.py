@@ -0,0 +1,106 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from models import Challenge, Level, CategoryEnum, DifficultyEnum
+from services.scoreboard_service import Scoreboard
+from services.challange_service import ChallengeService
+from config.settings import Settings
+
+T0 = datetime(2025, 12, 16, 10, 0, 0)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def sqlite_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def make_level(session, name: str, points: int) -> Level:
+    level = Level(name=name, category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY, points=points)
+    session.add(level)
+    session.flush()
+    return level
+
+# --- Tests for Scoreboard ---
+
+def test_record_solve_updates_rank_and_first_blood():
+    board = Scoreboard()
+
+    first = board.record_solve("alpha", 1, 100, T0)
+    assert first.rank == 1
+    assert first.first_blood is True
+
+    second = board.record_solve("beta", 1, 100, T0 + timedelta(minutes=1))
+    assert second.rank == 2 # Tie on score, alpha solved earlier
+    assert second.first_blood is False
+
+    update = board.record_solve("beta", 2, 300, T0 + timedelta(minutes=2))
+    assert update.previous_rank == 2
+    assert update.rank == 1
+    assert update.score == 400
+
+    standings = board.standings()
+    assert [(e.rank, e.team, e.score) for e in standings] == [(1, "beta", 400), (2, "alpha", 100)]
+    assert [fb.team for fb in board.first_bloods()] == ["alpha", "beta"]
+
+def test_record_solve_ignores_duplicate_solves():
+    board = Scoreboard()
+    board.record_solve("alpha", 1, 100, T0)
+
+    assert board.record_solve("alpha", 1, 100, T0 + timedelta(minutes=5)) is None
+    assert board.get_team("alpha").score == 100
+    assert board.get_team("nobody") is None
+
+def test_standings_slice():
+    board = Scoreboard()
+    for i in range(10):
+        board.record_solve(f"team-{i}", 1, 10 * (i + 1), T0 + timedelta(seconds=i))
+
+    page = board.standings(offset=2, limit=3)
+    assert [e.rank for e in page] == [3, 4, 5]
+    assert [e.team for e in page] == ["team-7", "team-6", "team-5"]
+
+def test_rebuild_from_db(sqlite_session):
+    easy = make_level(sqlite_session, "easy", 100)
+    hard = make_level(sqlite_session, "hard", 500)
+    sqlite_session.add_all([
+        Challenge(level_id=easy.id, team="alpha", flag="f1", flag_submitted=True, flag_submitted_at=T0),
+        Challenge(level_id=hard.id, team="beta", flag="f2", flag_submitted=True, flag_submitted_at=T0 + timedelta(minutes=1)),
+        Challenge(level_id=hard.id, team="alpha", flag="f3", flag_submitted=False),
+    ])
+    sqlite_session.commit()
+
+    board = Scoreboard()
+    board.record_solve("stale", 1, 999, T0) # Must be dropped by rebuild
+    assert board.rebuild_from_db(sqlite_session) == 2
+
+    assert [(e.team, e.score) for e in board.standings()] == [("beta", 500), ("alpha", 100)]
+    assert board.get_team("stale") is None
+
+def test_submit_challenge_records_solve_once(sqlite_session):
+    level = make_level(sqlite_session, "web", 250)
+    challenge = Challenge(level_id=level.id, team="alpha", flag="CTF{ok}")
+    sqlite_session.add(challenge)
+    sqlite_session.commit()
+
+    board = Scoreboard()
+    service = ChallengeService(sqlite_session, MagicMock(), MagicMock(), Settings(), board)
+
+    result = service.submit_challenge(challenge.id, "CTF{ok}")
+    assert result["correct"] is True
+    assert board.get_team("alpha").score == 250
+
+    again = service.submit_challenge(challenge.id, "CTF{ok}")
+    assert again["message"] == "Flag already submitted"
+    assert board.get_team("alpha").score == 250
+
+    wrong = service.submit_challenge(challenge.id, "CTF{nope}")
+    assert wrong["correct"] is False
@@ -2,9 +2,9 @@ import pytest
 from unittest.mock import MagicMock, patch, ANY
 from typing import Dict, Any
 
-from schemas.types.Vm_types import VMResult, VMInfo
+from schemas.types.vm_types import VMResult, VMInfo
 from schemas.types.ansible_types import AnsiblePlaybookParams, AnsiblePlaybookReturn
-from schemas.types.Challenge_types import ChallengeResult
+from schemas.types.challenge_types import ChallengeResult
 from services.proxmox_service import ProxmoxService
 from services.ansible_service import AnsibleService
 from services.challange_service import ChallengeService
@@ -45,6 +45,8 @@ def mock_db_session():
     session.refresh = MagicMock()
     session.rollback = MagicMock()
     session.flush = MagicMock()
+    # No active challenge for (team, level) yet
+    session.execute.return_value.scalars.return_value.first.return_value = None
     return session
 
 # --- Tests for ProxmoxService ---
@@ -164,7 +166,7 @@ def test_create_challenge_workflow(mock_db_session, mock_settings):
     # Verify Workflow
     # 1. Proxmox create_vm called
     mock_proxmox_service.create_vm.assert_called_once_with(
-        level_id=1, team="Team-Alpha", time_limit=60, config={}
+        level_id=1, team="Team-Alpha", time_limit=mock_settings.DEFAULT_CHALLENGE_DURATION, config={}, vm_type="qemu"
     )
     
     # 2. Ansible run_playbook called
@@ -0,0 +1,74 @@
+import pytest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from core.database import alembic_heads, check_schema, ALEMBIC_VERSIONS_DIR
+from core.exceptions import SchemaOutOfDateError
+from core.lazy import LazyModule, LazyCallable
+from core.startup import StartupProfiler
+
+# --- Fixtures ---
+
+@pytest.fixture
+def versions_dir(tmp_path):
+    for rev, down in (("aaa", "None"), ("bbb", "'aaa'"), ("ccc", "'bbb'")):
+        (tmp_path / f"{rev}_x.py").write_text(
+            f"revision: str = '{rev}'\ndown_revision: Union[str, Sequence[str], None] = {down}\n"
+        )
+    return tmp_path
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+def stamp(engine, revision):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("DELETE FROM alembic_version"))
+        conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+# --- Tests for schema check ---
+
+def test_alembic_heads_of_repo_is_single():
+    assert len(alembic_heads(ALEMBIC_VERSIONS_DIR)) == 1
+
+def test_alembic_heads_handles_merge(versions_dir):
+    (versions_dir / "ddd_x.py").write_text("revision = 'ddd'\ndown_revision = 'bbb'\n")
+    assert alembic_heads(versions_dir) == {"ccc", "ddd"}
+    (versions_dir / "eee_x.py").write_text("revision = 'eee'\ndown_revision = ('ccc', 'ddd')\n")
+    assert alembic_heads(versions_dir) == {"eee"}
+
+def test_check_schema_at_head(engine, versions_dir):
+    stamp(engine, "ccc")
+    assert check_schema(engine, versions_dir) == "ccc"
+
+def test_check_schema_behind_or_unmigrated(engine, versions_dir):
+    with pytest.raises(SchemaOutOfDateError):
+        check_schema(engine, versions_dir)
+    stamp(engine, "bbb")
+    with pytest.raises(SchemaOutOfDateError):
+        check_schema(engine, versions_dir)
+
+# --- Tests for lazy imports & profiler ---
+
+def test_lazy_module_imports_on_first_use():
+    lazy = LazyModule("json")
+    assert lazy.__dict__["_lazy_module"] is None
+    assert lazy.dumps({"a": 1}) == '{"a": 1}'
+    assert lazy.__dict__["_lazy_module"] is not None
+
+def test_lazy_callable():
+    ordered = LazyCallable("collections", "OrderedDict")
+    assert ordered(a=1)["a"] == 1
+
+def test_startup_profiler_report():
+    profiler = StartupProfiler(started=0.0)
+    with profiler.step("schema_check"):
+        pass
+    profiler.finish()
+
+    report = profiler.report()
+    assert [step["name"] for step in report["steps"]] == ["schema_check"]
+    assert "schema_check" in profiler.format()
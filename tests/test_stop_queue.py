@@ -0,0 +1,135 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from core.exceptions import ProxmoxNodeError
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentStatus, Level, CategoryEnum, DifficultyEnum
+from services.challange_service import ChallengeService
+from services.proxmox_service import ProxmoxService
+from services.stop_queue import StopQueue
+
+# --- Fixtures ---
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.STOP_BATCH_SIZE = 10
+    settings.STOP_BATCH_WINDOW = 0.05
+    settings.STOP_MAX_ATTEMPTS = 2
+    settings.STOP_RETRY_DELAY = 0
+    return settings
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stop.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY, points=100)
+        session.add(level)
+        session.flush()
+        for team, vmid in (("alpha", 200), ("beta", 201), ("gamma", 202)):
+            challenge = Challenge(level_id=level.id, team=team, flag=f"CTF{{{team}}}",
+                                  active_slot=Challenge.slot_for(team, level.id))
+            session.add(challenge)
+            session.flush()
+            session.add(Deployment(challenge_id=challenge.id, vm_id=vmid, status=DeploymentStatus.RUNNING))
+        session.commit()
+    return factory
+
+@pytest.fixture
+def proxmox():
+    proxmox = MagicMock(spec=ProxmoxService)
+    proxmox.get_guest_metrics.return_value = {
+        200: {"vmid": 200, "status": "running", "type": "qemu", "node": "pve"},
+        201: {"vmid": 201, "status": "running", "type": "lxc", "node": "pve2"},
+        202: {"vmid": 202, "status": "stopped", "type": "qemu", "node": "pve"},
+    }
+    return proxmox
+
+def drain(stopper, timeout=2):
+    deadline = time.monotonic() + timeout
+    while stopper.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stopper.pending_count() == 0
+
+def get_status(session_factory, deployment_id):
+    with session_factory() as session:
+        deployment = session.get(Deployment, deployment_id)
+        return deployment.status, deployment.stopped_at
+
+# --- Tests ---
+
+def test_batch_uses_one_status_call_and_skips_stopped_vms(settings, session_factory, proxmox):
+    stopper = StopQueue(settings, proxmox, session_factory)
+    stopper.enqueue(200, 1)
+    stopper.enqueue(201, 2, "lxc")
+    stopper.enqueue(202, 3)
+
+    stopper.process_batch(stopper._next_batch())
+
+    proxmox.get_guest_metrics.assert_called_once()
+    assert sorted(c.args[0] for c in proxmox.stop_vm.call_args_list) == [200, 201]
+    proxmox.stop_vm.assert_any_call(201, vm_type="lxc", check_exists=False, node="pve2")
+    for deployment_id in (1, 2, 3):
+        status, stopped_at = get_status(session_factory, deployment_id)
+        assert status == DeploymentStatus.STOPPED
+        assert stopped_at is not None
+    assert stopper.snapshot().stopped == 3
+    assert stopper.snapshot().batches == 1
+
+def test_enqueue_deduplicates_per_vmid(settings, session_factory, proxmox):
+    stopper = StopQueue(settings, proxmox, session_factory)
+    assert stopper.enqueue(200, 1) is True
+    assert stopper.enqueue(200, 1) is False
+    assert stopper.pending_count() == 1
+    assert stopper.snapshot().deduplicated == 1
+
+def test_worker_retries_then_gives_up(settings, session_factory, proxmox):
+    proxmox.stop_vm.side_effect = ProxmoxNodeError("busy")
+    stopper = StopQueue(settings, proxmox, session_factory)
+    stopper.start()
+    try:
+        stopper.enqueue(200, 1)
+        drain(stopper)
+    finally:
+        stopper.stop()
+
+    assert proxmox.stop_vm.call_count == settings.STOP_MAX_ATTEMPTS
+    stats = stopper.snapshot()
+    assert (stats.retried, stats.failed) == (1, 1)
+    # Stop gagal: deployment tetap RUNNING
+    assert get_status(session_factory, 1)[0] == DeploymentStatus.RUNNING
+
+def test_stop_does_not_override_terminating(settings, session_factory, proxmox):
+    with session_factory() as session:
+        session.get(Deployment, 1).status = DeploymentStatus.TERMINATING
+        session.commit()
+    stopper = StopQueue(settings, proxmox, session_factory)
+    stopper.enqueue(200, 1)
+    stopper.process_batch(stopper._next_batch())
+    assert get_status(session_factory, 1) == (DeploymentStatus.TERMINATING, None)
+
+def test_correct_flag_returns_before_stop_and_recovers_after_restart(settings, session_factory, proxmox):
+    stopper = StopQueue(settings, proxmox, session_factory)
+    with session_factory() as session:
+        service = ChallengeService(session, proxmox, MagicMock(), settings, stopper=stopper)
+        result = service.submit_challenge(1, "CTF{alpha}")
+
+    assert result["correct"] is True
+    # Tidak ada call Proxmox di jalur request
+    proxmox.stop_vm.assert_not_called()
+    proxmox.get_vm_info.assert_not_called()
+    assert stopper.pending_count() == 1
+    assert get_status(session_factory, 1)[0] == DeploymentStatus.RUNNING
+
+    # Proses restart sebelum batch jalan: recover() menemukan solved + RUNNING
+    fresh = StopQueue(settings, proxmox, session_factory)
+    assert fresh.recover() == 1
+    fresh.process_batch(fresh._next_batch())
+    assert get_status(session_factory, 1)[0] == DeploymentStatus.STOPPED
@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+from config.settings import Settings
+from models import Challenge, Deployment, DeploymentPhase, Level, CategoryEnum, DifficultyEnum
+from schemas.types.vm_types import VMResult, VMInfo
+from schemas.types.ansible_types import AnsiblePlaybookReturn
+from services.challange_service import ChallengeService
+from services.timeline_service import PhaseTimer, TimelineService, percentile
+
+# --- Fixtures ---
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    level = Level(name="web", category=CategoryEnum.Injection, difficulty=DifficultyEnum.EASY)
+    session.add(level)
+    session.flush()
+    challenge = Challenge(level_id=level.id, team="alpha", flag="CTF{x}", active_slot=Challenge.slot_for("alpha", level.id))
+    session.add(challenge)
+    session.flush()
+    session.add(Deployment(challenge_id=challenge.id, vm_id=200))
+    session.commit()
+    yield session
+    session.close()
+
+def add_phase(session, phase, ms, node="pve", level_id=1, age=0):
+    session.add(DeploymentPhase(deployment_id=1, phase=phase, duration_ms=ms, level_id=level_id, node=node,
+                                started_at=datetime.utcnow() - timedelta(seconds=age)))
+
+# --- Tests ---
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 90) == 90
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0
+
+def test_phase_timer_sequence():
+    timer = PhaseTimer()
+    start = datetime(2025, 1, 1)
+    timer.add_sequence(start, {"clone": 2.0, "boot": 0.5})
+    with timer.phase("ansible"):
+        pass
+
+    rows = timer.to_rows(level_id=3, node="pve2")
+    assert [(r.phase, r.duration_ms) for r in rows[:2]] == [("clone", 2000), ("boot", 500)]
+    assert rows[1].started_at == start + timedelta(seconds=2)
+    assert rows[2].phase == "ansible"
+    assert all(r.level_id == 3 and r.node == "pve2" for r in rows)
+
+def test_latency_report_groups_and_filters(session):
+    for ms in (100, 200, 300, 400):
+        add_phase(session, "clone", ms)
+    add_phase(session, "total", 5000)
+    add_phase(session, "clone", 900, node="pve2")
+    add_phase(session, "clone", 99999, age=7200) # di luar window
+    session.commit()
+
+    report = TimelineService(session).latency_report(3600)
+    assert [(p.phase, p.node) for p in report] == [("clone", "pve"), ("total", "pve"), ("clone", "pve2")]
+    clone = report[0]
+    assert (clone.count, clone.p50_ms, clone.p99_ms, clone.max_ms) == (4, 200, 400, 400)
+
+    only_pve2 = TimelineService(session).latency_report(3600, node="pve2")
+    assert [p.max_ms for p in only_pve2] == [900]
+
+def test_provisioning_records_phases(session):
+    proxmox = MagicMock()
+    proxmox.create_vm.return_value = VMResult(status="success", vmid=201, info=VMInfo(name="beta-1-201"),
+                                              node="pve", phases={"clone": 3.0, "configure": 0.2, "boot": 1.0})
+    ansible = MagicMock()
+    ansible.run_playbook.return_value = AnsiblePlaybookReturn(success=True, status="successful", rc=0, stats={})
+    service = ChallengeService(session, proxmox, ansible, Settings())
+
+    result = service.create_challenge(1, "beta")
+
+    deployment = session.execute(
+        select(Deployment).where(Deployment.challenge_id == result.challenge_id)
+    ).scalars().one()
+    phases = {p.phase: p for p in deployment.phases}
+    assert set(phases) == {"clone", "configure", "boot", "ansible", "db", "total"}
+    assert phases["clone"].duration_ms == 3000
+    assert phases["boot"].node == "pve"
+    assert phases["total"].level_id == 1
@@ -0,0 +1,133 @@
+import contextvars
+import json
+import threading
+import pytest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from config.settings import Settings
+from core.tracing import Tracer, SpanExporter, FileSpanExporter, OtlpSpanExporter, instrument_engine, current_correlation_id
+
+# --- Fixtures ---
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.TRACE_SAMPLE_RATE = 1.0
+    return settings
+
+@pytest.fixture
+def exporter():
+    return ListExporter()
+
+@pytest.fixture
+def tracer(settings, exporter):
+    tracer = Tracer(settings, exporter=exporter)
+    tracer.start()
+    yield tracer
+    tracer.stop()
+
+# --- Tests ---
+
+def test_spans_nest_under_root(tracer, exporter):
+    with tracer.start_trace("POST /api/challenges", correlation_id="req-1") as root:
+        assert current_correlation_id() == "req-1"
+        with tracer.span("proxmox.api", endpoint="qemu/clone") as child:
+            with tracer.span("proxmox.wait_task"):
+                pass
+    tracer.stop()
+
+    by_name = {span.name: span for span in exporter.spans}
+    assert set(by_name) == {"POST /api/challenges", "proxmox.api", "proxmox.wait_task"}
+    assert by_name["proxmox.api"].parent_id == root.span_id
+    assert by_name["proxmox.wait_task"].parent_id == child.span_id
+    assert len({span.trace_id for span in exporter.spans}) == 1
+    assert root.attributes["correlation_id"] == "req-1"
+    assert current_correlation_id() is None
+
+def test_span_records_error(tracer, exporter):
+    with pytest.raises(ValueError):
+        with tracer.start_trace("job"):
+            with tracer.span("ansible.run_playbook"):
+                raise ValueError("boom")
+    tracer.stop()
+
+    errors = {span.name: span.error for span in exporter.spans}
+    assert errors["ansible.run_playbook"] == "ValueError: boom"
+
+def test_unsampled_trace_keeps_correlation_id(settings, exporter):
+    settings.TRACE_SAMPLE_RATE = 0.0
+    tracer = Tracer(settings, exporter=exporter)
+    with tracer.start_trace("job") as root:
+        assert root is None
+        assert current_correlation_id() is not None
+        with tracer.span("db.query") as span:
+            assert span is None
+    assert exporter.spans == []
+
+def test_spans_outside_trace_are_noop(tracer):
+    with tracer.span("proxmox.api") as span:
+        assert span is None
+
+def test_spans_from_worker_thread_join_request_trace(tracer, exporter):
+    # Threadpool FastAPI/anyio menjalankan handler sync dengan copy context request
+    def work():
+        with tracer.span("worker"):
+            pass
+
+    with tracer.start_trace("request") as root:
+        ctx = contextvars.copy_context()
+        t = threading.Thread(target=ctx.run, args=(work,))
+        t.start()
+        t.join()
+    tracer.stop()
+
+    worker = next(span for span in exporter.spans if span.name == "worker")
+    assert worker.parent_id == root.span_id
+
+def test_sqlalchemy_queries_become_spans(tracer, exporter):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    instrument_engine(engine, tracer)
+    with tracer.start_trace("request"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    tracer.stop()
+
+    queries = [span for span in exporter.spans if span.name == "db.query"]
+    assert queries and queries[0].attributes["statement"] == "SELECT 1"
+
+def test_file_exporter(tmp_path, settings):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(settings, exporter=FileSpanExporter(str(path)))
+    tracer.start()
+    with tracer.start_trace("job"):
+        pass
+    tracer.stop()
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[0])["name"] == "job"
+
+def test_otlp_payload(tracer, exporter):
+    with tracer.start_trace("job", vmid=200):
+        with tracer.span("proxmox.api"):
+            pass
+    tracer.stop()
+
+    exporter_otlp = OtlpSpanExporter("http://collector:4318/", "ctf")
+    payload = exporter_otlp.payload(exporter.spans)
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+    assert exporter_otlp.url == "http://collector:4318/v1/traces"
+    assert payload["resourceSpans"][0]["resource"]["attributes"][0]["value"] == {"stringValue": "ctf"}
+    root = next(span for span in spans if span["name"] == "job")
+    assert {"key": "vmid", "value": {"intValue": "200"}} in root["attributes"]
+    assert root["status"] == {"code": 1}
+    assert all(len(span["traceId"]) == 32 and len(span["spanId"]) == 16 for span in spans)